@@ -21,8 +21,48 @@ beisen_token_cache_file = r"hztic/data/cache/beisen_token_cache.json"
 """下载文件存储路径"""
 download_dir = r"hztic/data/download/"
 
+"""文件下载分块大小(字节)"""
+download_chunk_size = 1024 * 1024
+
 """数据库配置"""
 DB_DIR = r"hztic/data/db/app.db"
 
 """日志文件存储路径"""
-LOG_DIR = r"hztic/data/logs"
\ No newline at end of file
+LOG_DIR = r"hztic/data/logs"
+
+"""日志文件格式: text 或 json(结构化日志，附带运行ID、阶段、实体类型及耗时)"""
+LOG_FORMAT = "text"
+
+"""运行指标文件(Prometheus 文本格式)及HTTP端口(0 表示不启动)"""
+METRICS_FILE = r"hztic/data/metrics/hztic.prom"
+METRICS_PORT = 0
+
+"""合思角色ID"""
+LEADER_ROLE_ID = "ID01EjGAFgd2N1:leader"      # 部门负责人
+MANAGER_ROLE_ID = "ID01EQlDrnHJ8z"            # 经理级以上员工
+
+"""合思角色名称(日志及变更计划输出)"""
+ROLE_NAMES = {
+    LEADER_ROLE_ID: "组织负责人",
+    MANAGER_ROLE_ID: "经理级以上员工",
+}
+
+"""点位授权同步单次最多停用的员工数及占已授权员工的最大比例，超出时视为角色数据异常，跳过停用"""
+STAFF_DEACTIVATION_MAX_COUNT = 500
+STAFF_DEACTIVATION_MAX_RATIO = 0.3
+
+"""HR事件回调服务"""
+WEBHOOK_HOST = "0.0.0.0"
+WEBHOOK_PORT = 5000
+
+"""任务锁文件目录(跨进程互斥)"""
+LOCK_DIR = r"hztic/data/locks"
+
+"""定时任务持久化存储"""
+JOB_STORE_URL = r"sqlite:///hztic/data/db/jobs.db"
+
+"""同步数据快照目录(列式存储，每次同步成功后导出)"""
+SNAPSHOT_DIR = r"hztic/data/snapshots"
+
+"""快照保留天数(最近一天内的快照全部保留，更早的每天只保留最后一份)"""
+SNAPSHOT_KEEP_DAYS = 30
@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional
+import numpy as np
+from hztic.utils.branch_matcher import BranchMatcher
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.logger import Logger
+
+logger = Logger().get_logger()
+
+MIN_ACCOUNT_LENGTH = 12         # 个人银行账号最短长度
+MAX_ACCOUNT_LENGTH = 19         # 个人银行卡号最长长度
+BRANCH_MATCH_THRESHOLD = 0.6    # 开户支行匹配的最低相似度
+
+
+def luhn_valid(accounts: np.ndarray) -> np.ndarray:
+    """
+    批量 Luhn 校验(向量化)
+
+    :param accounts: 纯数字账号组成的字符串数组
+    :return: 与 accounts 等长的布尔数组
+    """
+    if accounts.size == 0:
+        return np.zeros(0, dtype=bool)
+    width = int(max(len(account) for account in accounts))
+    # 右对齐补零后转为 (n, width) 的数字矩阵，左侧补零不影响校验结果
+    padded = "".join(account.rjust(width, "0") for account in accounts).encode("ascii")
+    digits = np.frombuffer(padded, dtype=np.uint8).reshape(len(accounts), width).astype(np.int16) - 48
+
+    # 从右往左数的第 2、4、6... 位乘 2，大于 9 的减 9
+    double = ((width - 1 - np.arange(width)) % 2) == 1
+    digits[:, double] *= 2
+    digits[digits > 9] -= 9
+    return digits.sum(axis=1) % 10 == 0
+
+
+def validate_bank_accounts(employees: List[Dict], matcher: Optional[BranchMatcher] = None) -> List[Dict]:
+    """
+    批量校验员工银行账户信息
+
+    :param employees: 员工银行账户字典列表(包含 bank_name、bank_branch、bank_account)
+    :param matcher: 网点匹配器，提供时校验开户支行是否存在于网点表
+    :return: 问题列表，每项包含员工信息及 issues 描述
+    """
+    accounts = np.array(
+        ["".join((emp.get("bank_account") or "").split()) for emp in employees],
+        dtype=object
+    )
+    lengths = np.fromiter((len(account) for account in accounts), dtype=np.int32, count=len(accounts))
+    numeric = np.fromiter((account.isdigit() for account in accounts), dtype=bool, count=len(accounts))
+
+    missing = lengths == 0
+    non_numeric = ~missing & ~numeric
+    bad_length = numeric & ((lengths < MIN_ACCOUNT_LENGTH) | (lengths > MAX_ACCOUNT_LENGTH))
+    luhn_failed = np.zeros(len(accounts), dtype=bool)
+    checkable = numeric & ~bad_length
+    luhn_failed[checkable] = ~luhn_valid(accounts[checkable])
+
+    branch_unmatched = np.zeros(len(accounts), dtype=bool)
+    if matcher is not None:
+        branch_names = [emp.get("bank_branch") or "" for emp in employees]
+        for i, candidates in enumerate(matcher.match_batch(branch_names, top_k=1)):
+            if branch_names[i] and (not candidates or candidates[0][2] < BRANCH_MATCH_THRESHOLD):
+                branch_unmatched[i] = True
+
+    checks = (
+        (missing, "银行账号为空"),
+        (non_numeric, "银行账号包含非数字字符"),
+        (bad_length, "银行账号长度异常"),
+        (luhn_failed, "银行卡号校验位错误"),
+        (branch_unmatched, "开户支行在网点表中无法匹配"),
+    )
+    flagged = np.zeros(len(accounts), dtype=bool)
+    for mask, _ in checks:
+        flagged |= mask
+
+    results = []
+    for i in np.flatnonzero(flagged):
+        emp = employees[i]
+        results.append({
+            "user_id": emp.get("user_id"),
+            "job_number": emp.get("job_number"),
+            "employee_name": emp.get("employee_name"),
+            "bank_account": emp.get("bank_account"),
+            "bank_branch": emp.get("bank_branch"),
+            "issues": [message for mask, message in checks if mask[i]],
+        })
+    return results
+
+
+def validate_employee_bank_accounts(db_manager: Optional[DatabaseManager] = None) -> List[Dict]:
+    """
+    对本地数据库中的全部在职员工执行银行账户校验并记录日志
+
+    :return: 问题列表
+    """
+    db_manager = db_manager or DatabaseManager()
+    employees = db_manager.get_employee_bank_accounts()
+    matcher = BranchMatcher.from_database(db_manager)
+    results = validate_bank_accounts(employees, matcher if matcher.names else None)
+
+    issue_counts = {}
+    for item in results:
+        logger.debug("员工 %s(%s) 银行账户异常: %s", item["employee_name"], item["job_number"], "、".join(item["issues"]))
+        for issue in item["issues"]:
+            issue_counts[issue] = issue_counts.get(issue, 0) + 1
+    for issue, count in issue_counts.items():
+        logger.warning("银行账户异常: %s，共 %d 名员工。", issue, count)
+    logger.info("银行账户校验完成，共 %d 名员工，%d 名存在异常。", len(employees), len(results))
+    return results
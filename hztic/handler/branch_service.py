@@ -0,0 +1,83 @@
+from typing import Dict, Iterator, Optional
+from openpyxl import load_workbook
+from hztic.services.hesi import HesiOpenApi
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.logger import Logger
+
+logger = Logger().get_logger()
+
+BRANCH_SHEET_NAME = "网点信息导出"
+
+# 网点文件表头与 bank_branches 字段的对应关系
+BRANCH_HEADER_ALIASES = {
+    "code": ("网点编号", "网点代码", "联行号", "行号"),
+    "name": ("网点名称",),
+    "bank_name": ("银行名称", "所属银行", "开户银行"),
+    "province": ("省份", "省"),
+    "city": ("城市", "市"),
+}
+
+
+def _cell_text(value) -> Optional[str]:
+    """单元格值转文本(数字编号去掉 .0)"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def iter_branch_rows(file_path: str) -> Iterator[Dict]:
+    """
+    逐行读取网点信息文件，不将整个工作簿加载到内存。
+
+    :param file_path: 网点信息文件路径(xlsx)。
+    :return: 网点数据字典的生成器，字段与 bank_branches 表一致。
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[BRANCH_SHEET_NAME] if BRANCH_SHEET_NAME in workbook.sheetnames else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = [_cell_text(cell) for cell in next(rows, ())]
+
+        positions = {}
+        for field, aliases in BRANCH_HEADER_ALIASES.items():
+            positions[field] = next((header.index(alias) for alias in aliases if alias in header), None)
+        if positions["code"] is None or positions["name"] is None:
+            raise ValueError(f"Unrecognized branch file header: {header}")
+
+        for row in rows:
+            branch = {
+                field: _cell_text(row[index]) if index is not None and index < len(row) else None
+                for field, index in positions.items()
+            }
+            if branch["code"]:
+                yield branch
+    finally:
+        workbook.close()
+
+
+def ingest_branch_file(file_path: str) -> int:
+    """
+    将网点信息文件导入 bank_branches 表(整体替换)。
+
+    :param file_path: 网点信息文件路径。
+    :return: 导入的网点数量。
+    """
+    count = DatabaseManager().replace_bank_branches(iter_branch_rows(file_path))
+    logger.info("bank branch file ingested, %d branches loaded.", count)
+    return count
+
+
+def refresh_bank_branches(config: Dict) -> int:
+    """
+    从合思下载最新网点信息文件并导入本地数据库。
+
+    :return: 导入的网点数量，下载失败时返回 0。
+    """
+    file_path = HesiOpenApi(config).get_branch_file()
+    if not file_path:
+        logger.error("网点信息文件下载失败，跳过导入")
+        return 0
+    return ingest_branch_file(file_path)
@@ -1,83 +1,302 @@
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from hztic.config import LEADER_ROLE_ID, MANAGER_ROLE_ID, STAFF_DEACTIVATION_MAX_COUNT, STAFF_DEACTIVATION_MAX_RATIO
 from hztic.services.beisen import BeisenOpenAPI
 from hztic.services.hesi import HesiOpenApi
+from hztic.services.ekuaibao import StaffService
+from hztic.models.db_models import Corporation, Employee, Organization
 from hztic.utils.database_manager import DatabaseManager
-from hztic.utils.logger import Logger
+from hztic.utils.logger import Logger, log_context
+from hztic.utils.metrics import metrics
+from hztic.utils.org_tree import OrgTree, OrgTreeChanges
 
 logger = Logger().get_logger()
 
-def fetch_and_store_data(config: Dict, start_time: datetime, end_time: datetime):
-    """从北森开放平台获取数据并存储到数据库中"""
+HESI_STAFF_BATCH_SIZE = 500
+
+# 各角色的配置内容构建方法(可传入快照会话，使多个角色基于同一时刻的数据构建)
+ROLE_CONTENT_BUILDERS = {
+    LEADER_ROLE_ID: lambda db_manager, session=None: db_manager.get_organization_staff_mapping(path_type="name", session=session),
+    MANAGER_ROLE_ID: lambda db_manager, session=None: db_manager.get_manager_org_path(session=session),
+}
+
+
+@dataclass
+class FetchResult:
+    """北森数据拉取结果"""
+    org_changes: OrgTreeChanges = field(default_factory=OrgTreeChanges)   # 组织树的变更
+    org_ids: Set[str] = field(default_factory=set)              # 本次拉取的组织ID
+    department_ids: Set[str] = field(default_factory=set)       # 本次拉取员工变动前后所在的部门ID
+
+    def affected_paths(self, tree: OrgTree) -> Set[Tuple[str, ...]]:
+        """受本次变动影响的组织名称路径"""
+        paths = set(self.org_changes.role_paths)
+        for org_id in self.org_ids | self.department_ids:
+            path = tree.get_path(org_id)
+            if path:
+                paths.add(path)
+        return paths
+
+
+def store_organizations(db_manager: DatabaseManager, organizations: List) -> OrgTreeChanges:
+    """
+    保存组织数据，并同步更新因上级改名或调整而变化的下级组织路径
+
+    :return: 组织树的变更
+    """
+    org_tree = db_manager.load_org_tree()
+    org_changes = org_tree.apply_changes(organizations)
+    for org in organizations:
+        db_manager.save_organization(org)
+    # 上级组织改名或调整后，未出现在本次增量中的下级组织路径同步更新
+    fetched_ids = {org.org_id for org in organizations}
+    db_manager.update_org_paths(
+        org_tree.nodes[org_id] for org_id in org_changes.affected if org_id not in fetched_ids
+    )
+    return org_changes
+
+
+def _save_all(table: str, save_func, items: List):
+    """逐条保存并记录写入行数及耗时"""
+    with metrics.timer("db_write", table=table):
+        for item in items:
+            save_func(item)
+    metrics.inc("db_write_rows", len(items), table=table)
+
+
+def fetch_and_store_data(config: Dict, start_time: datetime, end_time: datetime) -> FetchResult:
+    """
+    从北森开放平台获取数据并存储到数据库中
+
+    公司、组织、员工数据先写入暂存表，校验通过后在同一事务内合并到正式表，
+    拉取与写入期间读取方看到的始终是上一次同步的完整数据；校验失败时正式表不变。
+
+    :return: FetchResult，包含组织树的变更(新增、改名、移动的组织及受影响的路径)及本次变动涉及的组织、部门
+    """
     api = BeisenOpenAPI(config)
     db_manager = DatabaseManager()
     
     corporations = api.get_corporation_within_time_range(start_time, end_time)
-    for corporation in corporations:
-        db_manager.save_corporation(corporation)
     logger.info("corporation data fetched.")
     
     job_levels = api.get_job_level_within_time_range(start_time, end_time)
-    for job_level in job_levels:
-        db_manager.save_job_level(job_level)
+    _save_all("job_levels", db_manager.save_job_level, job_levels)
     logger.info("job level data fetched.")
         
     employment_forms = api.get_employment_form_within_time_range(start_time, end_time)
-    for employment_form in employment_forms:
-        db_manager.save_employment_form(employment_form)
+    _save_all("employment_forms", db_manager.save_employment_form, employment_forms)
     logger.info("employment form data fetched.")
 
     organizations = api.get_organizations_within_time_range(start_time, end_time)
-    for org in organizations:
-        db_manager.save_organization(org)
-    logger.info("organization data fetched.")
+    org_tree = db_manager.load_org_tree()
+    org_changes = org_tree.apply_changes(organizations)
+    logger.info(
+        "organization data fetched, %d added, %d renamed, %d moved, %d paths affected.",
+        len(org_changes.added), len(org_changes.renamed), len(org_changes.moved), len(org_changes.affected_paths)
+    )
 
     employees = api.get_employees_within_time_range(start_time, end_time)
-    for emp in employees:
-        db_manager.save_employee(emp)
+    previous_departments = db_manager.get_employee_department_ids({emp.user_id for emp in employees})
     logger.info("employee data fetched.")
+
+    # 写入暂存表，校验通过后合并
+    db_manager.begin_staging()
+    for table, model, items in (
+        ("corporations", Corporation, corporations),
+        ("organizations", Organization, organizations),
+        ("employees", Employee, employees),
+    ):
+        with metrics.timer("db_write", table=table):
+            db_manager.stage_records(model, items)
+        metrics.inc("db_write_rows", len(items), table=table)
+
+    errors = db_manager.validate_staging()
+    if errors:
+        raise ValueError(f"暂存数据校验失败，未写入正式表: {'; '.join(errors)}")
+
+    # 上级组织改名或调整后，未出现在本次增量中的下级组织路径随合并一起更新
+    fetched_ids = {org.org_id for org in organizations}
+    with metrics.timer("db_swap"):
+        counts = db_manager.swap_staging(
+            [org_tree.nodes[org_id] for org_id in org_changes.affected if org_id not in fetched_ids]
+        )
+    logger.info("staged data swapped in: %s", counts)
+
+    department_ids = {emp.oId_department_id for emp in employees} | set(previous_departments.values())
+    department_ids.discard(None)
+    return FetchResult(
+        org_changes=org_changes,
+        org_ids=fetched_ids,
+        department_ids=department_ids
+    )
     
 
+def sync_hesi_staffs(config: Dict) -> int:
+    """
+    增量同步合思员工到本地镜像表。
+
+    按更新时间倒序分页拉取在职与离职员工，遇到不晚于本地水位的记录即停止翻页。
+
+    :return: 本次写入镜像表的员工数量。
+    """
+    service = StaffService(config)
+    db_manager = DatabaseManager()
+    watermark = db_manager.get_hesi_staff_watermark()
+
+    saved = 0
+    for active in (True, False):
+        batch = []
+        for staff in service.iter_staffs(active=active, order_by="updateTime", order_by_type="desc"):
+            if (staff.get("updateTime") or 0) < watermark:
+                break
+            batch.append(staff)
+            if len(batch) >= HESI_STAFF_BATCH_SIZE:
+                saved += db_manager.save_hesi_staffs(batch)
+                batch = []
+        if batch:
+            saved += db_manager.save_hesi_staffs(batch)
+
+    logger.info("hesi staff mirror synced, %d staffs updated.", saved)
+    return saved
+
+
+def sync_staff_authorization(
+    config: Dict,
+    desired_codes: Iterable[str],
+    max_deactivate: int = STAFF_DEACTIVATION_MAX_COUNT,
+    max_deactivate_ratio: float = STAFF_DEACTIVATION_MAX_RATIO
+) -> Tuple[int, int]:
+    """
+    按合思员工镜像同步点位授权：激活尚未授权的员工，停用已授权但不再属于任何角色且不在白名单中的员工。
+
+    desired_codes 必须是全部角色的员工(只在全量更新时调用)，否则会停用其他角色的员工。
+    只停用本地记录为已授权的员工(即由本程序激活过的员工)。
+    desired_codes 为空，或待停用人数超过 max_deactivate、占已授权员工的比例超过 max_deactivate_ratio 时，
+    视为角色数据异常(如北森拉取失败)，跳过停用并记录错误。
+
+    :param desired_codes: 全部角色的员工工号。
+    :param max_deactivate: 单次最多停用的员工数。
+    :param max_deactivate_ratio: 单次停用人数占已授权员工的最大比例。
+    :return: (激活人数, 停用人数)。
+    """
+    api = HesiOpenApi(config)
+    db_manager = DatabaseManager()
+    desired_codes = set(desired_codes)
+    to_activate, to_deactivate = db_manager.get_staff_activation_diff(desired_codes)
+
+    if to_deactivate:
+        authorized = db_manager.count_authorized_hesi_staffs()
+        if not desired_codes:
+            logger.error("角色员工为空，跳过停用 %d 名员工的点位授权", len(to_deactivate))
+            to_deactivate = []
+        elif len(to_deactivate) > max_deactivate or len(to_deactivate) > authorized * max_deactivate_ratio:
+            logger.error(
+                "待停用 %d 人(已授权 %d 人)超过上限(%d 人, %.0f%%)，跳过停用，请检查角色数据",
+                len(to_deactivate), authorized, max_deactivate, max_deactivate_ratio * 100
+            )
+            to_deactivate = []
+
+    activated = deactivated = 0
+    if to_activate:
+        if api.auth_staff_api_call(add_staff=to_activate):
+            db_manager.mark_hesi_staffs_auth_state(to_activate, True)
+            activated = len(to_activate)
+        else:
+            logger.error("激活 %d 名员工的点位授权失败", len(to_activate))
+    if to_deactivate:
+        if api.auth_staff_api_call(del_staff=to_deactivate):
+            db_manager.mark_hesi_staffs_auth_state(to_deactivate, False)
+            deactivated = len(to_deactivate)
+        else:
+            logger.error("停用 %d 名员工的点位授权失败", len(to_deactivate))
+
+    logger.info("点位授权同步完成: 激活 %d 人, 停用 %d 人", activated, deactivated)
+    return activated, deactivated
+
+
 def update_role_staffs_with_clean(
     config: Dict,
     role_id: str,
     contents: List[Dict],
-    staff_by: str = "code"
+    staff_by: str = "code",
+    only_paths: Optional[Iterable] = None
 ) -> bool:
     """
     更新角色配置的员工信息，调用前先删除角色配置的员工信息。
+
+    指定 only_paths 时为定向更新：只推送这些路径的角色配置（无员工的路径推送空列表），
+    不删除角色下其他路径的员工信息。
     
     :param role_id: 角色ID。
     :param contents: 角色配置内容，格式见示例。
     :param staff_by: 员工标识类型，默认为 "code"。
+    :param only_paths: 仅更新的路径集合(路径为名称列表或元组)，默认为 None(全量更新)。
     :return: 如果 API 调用成功，则返回 True；否则返回 False。
     """
+    with log_context(entity=f"role:{role_id}"):
+        return _update_role_staffs(config, role_id, contents, staff_by, only_paths)
+
+
+def _update_role_staffs(config: Dict, role_id: str, contents: List[Dict], staff_by: str, only_paths: Optional[Iterable]) -> bool:
+    start = time.perf_counter()
+    # 定向更新: 只保留受影响路径的角色配置
+    if only_paths is not None:
+        targets = {tuple(path) for path in only_paths}
+        if not targets:
+            logger.info("角色 %s 没有受影响的路径，跳过更新", role_id)
+            return True
+        path_type = contents[0]["pathType"] if contents else "name"
+        contents = [item for item in contents if tuple(item["path"]) in targets]
+        covered = {tuple(item["path"]) for item in contents}
+        contents.extend(
+            {"pathType": path_type, "path": list(path), "staffs": []}
+            for path in targets - covered
+        )
+
     api = HesiOpenApi(config)
+    db_manager = DatabaseManager()
     
     # 1. 激活员工账号
-    logger.info(f"开始激活员工账号...")
+    logger.info("开始激活员工账号...")
     # 从 contents 中提取所有工号
-    staff_codes = []
+    staff_codes = set()
     for item in contents:
         if "staffs" in item:  # 确保 staffs 字段存在
-            staff_codes.extend(item["staffs"])  # 将工号添加到列表中
+            staff_codes.update(item["staffs"])  # 将工号添加到集合中
 
-    # 调用 API 函数
-    if not api.auth_staff_api_call(add_staff=staff_codes):
+    # 根据合思员工镜像只激活尚未授权的员工(停用须基于全部角色的员工，由 sync_staff_authorization 处理)
+    to_activate, _ = db_manager.get_staff_activation_diff(staff_codes)
+    if not to_activate:
+        logger.info("角色员工均已激活，跳过激活调用")
+    elif not api.auth_staff_api_call(add_staff=to_activate):
         logger.error("激活员工账号失败，终止更新操作")
         return False
+    else:
+        db_manager.mark_hesi_staffs_auth_state(to_activate, True)
 
-    # 2. 先删除角色配置的员工信息
-    logger.info(f"开始删除角色 {role_id} 的员工信息...")
-    if not api.delete_role_staffs(role_id):
-        api.logger.error(f"删除角色 {role_id} 的员工信息失败，终止更新操作")
-        return False
+    # 2. 先删除角色配置的员工信息(定向更新时跳过)
+    if only_paths is not None:
+        logger.info("定向更新角色 %s 的 %d 条路径，跳过删除", role_id, len(contents))
+    else:
+        logger.info("开始删除角色 %s 的员工信息...", role_id)
+        if not api.delete_role_staffs(role_id):
+            api.logger.error("删除角色 %s 的员工信息失败，终止更新操作", role_id)
+            return False
     
     # 3. 删除成功后，更新角色配置的员工信息
-    logger.info(f"开始更新角色 {role_id} 的员工信息...")
+    logger.info("开始更新角色 %s 的员工信息...", role_id)
     if not api.update_role_staffs(role_id, contents, staff_by):
-        logger.error(f"更新角色 {role_id} 的员工信息失败")
+        logger.error("更新角色 %s 的员工信息失败", role_id)
         return False
 
-    logger.info(f"角色 {role_id} 的员工信息更新成功")
+    # 记录本次推送的配置，供 --plan 对比
+    try:
+        db_manager.save_role_snapshot(role_id, contents, partial=only_paths is not None)
+    except Exception as e:
+        logger.warning("角色 %s 配置快照保存失败: %s", role_id, e)
+
+    elapsed = time.perf_counter() - start
+    logger.info("角色 %s 的员工信息更新成功, 耗时 %.2fs", role_id, elapsed, extra={"duration": elapsed})
     return True
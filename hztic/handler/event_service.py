@@ -0,0 +1,180 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from hztic.config import LEADER_ROLE_ID, MANAGER_ROLE_ID
+from hztic.handler.data_service import ROLE_CONTENT_BUILDERS, store_organizations, update_role_staffs_with_clean
+from hztic.services.beisen import BeisenOpenAPI
+from hztic.utils.coalescing_queue import CoalescingQueue
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.file_lock import FileLock, LockBusy
+from hztic.utils.logger import Logger
+
+logger = Logger().get_logger()
+
+# 事件处理时同步最近变动组织的时间窗口，及两次同步之间的最短间隔(秒)
+ORG_REFRESH_WINDOW = timedelta(days=1)
+ORG_REFRESH_INTERVAL = 300
+
+USER_ID_KEYS = ("userId", "userID", "UserID", "userid")
+JOB_NUMBER_KEYS = ("jobNumber", "JobNumber", "jobnumber")
+
+# 角色定向更新的防抖窗口及最长等待时间(秒)
+ROLE_UPDATE_DEBOUNCE = 10
+ROLE_UPDATE_MAX_DELAY = 120
+# 同步任务持有锁时，事件写库及角色定向更新等待锁的最长时间(秒)，超时后事件按失败重试
+SYNC_LOCK_TIMEOUT = 1800
+
+_role_update_queue = None
+_role_update_queue_lock = threading.Lock()
+
+_last_org_refresh = None
+_org_refresh_lock = threading.Lock()
+
+
+@contextmanager
+def sync_lock(action: str):
+    """
+    持有与定时同步任务共用的同步锁，锁被占用时等待同步任务完成
+    :param action: 操作描述，用于超时异常信息
+    """
+    from hztic.scheduler import SYNC_LOCK
+    lock = FileLock(SYNC_LOCK)
+    if not lock.acquire(timeout=SYNC_LOCK_TIMEOUT, poll_interval=5):
+        raise LockBusy(f"等待同步锁超时，{action}推迟")
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def fetch_recent_organizations(api: BeisenOpenAPI) -> List:
+    """
+    拉取最近变动的组织(部门负责人变更等)，距上次拉取不足 ORG_REFRESH_INTERVAL 秒时跳过并返回空列表
+
+    同一批事件只拉取一次，间隔内的组织变动由下一次拉取(时间窗口覆盖)或每小时增量同步处理。
+    """
+    global _last_org_refresh
+    with _org_refresh_lock:
+        if _last_org_refresh is not None and time.monotonic() - _last_org_refresh < ORG_REFRESH_INTERVAL:
+            return []
+    end_time = datetime.now()
+    organizations = api.get_organizations_within_time_range(end_time - ORG_REFRESH_WINDOW, end_time, incremental=True)
+    with _org_refresh_lock:
+        _last_org_refresh = time.monotonic()
+    return organizations
+
+
+def push_role_update(hesi_config: Dict, role_id: str, paths: Iterable[Tuple[str, ...]]):
+    """
+    按合并后的路径集合定向更新角色(角色配置内容在执行时从数据库重新构建)
+
+    与定时同步任务共用同步锁，避免与全量更新的删除、推送交错执行。
+    """
+    with sync_lock(f"角色 {role_id} 定向更新"):
+        contents = ROLE_CONTENT_BUILDERS[role_id](DatabaseManager())
+        if not update_role_staffs_with_clean(
+            config=hesi_config,
+            role_id=role_id,
+            contents=contents,
+            staff_by="code",
+            only_paths=paths
+        ):
+            raise Exception(f"角色 {role_id} 定向更新失败")
+
+
+def get_role_update_queue(
+    hesi_config: Dict,
+    on_done: Optional[Callable[[Hashable, Optional[Exception]], Any]] = None
+) -> CoalescingQueue:
+    """
+    获取角色定向更新队列(进程内单例)，同一角色在防抖窗口内的更新合并为一次推送
+
+    :param on_done: 事件关联的角色更新全部推送完成后的回调，参数为 (事件ID, 异常或 None)，仅在首次创建队列时生效
+    """
+    global _role_update_queue
+    with _role_update_queue_lock:
+        if _role_update_queue is None:
+            _role_update_queue = CoalescingQueue(
+                partial(push_role_update, hesi_config),
+                debounce=ROLE_UPDATE_DEBOUNCE,
+                max_delay=ROLE_UPDATE_MAX_DELAY,
+                name="role-update-queue",
+                on_done=on_done
+            )
+        return _role_update_queue
+
+
+def parse_hr_event(payload: Dict) -> Tuple[Set[str], Set[str]]:
+    """
+    解析HR事件回调数据中的员工标识
+
+    :param payload: 回调数据，员工信息位于 processVariableDic 中
+    :return: (UserID 集合, 工号集合)
+    """
+    process_variable_dic = payload.get("processVariableDic") or {}
+    user_ids = {str(process_variable_dic[key]) for key in USER_ID_KEYS if process_variable_dic.get(key)}
+    job_numbers = {str(process_variable_dic[key]) for key in JOB_NUMBER_KEYS if process_variable_dic.get(key)}
+    return user_ids, job_numbers
+
+
+def process_hr_event(beisen_config: Dict, hesi_config: Dict, payload: Dict, event_id: Optional[int] = None) -> bool:
+    """
+    处理单条HR事件：拉取相关员工、写入数据库，并将受影响的角色路径提交到角色更新队列
+
+    :param event_id: 事件ID，随角色路径一起提交，推送完成后通过队列的 on_done 回调结束事件
+    :return: 有角色路径加入队列返回 True(事件须等待推送结果)，无需推送返回 False
+    """
+    user_ids, job_numbers = parse_hr_event(payload)
+    if not user_ids and not job_numbers:
+        logger.warning("HR事件缺少员工标识，忽略: %s", payload)
+        return False
+
+    api = BeisenOpenAPI(beisen_config)
+    db_manager = DatabaseManager()
+
+    # 同步最近变动的组织(部门负责人变更等，按间隔节流)
+    organizations = fetch_recent_organizations(api)
+    employees = api.get_employees_by_user_ids(user_ids=user_ids, job_numbers=job_numbers)
+    if not employees:
+        logger.warning("北森未查询到事件相关员工: user_ids=%s, job_numbers=%s", user_ids, job_numbers)
+    emp_user_ids = {emp.user_id for emp in employees}
+
+    # 与同步任务共用同步锁写库，避免全量同步合并暂存数据时覆盖事件写入的较新数据
+    with sync_lock("HR事件写库"):
+        previous_leaders = db_manager.get_org_leaders(org.org_id for org in organizations)
+        org_changes = store_organizations(db_manager, organizations)
+        previous_departments = db_manager.get_employee_department_ids(emp_user_ids)
+        for emp in employees:
+            db_manager.save_employee(emp)
+        tree = db_manager.load_org_tree()
+
+    # 经理级角色：员工调动前后的部门路径
+    manager_paths = set(org_changes.role_paths)
+    for emp in employees:
+        for department_id in (emp.oId_department_id, previous_departments.get(emp.user_id)):
+            path = tree.get_path(department_id) if department_id else None
+            if path:
+                manager_paths.add(path)
+
+    # 部门负责人角色：员工负责的部门路径、路径变化及负责人变化的组织路径
+    # (北森返回的负责人UserID为数字，数据库中为字符串)
+    leader_paths = set(org_changes.role_paths)
+    leader_paths.update(
+        tree.get_path(org.org_id) for org in organizations
+        if org.org_id in previous_leaders
+        and (previous_leaders[org.org_id] or None) != (str(org.person_in_charge) if org.person_in_charge else None)
+    )
+    leader_paths.update(tree.get_path(org_id) for org_id in db_manager.get_orgs_in_charge(emp_user_ids))
+    leader_paths.discard(None)
+
+    entries = {role_id: paths for role_id, paths in ((LEADER_ROLE_ID, leader_paths), (MANAGER_ROLE_ID, manager_paths)) if paths}
+    if entries:
+        get_role_update_queue(hesi_config).submit_many(entries, token=event_id)
+    logger.info(
+        "HR事件处理完成: %d 名员工, 负责人路径 %d 条, 经理级路径 %d 条已加入角色更新队列",
+        len(employees), len(leader_paths), len(manager_paths)
+    )
+    return bool(entries)
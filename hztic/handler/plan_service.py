@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from hztic.config import BeisenAPIConfig, ROLE_NAMES
+from hztic.handler.data_service import ROLE_CONTENT_BUILDERS, fetch_and_store_data
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.file_lock import FileLock
+from hztic.utils.logger import Logger
+
+logger = Logger().get_logger()
+
+# 与每日全量同步相同的拉取窗口
+PLAN_FETCH_WINDOW = timedelta(days=7)
+
+
+@dataclass
+class PathChange:
+    """单条路径的员工变化"""
+    path: Tuple[str, ...]
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RoleDiff:
+    """角色当前配置与最近一次推送快照的差异"""
+    role_id: str
+    has_snapshot: bool
+    added: List[PathChange] = field(default_factory=list)       # 新增路径
+    removed: List[PathChange] = field(default_factory=list)     # 删除路径
+    changed: List[PathChange] = field(default_factory=list)     # 员工有变化的路径
+    unchanged: int = 0
+    to_activate: List[str] = field(default_factory=list)        # 推送前需要激活的员工
+
+    @property
+    def staff_added(self) -> int:
+        return sum(len(change.added) for change in self.added + self.changed)
+
+    @property
+    def staff_removed(self) -> int:
+        return sum(len(change.removed) for change in self.removed + self.changed)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_role_contents(role_id: str, snapshot: Dict[Tuple[str, ...], List[str]], contents: List[Dict]) -> RoleDiff:
+    """
+    对比角色配置内容与推送快照
+    :param role_id: 角色ID
+    :param snapshot: 最近一次推送的配置 {路径元组: 工号列表}
+    :param contents: 当前构建的角色配置内容
+    """
+    current = {tuple(item["path"]): set(item.get("staffs") or []) for item in contents if item.get("staffs")}
+    diff = RoleDiff(role_id=role_id, has_snapshot=bool(snapshot))
+    for path in sorted(current.keys() - snapshot.keys()):
+        diff.added.append(PathChange(path, added=sorted(current[path])))
+    for path in sorted(snapshot.keys() - current.keys()):
+        diff.removed.append(PathChange(path, removed=sorted(snapshot[path])))
+    for path in sorted(current.keys() & snapshot.keys()):
+        previous = set(snapshot[path])
+        if current[path] == previous:
+            diff.unchanged += 1
+        else:
+            diff.changed.append(PathChange(path, added=sorted(current[path] - previous), removed=sorted(previous - current[path])))
+    return diff
+
+
+def plan_role_updates(fetch: bool = True, db_manager: Optional[DatabaseManager] = None) -> List[RoleDiff]:
+    """
+    计算各角色待推送的变化，不调用合思接口
+
+    :param fetch: 是否先从北森拉取最新数据写入本地数据库(与同步任务共用锁)
+    :return: 各角色的差异
+    """
+    db_manager = db_manager or DatabaseManager()
+    if fetch:
+        from hztic.scheduler import SYNC_LOCK
+        with FileLock(SYNC_LOCK):
+            db_manager.initialize_employee_status()
+            end_time = datetime.now()
+            fetch_and_store_data(BeisenAPIConfig, end_time - PLAN_FETCH_WINDOW, end_time)
+
+    with db_manager.snapshot() as session:
+        role_contents = {role_id: build(db_manager, session) for role_id, build in ROLE_CONTENT_BUILDERS.items()}
+
+    diffs = []
+    for role_id, contents in role_contents.items():
+        diff = diff_role_contents(role_id, db_manager.get_role_snapshot(role_id), contents)
+        staff_codes = {code for item in contents for code in item.get("staffs") or []}
+        diff.to_activate, _ = db_manager.get_staff_activation_diff(staff_codes)
+        diffs.append(diff)
+    return diffs
+
+
+def format_role_diff(diff: RoleDiff, limit: int = 20) -> str:
+    """
+    输出差异摘要
+    :param limit: 每类路径最多列出的条数
+    """
+    name = ROLE_NAMES.get(diff.role_id, diff.role_id)
+    lines = [f"角色 {name} ({diff.role_id})"]
+    if not diff.has_snapshot:
+        lines.append("  (没有推送快照，以下按全部新增列出)")
+    lines.append(
+        f"  路径: +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)} ={diff.unchanged}"
+        f"  员工: +{diff.staff_added} -{diff.staff_removed}  待激活: {len(diff.to_activate)}"
+    )
+    for mark, changes in (("+", diff.added), ("-", diff.removed), ("~", diff.changed)):
+        for change in changes[:limit]:
+            staffs = [f"+{code}" for code in change.added] + [f"-{code}" for code in change.removed]
+            shown = " ".join(staffs[:10]) + (f" ...共{len(staffs)}人" if len(staffs) > 10 else "")
+            lines.append(f"  {mark} {'/'.join(change.path)}: {shown}")
+        if len(changes) > limit:
+            lines.append(f"  {mark} ... 另有 {len(changes) - limit} 条路径")
+    return "\n".join(lines)
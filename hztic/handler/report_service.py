@@ -0,0 +1,135 @@
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from hztic.utils.snapshot_store import Snapshot, SnapshotStore, decode
+
+# 报表中员工、组织记录输出的字段
+EMPLOYEE_FIELDS = ("user_id", "job_number", "employee_name", "oId_department_text", "oId_job_level_text")
+ORGANIZATION_FIELDS = ("org_id", "org_name", "tree_path_text")
+
+REPORT_SECTIONS = (
+    ("hires", "入职"),
+    ("exits", "离职"),
+    ("transfers", "调岗"),
+    ("level_changes", "职级变动"),
+    ("leader_changes", "负责人变动"),
+)
+
+
+@dataclass
+class ChangeReport:
+    """两份快照之间的人员及组织变动"""
+    old: str
+    new: str
+    hires: List[Dict] = field(default_factory=list)
+    exits: List[Dict] = field(default_factory=list)
+    transfers: List[Dict] = field(default_factory=list)
+    level_changes: List[Dict] = field(default_factory=list)
+    leader_changes: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def join_keys(old_keys: np.ndarray, new_keys: np.ndarray):
+    """
+    按主键关联两份快照(排序后向量化匹配)
+    :return: (旧快照匹配行下标, 新快照匹配行下标, 仅在旧快照中的行下标, 仅在新快照中的行下标)
+    """
+    _, old_index, new_index = np.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+    only_old = np.flatnonzero(~np.isin(old_keys, new_keys, assume_unique=True))
+    only_new = np.flatnonzero(~np.isin(new_keys, old_keys, assume_unique=True))
+    return old_index, new_index, only_old, only_new
+
+
+def _records(snapshot: Snapshot, table: str, fields: Sequence[str], rows: np.ndarray) -> List[Dict]:
+    """取出指定行的记录(只解码被选中的行)"""
+    columns = {name: decode(snapshot.column(table, name)[rows]).tolist() for name in fields}
+    return [dict(zip(fields, values)) for values in zip(*columns.values())] if len(rows) else []
+
+
+def _changes(old: Snapshot, new: Snapshot, table: str, fields: Sequence[str], column: str, label_column: str,
+             old_index: np.ndarray, new_index: np.ndarray) -> List[Dict]:
+    """匹配行中 column 发生变化的记录，附带变化前后的 label_column"""
+    changed = old.column(table, column)[old_index] != new.column(table, column)[new_index]
+    old_rows, new_rows = old_index[changed], new_index[changed]
+    records = _records(new, table, fields, new_rows)
+    before = decode(old.column(table, label_column)[old_rows]).tolist()
+    after = decode(new.column(table, label_column)[new_rows]).tolist()
+    for record, from_value, to_value in zip(records, before, after):
+        record["from"] = from_value
+        record["to"] = to_value
+    return records
+
+
+def compare_snapshots(old: Snapshot, new: Snapshot) -> ChangeReport:
+    """
+    对比两份快照
+    :param old: 较早的快照
+    :param new: 较新的快照
+    """
+    report = ChangeReport(old=old.name, new=new.name)
+
+    # 员工: 按 user_id 关联(离职等非在职状态的员工不在 employees 表中，按离职统计)
+    old_index, new_index, only_old, only_new = join_keys(
+        old.column("employees", "user_id"), new.column("employees", "user_id")
+    )
+    report.hires = _records(new, "employees", EMPLOYEE_FIELDS, only_new)
+    report.exits = _records(old, "employees", EMPLOYEE_FIELDS, only_old)
+    report.transfers = _changes(
+        old, new, "employees", EMPLOYEE_FIELDS, "oId_department_id", "oId_department_text", old_index, new_index
+    )
+    report.level_changes = _changes(
+        old, new, "employees", EMPLOYEE_FIELDS, "oId_job_level_id", "oId_job_level_text", old_index, new_index
+    )
+
+    # 组织: 按 org_id 关联，新增组织的负责人不计入
+    old_index, new_index, _, _ = join_keys(
+        old.column("organizations", "org_id"), new.column("organizations", "org_id")
+    )
+    report.leader_changes = _changes(
+        old, new, "organizations", ORGANIZATION_FIELDS, "person_in_charge", "person_in_charge_text", old_index, new_index
+    )
+    return report
+
+
+def select_snapshots(store: SnapshotStore, old_name: Optional[str] = None, new_name: Optional[str] = None, days: int = 1):
+    """
+    选择对比的快照
+    :param old_name: 较早的快照名称，默认取较新快照 days 天前(含)最近的一份
+    :param new_name: 较新的快照名称，默认最新快照
+    :return: (old, new)
+    """
+    new = store.load(new_name) if new_name else store.latest()
+    if new is None:
+        raise ValueError("没有可用的数据快照")
+    old = store.load(old_name) if old_name else store.latest(before=new.created_at - timedelta(days=days))
+    if old is None:
+        raise ValueError(f"没有早于 {new.name} {days} 天的数据快照")
+    return old, new
+
+
+def format_change_report(report: ChangeReport, limit: int = 50) -> str:
+    """
+    输出变动报表
+    :param limit: 每类变动最多列出的条数
+    """
+    lines = [f"变动报表 {report.old} -> {report.new}"]
+    lines.append("  ".join(f"{title} {len(getattr(report, key))}" for key, title in REPORT_SECTIONS))
+    for key, title in REPORT_SECTIONS:
+        records = getattr(report, key)
+        if not records:
+            continue
+        lines.append(f"[{title}]")
+        for record in records[:limit]:
+            if key == "leader_changes":
+                line = f"{record['tree_path_text'] or record['org_name']}: {record['from'] or '-'} -> {record['to'] or '-'}"
+            elif key in ("hires", "exits"):
+                line = f"{record['job_number']} {record['employee_name']} {record['oId_department_text']} {record['oId_job_level_text']}"
+            else:
+                line = f"{record['job_number']} {record['employee_name']}: {record['from'] or '-'} -> {record['to'] or '-'}"
+            lines.append(f"  {line}")
+        if len(records) > limit:
+            lines.append(f"  ... 另有 {len(records) - limit} 条")
+    return "\n".join(lines)
@@ -4,99 +4,95 @@
 该模块提供了定时任务调度功能,用于同步和更新组织架构数据。
 
 主要功能:
-- 定时从北森系统获取组织架构数据并存储到本地数据库
+- 定时从北森系统获取组织架构数据并存储到本地数据库(每小时增量、每日全量)
 - 更新合思系统中的角色-员工对应关系
+- 每周刷新合思网点信息
 - 支持命令行参数控制立即执行任务
+- 支持启动HR事件回调服务，准实时同步入职、调岗等变动
+- 支持 --plan 预览角色变化(与最近一次推送快照对比)，不调用合思写接口
+- 支持 --report 对比两份同步数据快照，输出入职、离职、调岗、职级及负责人变动
+
+各命令需要的模块(同步流程、APScheduler、Flask 等)在执行时才导入，缩短命令行启动时间。
 """
 
-from datetime import datetime, timedelta
 import argparse
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
-from .config import BeisenAPIConfig
-from .config import HesiAPIConfig
-from hztic.handler.data_service import fetch_and_store_data, update_role_staffs_with_clean
-from hztic.utils.database_manager import DatabaseManager
+from hztic.config import METRICS_PORT
 from hztic.utils.logger import Logger
 
 logger = Logger().get_logger()
 
 def job():
-    """每日执行的任务"""
-    try:
-        db_manager = DatabaseManager()
-        db_manager.initialize_employee_status()
-        
-        # 配置时间范围 - 获取最近一周的数据
-        end_time = (datetime.now() + timedelta(days=0)).replace(hour=0, minute=0, second=0, microsecond=0)  # 获取当前日期
-        start_time = end_time - timedelta(days=7)
-
-        # 获取北森数据并存储
-        fetch_and_store_data(BeisenAPIConfig, start_time, end_time)
-        logger.debug("数据存储完成.")
-        
-        # 获取部门负责人信息
-        contents = db_manager.get_organization_staff_mapping(path_type="name")
-        logger.debug("部门负责人信息获取完成.")
-        
-        """更新角色--部门负责人信息"""
-        result = update_role_staffs_with_clean(
-            config= HesiAPIConfig,
-            role_id="ID01EjGAFgd2N1:leader",
-            contents=contents,
-            staff_by="code"
-        )
-        
-        if result:
-            logger.debug("角色--组织负责人:员工信息更新成功")
-        else:
-            logger.error("角色--组织负责人:员工信息更新失败")
-        
-        """更新角色--经理级以上员工信息"""
-        contents = db_manager.get_manager_org_path()
-        logger.debug("经理级以上员工信息获取完成.")
-        result = update_role_staffs_with_clean(
-            config= HesiAPIConfig,
-            role_id="ID01EQlDrnHJ8z",
-            contents=contents,
-            staff_by="code"
-        )
-        
-        if result:
-            logger.debug("角色--经理级以上员工:员工信息更新成功")
-        else:
-            logger.error("角色--经理级以上员工:员工信息更新失败")
-        
-        logger.info("程序调度完成.")
-    except Exception as e:
-        logger.error(f"任务执行出错: {str(e)}")
+    """每日全量同步任务(兼容原有调用方式)"""
+    from hztic.scheduler import full_sync_job
+    return full_sync_job()
 
 def main():
     """主函数 - 支持立即执行或定时任务"""
     parser = argparse.ArgumentParser(description='数据同步程序')
     parser.add_argument('--run-now', action='store_true', help='立即执行一次任务')
+    parser.add_argument('--webhook', action='store_true', help='启动HR事件回调服务')
+    parser.add_argument('--plan', action='store_true', help='预览角色配置变化，不推送到合思')
+    parser.add_argument('--no-fetch', action='store_true', help='与 --plan 一起使用，跳过北森拉取，直接使用本地数据库')
+    parser.add_argument('--report', action='store_true', help='输出同步数据快照之间的人员变动报表')
+    parser.add_argument('--report-from', help='较早的快照名称(默认为较新快照一天前最近的一份)')
+    parser.add_argument('--report-to', help='较新的快照名称(默认为最新快照)')
+    parser.add_argument('--report-days', type=int, default=1, help='未指定 --report-from 时向前对比的天数')
+    parser.add_argument('--report-json', help='报表同时保存为 JSON 文件')
     args = parser.parse_args()
     
+    if args.report:
+        import json
+        from hztic.handler.report_service import compare_snapshots, format_change_report, select_snapshots
+        from hztic.utils.snapshot_store import SnapshotStore
+        try:
+            old, new = select_snapshots(SnapshotStore(), args.report_from, args.report_to, args.report_days)
+        except (ValueError, FileNotFoundError) as e:
+            logger.error("无法生成变动报表: %s", e)
+            return
+        report = compare_snapshots(old, new)
+        print(format_change_report(report))
+        if args.report_json:
+            with open(args.report_json, "w", encoding="utf-8") as f:
+                json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        return
+    
+    if args.plan:
+        from hztic.handler.plan_service import format_role_diff, plan_role_updates
+        from hztic.utils.file_lock import LockBusy
+        try:
+            diffs = plan_role_updates(fetch=not args.no_fetch)
+        except LockBusy:
+            logger.warning("同步任务执行中，请稍后重试或使用 --no-fetch")
+            return
+        for diff in diffs:
+            print(format_role_diff(diff))
+        return
+    
+    if args.webhook:
+        from hztic.webhook import serve
+        serve()
+        return
+    
     if args.run_now:
+        # 与定时任务共用同一把锁，定时任务执行中时跳过
         logger.info("开始立即执行任务...")
         job()
         return
     
     logger.info("启动定时任务调度器...")
-    scheduler = BlockingScheduler()
-    
-    # 添加任务，每天凌晨2点执行
-    scheduler.add_job(
-        job,
-        trigger=CronTrigger(hour=2, minute=0),
-        id='daily_sync_job',
-        name='每日数据同步任务',
-        misfire_grace_time=3600
-    )
+    from hztic.scheduler import create_scheduler
+    scheduler = create_scheduler()
+    if METRICS_PORT:
+        from hztic.utils.metrics import metrics
+        metrics.serve_http(METRICS_PORT)
+        logger.info("运行指标HTTP端点: http://127.0.0.1:%s/metrics", METRICS_PORT)
+    for scheduled_job in scheduler.get_jobs():
+        logger.info("已注册任务: %s", scheduled_job.name)
     
     try:
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
+        scheduler.shutdown(wait=False)
         logger.info("调度器已停止")
 
 if __name__ == "__main__":
@@ -1,9 +1,43 @@
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, Optional, Tuple
 
 
-@dataclass
-class Organization:
+@lru_cache(maxsize=None)
+def _row_getter(cls) -> Callable[[object], tuple]:
+    """按字段声明顺序取值的函数(每个类型只生成一次)"""
+    names = cls.field_names()
+    if len(names) == 1:
+        return lambda record: (getattr(record, names[0]),)
+    return attrgetter(*names)
+
+
+class Record:
+    """
+    北森数据记录基类
+
+    子类使用 @dataclass(slots=True)，实例不带 __dict__；
+    to_row 按字段声明顺序返回元组，可直接作为 INSERT 语句的参数。
+    """
+    __slots__ = ()
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        """字段名(按声明顺序，与 to_row 的取值顺序一致)"""
+        return cls.__slots__
+
+    def to_row(self) -> tuple:
+        """按字段声明顺序转为元组"""
+        return _row_getter(type(self))(self)
+
+    def to_dict(self) -> Dict[str, object]:
+        """转为字典(字段名: 值)"""
+        return dict(zip(self.field_names(), self.to_row()))
+
+
+@dataclass(slots=True)
+class Organization(Record):
     org_id: str                                         # 组织ID
     org_name: str                                       # 组织名称
     extsuoshugongsizhuti: Optional[str] = None          # 所属公司主体ID
@@ -13,8 +47,8 @@ class Organization:
     tree_path_text: Optional[str] = None                # 组织树路径文本
     extsuoshugongsizhuti_text: Optional[str] = None     # 所属公司主体文本
 
-@dataclass
-class Corporation:
+@dataclass(slots=True)
+class Corporation(Record):
     corp_id: str                               # 公司ID
     corp_name: str                             # 公司名称
     extzuzhidaima: Optional[str] = None        # 组织机构代码
@@ -23,8 +57,8 @@ class Corporation:
     extdianhua: Optional[str] = None           # 电话
     extdengjidizhi: Optional[str] = None       # 登记地址
 
-@dataclass
-class Employee:
+@dataclass(slots=True)
+class Employee(Record):
     user_id: str                                 # 用户ID
     id_number: Optional[str] = None              # 身份证号
     job_number: Optional[str] = None             # 工号
@@ -38,13 +72,16 @@ class Employee:
     email: Optional[str] = None                  # 邮箱
     service_type: Optional[str] = None           # 服务类型
     employment_form: Optional[str] = None        # 用工形式
+    bank_name: Optional[str] = None              # 开户银行
+    bank_branch: Optional[str] = None            # 开户行支行
+    bank_account: Optional[str] = None           # 银行账号
     
-@dataclass
-class JobLevel:
+@dataclass(slots=True)
+class JobLevel(Record):
     name: str                                    # 职级名称
     object_id: str                               # 职级ID    
     
-@dataclass
-class EmploymentForm:
+@dataclass(slots=True)
+class EmploymentForm(Record):
     name: str                                    # 用工形式名称
     object_id: str                               # 用工形式ID
\ No newline at end of file
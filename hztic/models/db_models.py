@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean
+from sqlalchemy import Column, String, Integer, Boolean, Index, Text, DateTime, func
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -40,6 +40,9 @@ class Employee(Base):
     email = Column(String)
     service_type = Column(String)
     employment_form = Column(String)
+    bank_name = Column(String)
+    bank_branch = Column(String)
+    bank_account = Column(String)
     
 class EmployeeStatus(Base):
     __tablename__ = "employee_status"
@@ -76,4 +79,47 @@ class Whitelist(Base):
     __tablename__ = "whitelist"  # 表名
     id = Column(Integer, primary_key=True, index=True)  # 主键
     staff_id = Column(String, unique=True, index=True)  # 员工工号，唯一
-    is_deleted = Column(Boolean, default=False)  # 软删除标记，默认为 False
\ No newline at end of file
+    is_deleted = Column(Boolean, default=False)  # 软删除标记，默认为 False
+
+
+class HesiStaff(Base):
+    __tablename__ = "hesi_staffs"
+    staff_id = Column(String, primary_key=True)         # 合思员工ID
+    code = Column(String, index=True)                   # 员工工号
+    name = Column(String)                               # 员工姓名
+    active = Column(Boolean, default=True)              # 是否在职
+    auth_state = Column(Boolean, default=False)         # 是否已激活点位授权(授权接口调用成功后在本地记录)
+    update_time = Column(Integer, default=0)            # 合思更新时间（毫秒时间戳）
+
+
+class BankBranch(Base):
+    __tablename__ = "bank_branches"
+    code = Column(String, primary_key=True)             # 网点编号(联行号)
+    name = Column(String, index=True)                   # 网点名称
+    bank_name = Column(String, index=True)              # 所属银行
+    province = Column(String)                           # 省份
+    city = Column(String)                               # 城市
+
+    __table_args__ = (
+        Index("ix_bank_branches_region", "province", "city"),
+    )
+
+
+class HrEvent(Base):
+    __tablename__ = "hr_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    payload = Column(Text, nullable=False)                          # 回调原始数据(JSON)
+    status = Column(String(20), default="pending", index=True)      # pending/processing/done/failed
+    attempts = Column(Integer, default=0)                           # 已处理次数
+    error = Column(Text)                                            # 最近一次失败原因
+    created_at = Column(DateTime, server_default=func.now())        # 接收时间
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class RoleSnapshot(Base):
+    """最近一次成功推送到合思的角色配置(按路径)"""
+    __tablename__ = "role_snapshots"
+    role_id = Column(String, primary_key=True)                      # 合思角色ID
+    path = Column(String, primary_key=True)                         # 路径(JSON 数组)
+    staffs = Column(Text, nullable=False)                           # 员工工号(JSON 数组)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,281 @@
+"""
+定时任务调度模块
+
+任务:
+- 每小时增量同步: 拉取最近变动的北森数据，只定向更新受影响路径的合思角色
+- 每日全量对账: 拉取最近一周数据并全量重写合思角色，校验员工银行账户
+- 每周网点刷新: 下载合思网点信息文件并导入本地数据库(在独立进程中解析)
+
+同一类任务通过跨进程文件锁互斥，定时调度、--run-now 及多实例部署之间不会重叠执行；
+任务定义持久化到 JOB_STORE_URL，进程重启后按错过的触发时间补跑(合并为一次)。
+每次任务结束后将运行指标写入 METRICS_FILE(Prometheus 文本格式)。
+"""
+
+import multiprocessing
+import os
+import time
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from functools import wraps
+from hztic.config import BeisenAPIConfig, HesiAPIConfig, JOB_STORE_URL, METRICS_FILE, ROLE_NAMES
+from hztic.handler.data_service import (
+    ROLE_CONTENT_BUILDERS, fetch_and_store_data, sync_hesi_staffs, sync_staff_authorization, update_role_staffs_with_clean
+)
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.file_lock import FileLock
+from hztic.utils.logger import Logger, log_context, set_run_id
+from hztic.utils.metrics import metrics
+
+logger = Logger().get_logger()
+
+# 增量同步的时间窗口，略大于调度间隔以覆盖延迟写入的数据
+INCREMENTAL_WINDOW = timedelta(hours=2)
+
+# 任务锁名称: 写入员工/组织并推送角色的任务共用同一把锁
+SYNC_LOCK = "sync"
+BRANCH_LOCK = "branch"
+
+
+def exclusive(lock_name: str):
+    """
+    任务互斥装饰器，锁已被占用时跳过本次执行
+
+    :param lock_name: 锁名称，同名锁的任务跨进程互斥
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            lock = FileLock(lock_name)
+            if not lock.acquire():
+                logger.warning("任务 %s 跳过: 锁 %s 已被其他任务持有", func.__name__, lock_name)
+                return None
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock.release()
+        return wrapper
+    return decorator
+
+
+def instrumented(func):
+    """
+    任务指标装饰器：记录执行次数、结果及总耗时，任务出错时记录日志而不向调度器抛出
+
+    任务结束后导出指标文件；进程池中执行的任务写入以任务名区分的独立文件，避免覆盖主进程的指标。
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        job_name = func.__name__
+        run_id = set_run_id()
+        logger.info("任务 %s 开始执行, 运行ID %s", job_name, run_id)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            metrics.inc("job_runs", job=job_name, status="failed")
+            logger.error("任务 %s 执行出错: %s", job_name, e)
+            return None
+        else:
+            metrics.inc("job_runs", job=job_name, status="success")
+            metrics.set("job_last_success_timestamp", time.time(), job=job_name)
+            return result
+        finally:
+            metrics.observe("job_phase", time.perf_counter() - start, job=job_name, phase="total")
+            export_metrics(job_name)
+    return wrapper
+
+
+@contextmanager
+def job_phase(job_name: str, phase: str):
+    """任务阶段: 记录阶段耗时，并为阶段内的日志附加阶段名称"""
+    with log_context(phase=phase), metrics.timer("job_phase", job=job_name, phase=phase):
+        yield
+
+
+def export_metrics(job_name: str = None):
+    """导出指标文件，失败时只记录警告"""
+    file_path = METRICS_FILE
+    if multiprocessing.parent_process() is not None and job_name:
+        root, ext = os.path.splitext(METRICS_FILE)
+        file_path = f"{root}.{job_name}{ext}"
+    try:
+        metrics.write_textfile(file_path)
+    except OSError as e:
+        logger.warning("运行指标导出失败: %s", e)
+
+
+def _export_snapshot(job_name: str):
+    """导出同步数据快照，失败时只记录警告(不影响角色推送)"""
+    from hztic.utils.snapshot_store import export_snapshot
+    with job_phase(job_name, "export_snapshot"):
+        try:
+            export_snapshot()
+        except Exception as e:
+            logger.warning("数据快照导出失败: %s", e)
+
+
+def _update_roles(job_name: str, db_manager: DatabaseManager, only_paths=None):
+    """
+    更新合思角色(部门负责人、经理级以上员工)，only_paths 为空时全量更新
+
+    各角色配置在同一只读快照中构建，不受构建期间其他写入(如HR事件回调)的影响
+    """
+    role_contents = {}
+    with db_manager.snapshot() as session:
+        for role_id, build_contents in ROLE_CONTENT_BUILDERS.items():
+            with job_phase(job_name, f"build_role:{role_id}"):
+                role_contents[role_id] = build_contents(db_manager, session)
+            logger.debug("%s信息获取完成.", ROLE_NAMES[role_id])
+
+    # 全量更新时按全部角色的员工同步点位授权(含停用不再属于任何角色的员工)
+    if only_paths is None:
+        with job_phase(job_name, "sync_staff_authorization"):
+            sync_staff_authorization(
+                HesiAPIConfig,
+                {code for contents in role_contents.values() for item in contents for code in item.get("staffs") or []}
+            )
+
+    for role_id, contents in role_contents.items():
+        role_name = ROLE_NAMES[role_id]
+        with job_phase(job_name, f"push_role:{role_id}"):
+            result = update_role_staffs_with_clean(
+                config=HesiAPIConfig,
+                role_id=role_id,
+                contents=contents,
+                staff_by="code",
+                only_paths=only_paths
+            )
+        if result:
+            logger.debug("角色--%s:员工信息更新成功", role_name)
+        else:
+            logger.error("角色--%s:员工信息更新失败", role_name)
+
+
+@exclusive(SYNC_LOCK)
+@instrumented
+def full_sync_job():
+    """每日全量对账任务"""
+    from hztic.handler.bank_account_validator import validate_employee_bank_accounts
+    job_name = "full_sync_job"
+    db_manager = DatabaseManager()
+    db_manager.initialize_employee_status()
+
+    # 配置时间范围 - 获取最近一周的数据
+    end_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(days=7)
+
+    # 获取北森数据并存储
+    with job_phase(job_name, "fetch_and_store"):
+        fetch_and_store_data(BeisenAPIConfig, start_time, end_time)
+    logger.debug("数据存储完成.")
+    _export_snapshot(job_name)
+
+    # 增量同步合思员工镜像，用于计算需要激活的员工
+    with job_phase(job_name, "sync_hesi_staffs"):
+        sync_hesi_staffs(HesiAPIConfig)
+    logger.debug("合思员工镜像同步完成.")
+
+    _update_roles(job_name, db_manager)
+
+    # 批量校验员工银行账户
+    with job_phase(job_name, "validate_bank_accounts"):
+        validate_employee_bank_accounts(db_manager)
+
+    logger.info("程序调度完成.")
+
+
+@exclusive(SYNC_LOCK)
+@instrumented
+def incremental_sync_job():
+    """每小时增量同步任务，只更新受本次变动影响的角色路径"""
+    job_name = "incremental_sync_job"
+    end_time = datetime.now()
+    start_time = end_time - INCREMENTAL_WINDOW
+    with job_phase(job_name, "fetch_and_store"):
+        result = fetch_and_store_data(BeisenAPIConfig, start_time, end_time)
+    if result.org_ids or result.department_ids:
+        _export_snapshot(job_name)
+
+    db_manager = DatabaseManager()
+    paths = result.affected_paths(db_manager.load_org_tree())
+    if not paths:
+        logger.info("增量同步完成: 无受影响的组织路径")
+        return
+
+    with job_phase(job_name, "sync_hesi_staffs"):
+        sync_hesi_staffs(HesiAPIConfig)
+    _update_roles(job_name, db_manager, only_paths=paths)
+    logger.info("增量同步完成: %d 条组织路径已更新", len(paths))
+
+
+@exclusive(BRANCH_LOCK)
+@instrumented
+def branch_refresh_job():
+    """每周网点信息刷新任务"""
+    from hztic.handler.branch_service import refresh_bank_branches
+    count = refresh_bank_branches(HesiAPIConfig)
+    logger.info("网点信息刷新完成: %d 条", count)
+
+
+def create_scheduler(blocking: bool = True, thread_workers: int = 4, process_workers: int = 1):
+    """
+    创建调度器并注册全部任务
+
+    :param blocking: True 返回 BlockingScheduler，False 返回在后台线程运行的 BackgroundScheduler
+    :param thread_workers: 线程池大小(同步任务，以网络IO为主)
+    :param process_workers: 进程池大小(网点文件解析等CPU密集任务)
+    """
+    from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.cron import CronTrigger
+
+    db_file = JOB_STORE_URL.replace("sqlite:///", "", 1)
+    if db_file != JOB_STORE_URL:
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+
+    scheduler_class = BlockingScheduler if blocking else BackgroundScheduler
+    scheduler = scheduler_class(
+        jobstores={"default": SQLAlchemyJobStore(url=JOB_STORE_URL)},
+        executors={
+            "default": ThreadPoolExecutor(thread_workers),
+            "processpool": ProcessPoolExecutor(process_workers),
+        },
+        job_defaults={
+            "coalesce": True,           # 错过的多次触发合并为一次
+            "max_instances": 1,         # 同一任务不重叠执行
+            "misfire_grace_time": 3600,
+        },
+    )
+
+    # 每小时第10分钟增量同步(避开整点的全量任务)
+    scheduler.add_job(
+        incremental_sync_job,
+        trigger=CronTrigger(minute=10),
+        id="hourly_incremental_sync_job",
+        name="每小时增量同步任务",
+        misfire_grace_time=600,
+        replace_existing=True
+    )
+
+    # 每天凌晨2点全量对账
+    scheduler.add_job(
+        full_sync_job,
+        trigger=CronTrigger(hour=2, minute=0),
+        id="daily_sync_job",
+        name="每日数据同步任务",
+        replace_existing=True
+    )
+
+    # 每周日凌晨4点刷新网点信息
+    scheduler.add_job(
+        branch_refresh_job,
+        trigger=CronTrigger(day_of_week="sun", hour=4, minute=0),
+        id="weekly_branch_refresh_job",
+        name="每周网点信息刷新任务",
+        executor="processpool",
+        misfire_grace_time=6 * 3600,
+        replace_existing=True
+    )
+    return scheduler
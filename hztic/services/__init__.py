@@ -1,5 +1,26 @@
-from .ekuaibao import Accounts, StaffService, MatrixService, SelfBuiltApp
-from .beisen import BeisenOpenAPI
-from .hesi import HesiOpenApi
+"""
+北森、合思开放平台接口
 
-__all__ = ["Accounts", "StaffService", "MatrixService", "SelfBuiltApp", "BeisenOpenAPI","HesiOpenApi"]
\ No newline at end of file
+各接口类按需导入(PEP 562)，只使用其中一个服务时不会加载其余服务模块。
+"""
+
+from typing import TYPE_CHECKING
+from hztic.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .ekuaibao import Accounts, StaffService, MatrixService, SelfBuiltApp
+    from .beisen import BeisenOpenAPI
+    from .hesi import HesiOpenApi
+
+_LAZY_ATTRS = {
+    "Accounts": ".ekuaibao",
+    "StaffService": ".ekuaibao",
+    "MatrixService": ".ekuaibao",
+    "SelfBuiltApp": ".ekuaibao",
+    "BeisenOpenAPI": ".beisen",
+    "HesiOpenApi": ".hesi",
+}
+
+__all__ = ["Accounts", "StaffService", "MatrixService", "SelfBuiltApp", "BeisenOpenAPI","HesiOpenApi"]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -1,16 +1,25 @@
 """Defines the Beisen OpenAPI class."""
 import requests
 import json
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from hztic.utils.rate_limiter import BeisenRateLimiter
 from hztic.utils.token_manager import BeisenTokenManager
-from hztic.utils.logger import Logger
+from hztic.utils.logger import Logger, log_context
+from hztic.utils.metrics import metrics
 from hztic.models.base_models import Organization, Employee, JobLevel, EmploymentForm, Corporation
 
 API_SUCCESS_CODE = "200"
 DEFAULT_TIME_WINDOW_DAYS = 90
 DEFAULT_CAPACITY = 300
+# 按UserID或工号查询员工时最多回溯的天数
+EMPLOYEE_LOOKUP_DAYS = 3 * 365
+
+# 员工银行信息自定义字段
+EMP_BANK_FIELD = "extyinhangg_609792_2118474221"                 # 开户银行
+EMP_BANK_BRANCH_FIELD = "extkaihuhangzhihang_609792_463003869"   # 开户行支行
+EMP_BANK_ACCOUNT_FIELD = "extyinhangzhanghao_609792_395264758"   # 银行账号
 
 class BeisenOpenAPI:
     """北森开放平台API类"""
@@ -33,15 +42,17 @@ class BeisenOpenAPI:
         })
 
         try:
+            start = time.perf_counter()
             response = requests.request(method, url, headers=headers, **kwargs)
-            self.logger.debug(f"Response status code: {response.status_code}") 
+            elapsed = time.perf_counter() - start
+            self.logger.debug("Response status code: %s, %.3fs", response.status_code, elapsed, extra={"duration": elapsed})
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request failed: {e}")
+            self.logger.error("Request failed: %s", e)
             raise Exception(f"Request failed: {e}")
         except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to decode JSON: {e}", extra={"response_content": response.text})
+            self.logger.error("Failed to decode JSON: %s", e, extra={"response_content": response.text})
             raise Exception(f"Failed to decode JSON: {e}. Response content: {response.text}")
 
     def _fetch_data_in_segments(self, start_time, end_time, incremental: bool, fetch_func):
@@ -51,17 +62,27 @@ class BeisenOpenAPI:
             segment_start = start_time
             while segment_start < end_time:
                 segment_end = min(segment_start + timedelta(days=DEFAULT_TIME_WINDOW_DAYS), end_time)
-                self.logger.debug(f"Fetching data from {segment_start} to {segment_end}")
+                self.logger.debug("Fetching data from %s to %s", segment_start, segment_end)
                 data = fetch_func(segment_start, segment_end)
                 all_data.extend(data)
                 segment_start = segment_end + timedelta(days=1)
             return all_data
         else:
-            self.logger.debug(f"Fetching data from {start_time} to {end_time}")
+            self.logger.debug("Fetching data from %s to %s", start_time, end_time)
             return fetch_func(start_time, end_time)
 
     def _scroll_fetch(self, endpoint: str, payload: Dict, extract_func) -> List[Any]:
         """分页查询的通用方法。"""
+        entity = endpoint.rstrip("/").split("/")[-2]
+        start = time.perf_counter()
+        with log_context(entity=entity), metrics.timer("beisen_fetch", endpoint=endpoint):
+            all_data = self._scroll_pages(endpoint, payload, extract_func)
+            elapsed = time.perf_counter() - start
+            self.logger.info("%s 查询完成: %d 条, 耗时 %.2fs", entity, len(all_data), elapsed, extra={"duration": elapsed})
+        metrics.inc("beisen_fetch_records", len(all_data), endpoint=endpoint)
+        return all_data
+
+    def _scroll_pages(self, endpoint: str, payload: Dict, extract_func) -> List[Any]:
         all_data = []
         scroll_id = None
 
@@ -70,6 +91,7 @@ class BeisenOpenAPI:
             payload["scrollId"] = scroll_id
 
             response = self._make_request(endpoint, method="POST", json=payload)
+            metrics.inc("beisen_fetch_pages", endpoint=endpoint)
             if not response or response.get("code") != API_SUCCESS_CODE:
                 self.logger.error("API request failed or returned an error.")
                 break
@@ -128,7 +150,31 @@ class BeisenOpenAPI:
     def get_employees_within_time_range(self, start_time, end_time, incremental: bool = False) -> List[Employee]:
         return self._fetch_data_in_segments(start_time, end_time, incremental, self.get_employees_by_time_window)
 
-    def get_employees_by_time_window(self, start_time, end_time) -> List[Employee]:
+    def get_employees_by_user_ids(self, user_ids: List[str] = None, job_numbers: List[str] = None) -> List[Employee]:
+        """
+        根据员工UserID或工号获取员工信息
+
+        同一请求中的多个 extQueries 为"且"关系，UserID 与工号分别查询；
+        从最近一个时间窗口开始向前回溯，全部员工均已找到或超过 EMPLOYEE_LOOKUP_DAYS 天时停止。
+        """
+        found: Dict[str, Employee] = {}
+        for field_name, attr, values in (("UserID", "user_id", user_ids), ("JobNumber", "job_number", job_numbers)):
+            remaining = {str(value) for value in values or ()} - {getattr(emp, attr) for emp in found.values()}
+            end_time = datetime.now()
+            earliest = end_time - timedelta(days=EMPLOYEE_LOOKUP_DAYS)
+            while remaining and end_time > earliest:
+                start_time = max(end_time - timedelta(days=DEFAULT_TIME_WINDOW_DAYS), earliest)
+                ext_queries = [{"fieldName": field_name, "queryType": 5, "values": sorted(remaining)}]
+                # 较新时间窗口的记录优先
+                for emp in self.get_employees_by_time_window(start_time, end_time, ext_queries=ext_queries):
+                    found.setdefault(emp.user_id, emp)
+                    remaining.discard(getattr(emp, attr))
+                end_time = start_time
+            if remaining:
+                self.logger.warning("%s 未查询到员工: %s", field_name, sorted(remaining))
+        return list(found.values())
+
+    def get_employees_by_time_window(self, start_time, end_time, ext_queries: Optional[List[Dict]] = None) -> List[Employee]:
         if (end_time - start_time).days > DEFAULT_TIME_WINDOW_DAYS:
             raise ValueError(f"Time window exceeds {DEFAULT_TIME_WINDOW_DAYS} days. Please split the query into smaller segments.")
 
@@ -140,8 +186,8 @@ class BeisenOpenAPI:
             "startTime": start_time.isoformat(),
             "stopTime": end_time.isoformat(),
             "capacity": DEFAULT_CAPACITY,
-            "columns": ["Name", "EmployType", "extyinhangg_609792_2118474221", "extkaihuhangzhihang_609792_463003869", "extyinhangzhanghao_609792_395264758", "JobNumber", "OIdDepartment", "serviceType", "OIdJobLevel","MobilePhone","iDNumber","EmployeeStatus","email","EmploymentForm"],
-            "extQueries": [{
+            "columns": ["Name", "EmployType", EMP_BANK_FIELD, EMP_BANK_BRANCH_FIELD, EMP_BANK_ACCOUNT_FIELD, "JobNumber", "OIdDepartment", "serviceType", "OIdJobLevel","MobilePhone","iDNumber","EmployeeStatus","email","EmploymentForm"],
+            "extQueries": ext_queries or [{
                 # "fieldName": "OIdJobLevel",
                 # "queryType": 5,
                 # "values": ["c28789f8-4e66-4365-84a3-b84a1f49d5c7", "18eb7a69-e31a-4e9d-b44e-ef75c451b2cf"]
@@ -168,10 +214,26 @@ class BeisenOpenAPI:
                 employment_form = (emp_data.get("recordInfo") or {}).get("employmentForm"),
                 service_type = (emp_data.get("recordInfo") or {}).get("serviceType"),
                 oId_job_level_text=((emp_data.get("recordInfo") or {}).get("translateProperties") or {}).get("OIdJobLevelText"),
-                oId_department_text=((emp_data.get("recordInfo") or {}).get("translateProperties") or {}).get("OIdDepartmentText")
+                oId_department_text=((emp_data.get("recordInfo") or {}).get("translateProperties") or {}).get("OIdDepartmentText"),
+                bank_name=self._custom_field(emp_data, EMP_BANK_FIELD, translate=True),
+                bank_branch=self._custom_field(emp_data, EMP_BANK_BRANCH_FIELD, translate=True),
+                bank_account=self._custom_field(emp_data, EMP_BANK_ACCOUNT_FIELD)
             )
             for emp_data in emp_data_list
         ]
+
+    @staticmethod
+    def _custom_field(emp_data: Dict, field: str, translate: bool = False) -> Optional[str]:
+        """从员工或任职信息中读取自定义字段（选项类字段优先取翻译文本）"""
+        for info in (emp_data.get("employeeInfo") or {}, emp_data.get("recordInfo") or {}):
+            if translate:
+                text = (info.get("translateProperties") or {}).get(f"{field}Text")
+                if text:
+                    return text
+            value = (info.get("customProperties") or {}).get(field)
+            if value:
+                return value
+        return None
         
         
     def get_job_level_within_time_range(self, start_time, end_time, incremental: bool = False) -> List[JobLevel]:
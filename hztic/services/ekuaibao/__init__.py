@@ -1,6 +1,25 @@
-from .accounts import Accounts
-from .self_built_app import SelfBuiltApp
-from .matrix_service import MatrixService
-from .staff_service import StaffService
+"""
+合思(易快报)开放平台服务
 
-__all__ = ["Accounts", "SelfBuiltApp", "MatrixService","StaffService"]
\ No newline at end of file
+各服务类按需导入(PEP 562)。
+"""
+
+from typing import TYPE_CHECKING
+from hztic.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .accounts import Accounts
+    from .self_built_app import SelfBuiltApp
+    from .matrix_service import MatrixService
+    from .staff_service import StaffService
+
+_LAZY_ATTRS = {
+    "Accounts": ".accounts",
+    "SelfBuiltApp": ".self_built_app",
+    "MatrixService": ".matrix_service",
+    "StaffService": ".staff_service",
+}
+
+__all__ = ["Accounts", "SelfBuiltApp", "MatrixService","StaffService"]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
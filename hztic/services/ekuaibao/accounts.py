@@ -1,6 +1,8 @@
-import os,time,requests
+import os,requests
 from hztic.utils.token_manager import HesiTokenManager
 from hztic.config import download_dir
+from hztic.utils.downloader import FileDownloader
+from hztic.utils.poller import poll_with_backoff
 
 class Accounts:
     """收付款账户管理"""
@@ -9,31 +11,35 @@ class Accounts:
         self.token_manager = HesiTokenManager(config)
         self.download_dir = download_dir
 
-    def get_branch_file(self):
+    def get_branch_file(self, initial_delay=5, max_delay=60, deadline=600):
         """
         获取网点信息文件下载链接并保存到本地
+        :param initial_delay: 首次轮询间隔(秒)
+        :param max_delay: 最大轮询间隔(秒)
+        :param deadline: 轮询总截止时间(秒)
         :return: 本地文件路径
         """
         access_token = self.token_manager.get_access_token()
         base_url = self.token_manager.get_base_url()
         url = f"{base_url}/api/openapi/v1/banks/getAllBranch"
         params = {"accessToken": access_token}
-        response = requests.post(url, params=params)
-        if response.status_code == 200:
+
+        def check():
+            response = requests.post(url, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Request failed: {response.status_code}, {response.text}")
             data = response.json()
             code = data.get("code")
             msg = data.get("msg")
             download_url = data.get("url")
             if code == "A200" and download_url:
-                return self._download_file(download_url, "branch_info.xlsx")
+                return True, download_url
             elif code in {"A200", "A201", "A202", "A203", "A204"}:
-                print(f"Status: {msg}. Retrying in 2-5 minutes...")
-                time.sleep(120) 
-                return self.get_branch_file()
-            else:
-                raise Exception(f"Failed to fetch branch file link: {msg}")
-        else:
-            raise Exception(f"Request failed: {response.status_code}, {response.text}")
+                return False, None
+            raise Exception(f"Failed to fetch branch file link: {msg}")
+
+        download_url = poll_with_backoff(check, initial_delay=initial_delay, max_delay=max_delay, deadline=deadline)
+        return self._download_file(download_url, "branch_info.xlsx")
 
     def _download_file(self, download_url, file_name):
         """
@@ -42,13 +48,5 @@ class Accounts:
         :param file_name: 保存的文件名
         :return: 本地文件路径
         """
-        response = requests.get(download_url, stream=True)
-        if response.status_code == 200:
-            file_path = os.path.join(self.download_dir, file_name)
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print(f"File downloaded successfully: {file_path}")
-            return file_path
-        else:
-            raise Exception(f"Failed to download file: {response.status_code}, {response.text}")
\ No newline at end of file
+        file_path = os.path.join(self.download_dir, file_name)
+        return FileDownloader().download(download_url, file_path)
\ No newline at end of file
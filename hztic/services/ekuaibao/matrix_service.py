@@ -1,6 +1,8 @@
 import requests
 from hztic.utils.token_manager import HesiTokenManager
 
+DEFAULT_PAGE_SIZE = 100
+
 class MatrixService:
     """企业审批矩阵服务"""
     def __init__(self, config):
@@ -12,10 +14,10 @@ class MatrixService:
         # 获取 AccessToken 和 BaseURL
         access_token = self.token_manager.get_access_token()
         base_url = self.token_manager.get_base_url()
-        
+
         # 请求地址
         url = f"{base_url}/api/openapi/v2/matrix/search"
-        
+
         # 请求头和数据
         headers = {
             "Content-Type": "application/json",
@@ -29,10 +31,24 @@ class MatrixService:
                 "count": count
             }
         }
-        
+
         # 发起 POST 请求
         response = requests.post(url, headers=headers, params=params, json=payload)
         if response.status_code == 200:
             return response.json()["items"]
         else:
-            raise Exception(f"Failed to fetch approval matrix: {response.text}")
\ No newline at end of file
+            raise Exception(f"Failed to fetch approval matrix: {response.text}")
+
+    def iter_approval_matrices(self, page_size=DEFAULT_PAGE_SIZE):
+        """
+        分页遍历企业全部审批矩阵
+        :param page_size: 每页条数
+        :return: 逐条返回审批矩阵的生成器
+        """
+        start = 0
+        while True:
+            items = self.get_approval_matrix(start=start, count=page_size)
+            yield from items
+            if len(items) < page_size:
+                break
+            start += page_size
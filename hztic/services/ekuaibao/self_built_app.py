@@ -1,11 +1,16 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from hztic.utils.token_manager import HesiTokenManager
 
+MAX_INSTANCE_PAGE_SIZE = 1000       # 业务对象实例列表单页最大条数
+MAX_SEARCH_COUNT = 1000             # 业务对象实例详情单次查询最大条数
+
 class SelfBuiltApp:
     """自建应用接口"""
     def __init__(self, config):
         self.config = config
         self.token_manager = HesiTokenManager(config)
+        self.session = requests.Session()       # 复用连接，分页/并发拉取时避免重复握手
 
     def get_self_built_app_list(self, start=0, count=10):
         """获取自建应用列表"""
@@ -60,13 +65,13 @@ class SelfBuiltApp:
             "active": active
         }
         
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         if response.status_code == 200:
             return response.json()["items"]
         else:
             raise Exception(f"Failed to fetch staff list: {response.text}")
         
-    def get_instance_describe(self, entityId, ids = [], codes = [], count=100, index= 1):
+    def get_instance_describe(self, entityId, ids=None, codes=None, count=100, index=1):
         """获取业务对象实例信息"""
         # 获取 AccessToken 和 BaseURL
         access_token = self.token_manager.get_access_token()
@@ -87,13 +92,74 @@ class SelfBuiltApp:
         payload = {
             "index": index,
             "count": count,
-            "ids": ids,
-            "codes": codes
+            "ids": ids or [],
+            "codes": codes or []
         }
         
         # 发起 POST 请求
-        response = requests.post(url, headers=headers, params=params, json=payload)
+        response = self.session.post(url, headers=headers, params=params, json=payload)
         if response.status_code == 200:
             return response.json()["items"]
         else:
-            raise Exception(f"Failed to fetch approval matrix: {response.text}")
\ No newline at end of file
+            raise Exception(f"Failed to fetch approval matrix: {response.text}")
+
+    def iter_instances(self, entityId, page_size=MAX_INSTANCE_PAGE_SIZE, startDate=None, endDate=None, active=False, max_workers=1):
+        """
+        分页遍历业务对象的全部实例
+        :param entityId: 业务对象ID
+        :param page_size: 每页条数
+        :param startDate: 开始日期
+        :param endDate: 结束日期
+        :param active: 是否只查询启用的实例
+        :param max_workers: 并发拉取的页数，大于 1 时按批次并发请求后续页
+        :return: 按分页顺序逐条返回实例的生成器
+        """
+        def fetch(start):
+            return self.get_instance_list(entityId, start=start, count=page_size, startDate=startDate, endDate=endDate, active=active)
+
+        start = 0
+        if max_workers <= 1:
+            while True:
+                items = fetch(start)
+                yield from items
+                if len(items) < page_size:
+                    return
+                start += page_size
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                futures = [executor.submit(fetch, start + i * page_size) for i in range(max_workers)]
+                for future in futures:
+                    items = future.result()
+                    yield from items
+                    if len(items) < page_size:
+                        return
+                start += max_workers * page_size
+
+    def iter_instance_describe(self, entityId, ids=None, codes=None, batch_size=MAX_SEARCH_COUNT, max_workers=1):
+        """
+        批量获取业务对象实例信息，按最大批次拆分 ID/编码 查询
+        :param entityId: 业务对象ID
+        :param ids: 实例ID列表
+        :param codes: 实例编码列表
+        :param batch_size: 单次查询条数
+        :param max_workers: 并发请求数
+        :return: 逐条返回实例信息的生成器
+        """
+        batches = []
+        for key, values in (("ids", list(ids or [])), ("codes", list(codes or []))):
+            for i in range(0, len(values), batch_size):
+                batches.append({key: values[i:i + batch_size]})
+
+        def fetch(batch):
+            count = len(next(iter(batch.values())))
+            return self.get_instance_describe(entityId, count=count, index=1, **batch)
+
+        if max_workers <= 1:
+            for batch in batches:
+                yield from fetch(batch)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for items in executor.map(fetch, batches):
+                yield from items
@@ -1,5 +1,6 @@
 import requests
 from hztic.utils.token_manager import HesiTokenManager
+from hztic.utils.metrics import metrics
 
 class StaffService:
     """员工列表服务"""
@@ -19,8 +20,32 @@ class StaffService:
             "orderBy": order_by,
             "orderByType": order_by_type
         }
-        response = requests.get(url, params=params)
+        with metrics.timer("hesi_request", endpoint="staffs"):
+            response = requests.get(url, params=params)
         if response.status_code == 200:
             return response.json()["items"]
         else:
-            raise Exception(f"Failed to fetch staff list: {response.text}")
\ No newline at end of file
+            raise Exception(f"Failed to fetch staff list: {response.text}")
+
+    def iter_staffs(self, active=True, order_by="updateTime", order_by_type="desc", page_size=100):
+        """
+        分页遍历员工列表
+        :param active: 是否查询在职员工
+        :param order_by: 排序字段
+        :param order_by_type: 排序方式(asc/desc)
+        :param page_size: 每页条数
+        :return: 逐条返回员工信息的生成器
+        """
+        start = 0
+        while True:
+            items = self.get_staff_list(
+                start=start,
+                count=page_size,
+                active=active,
+                order_by=order_by,
+                order_by_type=order_by_type
+            )
+            yield from items
+            if len(items) < page_size:
+                break
+            start += page_size
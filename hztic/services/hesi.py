@@ -1,13 +1,16 @@
-import os,time,requests
+import os,requests,json,logging
 from typing import Dict, List, Optional
 from hztic.utils.token_manager import HesiTokenManager
 from hztic.config import download_dir
-from hztic.utils.logger import Logger
+from hztic.utils.logger import get_logger
+from hztic.utils.downloader import FileDownloader
+from hztic.utils.metrics import metrics
+from hztic.utils.poller import PollTimeout, poll_with_backoff
 
 class HesiOpenApi:
     """合思开放平台API"""
     def __init__(self, config):
-        self.logger = Logger().get_logger()
+        self.logger = get_logger(__name__)
         self.config = config
         self.token_manager = HesiTokenManager(config)
         self.access_token = self.token_manager.get_access_token()
@@ -38,25 +41,26 @@ class HesiOpenApi:
             payload["addStaff"] = []
 
         try:
-            response = requests.post(url, params=params, headers=headers, json=payload)
+            with metrics.timer("hesi_request", endpoint="authStaff"):
+                response = requests.post(url, params=params, headers=headers, json=payload)
             if response.status_code == 200:
                 result = response.json()
                 if result.get("value") is True:
                     self.logger.debug("员工激活成功")
-                    self.logger.debug(f"API 返回结果: {response.text}")
+                    self.logger.debug("API 返回结果: %s", response.text)
                     return True
                 else:
                     self.logger.debug("员工之前已经被授权,跳过执行...")
                     return True
             elif response.status_code == 400:
                 error_message = response.json().get("message", "未知错误")
-                self.logger.error(f"API 调用失败,状态码: 400,错误信息: {error_message},排查建议：请确认 type(员工标识类型)是否为固定值。")
+                self.logger.error("API 调用失败,状态码: 400,错误信息: %s,排查建议：请确认 type(员工标识类型)是否为固定值。", error_message)
             else:
-                self.logger.error(f"API 调用失败,状态码: {response.status_code}")
-                self.logger.debug(f"API 返回结果: {response.text}")
+                self.logger.error("API 调用失败,状态码: %s", response.status_code)
+                self.logger.debug("API 返回结果: %s", response.text)
             return False
         except Exception as e:
-            self.logger.error(f"API 调用发生异常: {e}")
+            self.logger.error("API 调用发生异常: %s", e)
             return False
 
     def update_role_staffs(
@@ -74,7 +78,9 @@ class HesiOpenApi:
         :return: 如果 API 调用成功.则返回 True; 否则返回 False。
         """
         url = f"{self.base_url}/api/openapi/v1.1/roledefs/${role_id}/staffs"
-        print(contents)
+        # 角色配置内容可能很大，仅在 DEBUG 级别序列化输出
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("角色 %s 配置内容: %s", role_id, json.dumps(contents, ensure_ascii=False))
         params = {
             "accessToken": self.access_token,
             "staffBy": staff_by
@@ -87,7 +93,8 @@ class HesiOpenApi:
         }
 
         try:
-            response = requests.put(url, params=params, headers=headers, json=payload)
+            with metrics.timer("hesi_request", endpoint="roledefs.update"):
+                response = requests.put(url, params=params, headers=headers, json=payload)
             if response.status_code == 204:
                 self.logger.debug("API 调用成功")
                 return True
@@ -99,7 +106,7 @@ class HesiOpenApi:
                 self.logger.info("排查建议：请使用 v1.1 版本接口更新手动管理数据来源的角色.V1 不支持.详见更新日志。")
             elif response.status_code == 412:
                 error_message = response.json().get("message", "未知错误")
-                self.logger.error(f"API 调用失败.状态码: 412.错误信息: {error_message}")
+                self.logger.error("API 调用失败.状态码: 412.错误信息: %s", error_message)
                 if "找不到角色" in error_message:
                     self.logger.info("排查建议：请确认 roledefId(角色ID)是否正确或存在。")
                 elif "数据错误" in error_message:
@@ -107,11 +114,11 @@ class HesiOpenApi:
                 elif "参数staffs不能为空" in error_message or "参数path不能为空" in error_message:
                     self.logger.info("排查建议：除了普通角色.path(部门或自定义档案值)、staffs(员工集合)不允许传 null。")
             else:
-                self.logger.error(f"API 调用失败.状态码: {response.status_code}")
-                self.logger.debug(f"API 返回结果: {response.text}")
+                self.logger.error("API 调用失败.状态码: %s", response.status_code)
+                self.logger.debug("API 返回结果: %s", response.text)
             return False
         except Exception as e:
-            self.logger.error(f"API 调用发生异常: {e}")
+            self.logger.error("API 调用发生异常: %s", e)
             return False
         
     
@@ -128,60 +135,68 @@ class HesiOpenApi:
         }
 
         try:
-            response = requests.delete(url, params=params)
+            with metrics.timer("hesi_request", endpoint="roledefs.delete"):
+                response = requests.delete(url, params=params)
             if response.status_code == 204:
                 self.logger.debug("API 调用成功")
                 return True
             elif response.status_code == 412:
                 error_message = response.json().get("message", "未知错误")
-                self.logger.error(f"API 调用失败，状态码: 412,错误信息: {error_message}")
+                self.logger.error("API 调用失败，状态码: 412,错误信息: %s", error_message)
                 self.logger.info("描述:找不到角色, 排查建议：请确认 roledefId(角色ID)是否正确或存在.")
             else:
-                self.logger.error(f"API 调用失败，状态码: {response.status_code}")
-                self.logger.debug(f"API 返回结果: {response.text}")
+                self.logger.error("API 调用失败，状态码: %s", response.status_code)
+                self.logger.debug("API 返回结果: %s", response.text)
             return False
         except Exception as e:
-            self.logger.error(f"API 调用发生异常: {e}")
+            self.logger.error("API 调用发生异常: %s", e)
             return False
     
 
-    def get_branch_file(self, retry_delay: int = 120, max_retries: int = 3) -> Optional[str]:
+    def get_branch_file(self, initial_delay: float = 5, max_delay: float = 60, deadline: float = 600) -> Optional[str]:
         """
         获取网点信息文件下载链接并保存到本地。
+
+        文件由合思异步生成，生成期间按指数退避轮询。
         
-        :param retry_delay: 重试延迟时间(秒).默认为 120 秒。
-        :param max_retries: 最大重试次数.默认为 3 次。
+        :param initial_delay: 首次轮询间隔(秒).默认为 5 秒。
+        :param max_delay: 最大轮询间隔(秒).默认为 60 秒。
+        :param deadline: 轮询总截止时间(秒).默认为 600 秒。
         :return: 本地文件路径.如果失败则返回 None。
         """
         url = f"{self.base_url}/api/openapi/v1/banks/getAllBranch"
         params = {"accessToken": self.access_token}
 
-        for attempt in range(max_retries):
+        def check():
             try:
-                response = requests.post(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    code = data.get("code")
-                    msg = data.get("msg")
-                    download_url = data.get("url")
+                with metrics.timer("hesi_request", endpoint="getAllBranch"):
+                    response = requests.post(url, params=params)
+            except requests.exceptions.RequestException as e:
+                self.logger.warning("获取网点信息文件链接时发生异常: %s,稍后重试...", e)
+                return False, None
+            if response.status_code != 200:
+                raise Exception(f"请求失败: {response.status_code}, {response.text}")
 
-                    if code == "A200" and download_url:
-                        return self._download_file(download_url, "branch_info.xlsx")
-                    elif code in {"A201", "A202", "A203", "A204"}:
-                        self.logger.warning(f"状态: {msg}。将在 {retry_delay} 秒后重试...")
-                        time.sleep(retry_delay)
-                    else:
-                        self.logger.error(f"获取网点信息文件链接失败: {msg}")
-                        return None
-                else:
-                    self.logger.error(f"请求失败: {response.status_code}, {response.text}")
-                    return None
-            except Exception as e:
-                self.logger.error(f"获取网点信息文件链接时发生异常: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    return None
+            data = response.json()
+            code = data.get("code")
+            msg = data.get("msg")
+            download_url = data.get("url")
+            if code == "A200" and download_url:
+                return True, download_url
+            elif code in {"A201", "A202", "A203", "A204"}:
+                self.logger.info("状态: %s。稍后重试...", msg)
+                return False, None
+            raise Exception(f"获取网点信息文件链接失败: {msg}")
+
+        try:
+            download_url = poll_with_backoff(check, initial_delay=initial_delay, max_delay=max_delay, deadline=deadline)
+        except PollTimeout:
+            self.logger.error("网点信息文件在 %s 秒内未生成完成", deadline)
+            return None
+        except Exception:
+            self.logger.exception("获取网点文件失败")
+            return None
+        return self._download_file(download_url, "branch_info.xlsx")
 
     def _download_file(self, download_url: str, file_name: str) -> Optional[str]:
         """
@@ -192,18 +207,8 @@ class HesiOpenApi:
         :return: 本地文件路径.如果失败则返回 None。
         """
         try:
-            response = requests.get(download_url, stream=True)
-            if response.status_code == 200:
-                file_path = os.path.join(self.download_dir, file_name)
-                os.makedirs(self.download_dir, exist_ok=True)
-                with open(file_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                self.logger.info(f"文件下载成功: {file_path}")
-                return file_path
-            else:
-                self.logger.error(f"文件下载失败: {response.status_code}, {response.text}")
-                return None
+            file_path = os.path.join(self.download_dir, file_name)
+            return FileDownloader().download(download_url, file_path)
         except Exception as e:
-            self.logger.error(f"文件下载时发生异常: {e}")
+            self.logger.error("文件下载时发生异常: %s", e)
             return None
\ No newline at end of file
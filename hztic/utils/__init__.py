@@ -1,6 +1,27 @@
-from .token_manager import HesiTokenManager,BeisenTokenManager
-from .logger import Logger
-from .rate_limiter import BeisenRateLimiter
-from .database_manager import DatabaseManager
+"""
+工具包
 
-__all__ = ["HesiTokenManager", "BeisenTokenManager",'Logger','BeisenRateLimiter','DatabaseManager']
\ No newline at end of file
+各工具类按需导入(PEP 562)，导入 hztic.utils 的子模块时不会连带加载 SQLAlchemy、requests 等依赖。
+"""
+
+from typing import TYPE_CHECKING
+from .lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .token_manager import HesiTokenManager, BeisenTokenManager
+    from .logger import Logger, get_logger
+    from .rate_limiter import BeisenRateLimiter
+    from .database_manager import DatabaseManager
+
+_LAZY_ATTRS = {
+    "HesiTokenManager": ".token_manager",
+    "BeisenTokenManager": ".token_manager",
+    "Logger": ".logger",
+    "get_logger": ".logger",
+    "BeisenRateLimiter": ".rate_limiter",
+    "DatabaseManager": ".database_manager",
+}
+
+__all__ = ["HesiTokenManager", "BeisenTokenManager",'Logger','get_logger','BeisenRateLimiter','DatabaseManager']
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
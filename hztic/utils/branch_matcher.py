@@ -0,0 +1,156 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from hztic.utils.normalize import normalize_name
+
+DEFAULT_NGRAM = 2
+MAX_CANDIDATE_POSTINGS = 500            # 倒排列表超过该长度的高频 gram 只用于给已有候选加分
+
+
+def _bank_key(bank_name: Optional[str], branch_name: str) -> str:
+    """网点所属银行(归一化)，未提供银行名称时取网点名称中“银行”及之前的部分"""
+    if bank_name:
+        return normalize_name(bank_name)
+    pos = branch_name.find("银行")
+    return branch_name[:pos + 2] if pos >= 0 else ""
+
+
+def _ngrams(text: str, n: int = DEFAULT_NGRAM) -> set:
+    """字符 n-gram 集合(短于 n 的文本整体作为一个 gram)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class BranchMatcher:
+    """
+    银行网点名称匹配器
+
+    预先对网点表建立索引:
+    - 按归一化银行名称分块，查询名称以已知银行开头时只在该银行的网点中检索
+    - 每个分块内建立字符 n-gram 倒排索引，按 IDF 加权余弦相似度打分
+    - 候选集只由低频 gram 产生，“银行”“支行”等高频 gram 仅为已有候选加分
+    """
+    def __init__(self, branches: Iterable[Dict], ngram: int = DEFAULT_NGRAM):
+        """
+        :param branches: 网点数据字典(需包含 code、name，可选 bank_name)
+        :param ngram: n-gram 长度
+        """
+        self.ngram = ngram
+        self.codes: List[str] = []
+        self.names: List[str] = []
+        doc_grams: List[set] = []
+        doc_banks: List[str] = []
+
+        for branch in branches:
+            name = branch.get("name")
+            if not name:
+                continue
+            normalized = normalize_name(name)
+            self.codes.append(branch.get("code"))
+            self.names.append(name)
+            doc_grams.append(_ngrams(normalized, ngram))
+            doc_banks.append(_bank_key(branch.get("bank_name"), normalized))
+
+        # IDF 权重(平方后直接用于点积)
+        df = defaultdict(int)
+        for grams in doc_grams:
+            for gram in grams:
+                df[gram] += 1
+        total = len(doc_grams) or 1
+        self.weights: Dict[str, float] = {
+            gram: (math.log((1 + total) / (1 + count)) + 1) ** 2 for gram, count in df.items()
+        }
+        self.doc_norms: List[float] = [
+            math.sqrt(sum(self.weights[gram] for gram in grams)) or 1.0 for grams in doc_grams
+        ]
+
+        # 全局倒排索引及按银行分块的倒排索引
+        self.index: Dict[str, List[int]] = defaultdict(list)
+        self.block_index: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for doc_id, (grams, bank) in enumerate(zip(doc_grams, doc_banks)):
+            for gram in grams:
+                self.index[gram].append(doc_id)
+                if bank:
+                    self.block_index[bank][gram].append(doc_id)
+        self.max_bank_len = max((len(bank) for bank in self.block_index), default=0)
+        self._posting_sets: Dict[int, set] = {}
+
+    @classmethod
+    def from_database(cls, db_manager=None, ngram: int = DEFAULT_NGRAM) -> "BranchMatcher":
+        """从 bank_branches 表构建匹配器"""
+        if db_manager is None:
+            from hztic.utils.database_manager import DatabaseManager
+            db_manager = DatabaseManager()
+        return cls(db_manager.find_bank_branches(), ngram=ngram)
+
+    def _detect_bank(self, normalized: str) -> Optional[str]:
+        """最长前缀匹配查询名称所属的银行"""
+        for length in range(min(self.max_bank_len, len(normalized)), 1, -1):
+            prefix = normalized[:length]
+            if prefix in self.block_index:
+                return prefix
+        return None
+
+    def match(self, query: str, top_k: int = 5) -> List[Tuple[str, str, float]]:
+        """
+        匹配单个网点名称
+        :param query: 待匹配的网点名称
+        :param top_k: 返回的候选数量
+        :return: [(网点编号, 网点名称, 相似度)]，按相似度降序
+        """
+        normalized = normalize_name(query)
+        grams = _ngrams(normalized, self.ngram)
+        bank = self._detect_bank(normalized)
+        index = self.block_index[bank] if bank else self.index
+
+        postings = []
+        query_norm = 0.0
+        for gram in grams:
+            weight = self.weights.get(gram)
+            if weight is None:
+                continue
+            query_norm += weight
+            docs = index.get(gram)
+            if docs:
+                postings.append((docs, weight))
+        postings.sort(key=lambda item: len(item[0]))
+
+        scores = defaultdict(float)
+        for docs, weight in postings:
+            if len(docs) <= MAX_CANDIDATE_POSTINGS or not scores:
+                for doc_id in docs:
+                    scores[doc_id] += weight
+            else:
+                doc_set = self._posting_set(docs)
+                for doc_id in scores:
+                    if doc_id in doc_set:
+                        scores[doc_id] += weight
+        if not scores:
+            return []
+
+        query_norm = math.sqrt(query_norm)
+        doc_norms = self.doc_norms
+        ranked = heapq.nlargest(
+            top_k,
+            ((score / (query_norm * doc_norms[doc_id]), doc_id) for doc_id, score in scores.items())
+        )
+        return [(self.codes[doc_id], self.names[doc_id], round(score, 4)) for score, doc_id in ranked]
+
+    def _posting_set(self, docs: List[int]) -> set:
+        """高频 gram 倒排列表的集合形式(按需构建并缓存)"""
+        doc_set = self._posting_sets.get(id(docs))
+        if doc_set is None:
+            doc_set = self._posting_sets[id(docs)] = set(docs)
+        return doc_set
+
+    def match_batch(self, queries: Iterable[str], top_k: int = 5) -> List[List[Tuple[str, str, float]]]:
+        """批量匹配网点名称，重复名称只计算一次"""
+        cache = {}
+        results = []
+        for query in queries:
+            if query not in cache:
+                cache[query] = self.match(query, top_k)
+            results.append(cache[query])
+        return results
@@ -0,0 +1,154 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+from hztic.utils.logger import Logger
+
+
+class CoalescingQueue:
+    """
+    按 key 合并的防抖任务队列
+
+    同一 key 在防抖窗口内多次提交的条目会合并为一次执行；
+    持续有提交时，最迟在首次提交 max_delay 秒后执行，避免饿死。
+
+    提交时可附带 token(如事件ID)：token 关联的全部 key 执行完成后调用 on_done(token, error)，
+    error 为其中第一个执行失败的异常，全部成功时为 None。
+    """
+    def __init__(self, handler: Callable[[Hashable, Set[Any]], Any], debounce: float = 5.0, max_delay: float = 60.0,
+                 name: str = "coalescing-queue", on_done: Optional[Callable[[Hashable, Optional[Exception]], Any]] = None):
+        """
+        :param handler: 执行函数，参数为 (key, 合并后的条目集合)
+        :param debounce: 防抖窗口(秒)，最后一次提交后等待该时间再执行
+        :param max_delay: 首次提交后的最长等待时间(秒)
+        :param on_done: token 完成回调，参数为 (token, 异常或 None)
+        """
+        self.logger = Logger(name=self.__class__.__name__).get_logger()
+        self.handler = handler
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.on_done = on_done
+        self._pending: Dict[Hashable, Set[Any]] = {}
+        self._pending_tokens: Dict[Hashable, Set[Hashable]] = {}    # key -> 待执行的 token
+        self._token_keys: Dict[Hashable, Set[Hashable]] = {}        # token -> 尚未执行完成的 key
+        self._token_errors: Dict[Hashable, Exception] = {}
+        self._first_submit: Dict[Hashable, float] = {}
+        self._last_submit: Dict[Hashable, float] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.submitted = 0          # 累计提交次数
+        self.executed = 0           # 累计执行次数
+        self.failed = 0             # 累计执行失败次数
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Hashable, items: Iterable[Any], token: Optional[Hashable] = None):
+        """提交任务，合并到该 key 的待执行条目中"""
+        self.submit_many({key: items}, token)
+
+    def submit_many(self, entries: Dict[Hashable, Iterable[Any]], token: Optional[Hashable] = None):
+        """
+        一次提交多个 key 的任务
+        :param entries: {key: 条目}
+        :param token: 可选的 token，entries 中全部 key 执行完成后回调 on_done
+        """
+        now = time.monotonic()
+        with self._condition:
+            for key, items in entries.items():
+                self._pending.setdefault(key, set()).update(items)
+                self._first_submit.setdefault(key, now)
+                self._last_submit[key] = now
+                if token is not None:
+                    self._pending_tokens.setdefault(key, set()).add(token)
+                    self._token_keys.setdefault(token, set()).add(key)
+                self.submitted += 1
+            self._condition.notify()
+
+    def _deadline(self, key: Hashable) -> float:
+        return min(self._last_submit[key] + self.debounce, self._first_submit[key] + self.max_delay)
+
+    def _pop_due(self, force: bool = False) -> Dict[Hashable, tuple]:
+        """取出已到期的任务(调用方需持有锁)"""
+        now = time.monotonic()
+        due = [key for key in self._pending if force or self._deadline(key) <= now]
+        batch = {key: (self._pending.pop(key), self._pending_tokens.pop(key, set())) for key in due}
+        for key in due:
+            self._first_submit.pop(key, None)
+            self._last_submit.pop(key, None)
+        return batch
+
+    def _execute(self, batch: Dict[Hashable, tuple]):
+        for key, (items, tokens) in batch.items():
+            error = None
+            try:
+                self.handler(key, items)
+            except Exception as e:
+                error = e
+                self.failed += 1
+                self.logger.error("合并任务 %s 执行失败: %s", key, e)
+            finally:
+                self.executed += 1
+            self._complete(key, tokens, error)
+
+    def _complete(self, key: Hashable, tokens: Set[Hashable], error: Optional[Exception]):
+        """记录 key 的执行结果，token 关联的 key 全部完成时回调 on_done"""
+        done = []
+        with self._condition:
+            for token in tokens:
+                if error is not None:
+                    self._token_errors.setdefault(token, error)
+                keys = self._token_keys.get(token, set())
+                keys.discard(key)
+                if not keys:
+                    self._token_keys.pop(token, None)
+                    done.append((token, self._token_errors.pop(token, None)))
+        if self.on_done is None:
+            return
+        for token, token_error in done:
+            try:
+                self.on_done(token, token_error)
+            except Exception as e:
+                self.logger.error("合并任务 %s 完成回调执行失败: %s", token, e)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._pending:
+                        timeout = min(self._deadline(key) for key in self._pending) - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._condition.wait(timeout)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+                batch = self._pop_due()
+            self._execute(batch)
+
+    def flush(self):
+        """立即执行全部待执行任务"""
+        with self._condition:
+            batch = self._pop_due(force=True)
+        self._execute(batch)
+
+    def stop(self, flush: bool = True):
+        """停止队列，默认先执行剩余任务"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        if flush:
+            self.flush()
+
+    def metrics(self) -> Dict[str, float]:
+        """队列指标: 待执行 key 数、待执行条目数、未完成 token 数、提交/执行次数及合并比"""
+        with self._condition:
+            return {
+                "queue_depth": len(self._pending),
+                "pending_items": sum(len(items) for items in self._pending.values()),
+                "pending_tokens": len(self._token_keys),
+                "submitted": self.submitted,
+                "executed": self.executed,
+                "failed": self.failed,
+                "coalescing_ratio": round(self.submitted / self.executed, 2) if self.executed else 0.0,
+            }
@@ -1,18 +1,50 @@
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, inspect, DDL
-from hztic.models.db_models import Base, Organization, Employee, EmployeeStatus, JobLevel, EmploymentForm, Corporation
-import os
+from sqlalchemy import create_engine, event, inspect, DDL, MetaData, func, select, text, update
+from contextlib import contextmanager
+from itertools import chain, islice
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from hztic.models.db_models import Base, Organization, Employee, EmployeeStatus, JobLevel, EmploymentForm, Corporation, HesiStaff, Whitelist, BankBranch, HrEvent, RoleSnapshot
+import os, json
 from hztic.utils.logger import Logger
+from hztic.utils.org_tree import OrgTree
+
+# 数据库路径覆盖(基准测试、模拟环境使用独立数据库)
+DB_PATH_ENV = "HZTIC_DB_PATH"
+
+# 等待其他连接释放写锁的最长时间(毫秒)
+SQLITE_BUSY_TIMEOUT_MS = 30000
+
+# 同步暂存表: 北森数据先写入 staging_ 前缀的影子表，校验通过后在同一事务内合并到正式表
+STAGED_MODELS = (Corporation, Organization, Employee)
+_staging_metadata = MetaData()
+STAGING_TABLES = {
+    model.__tablename__: model.__table__.to_metadata(_staging_metadata, name=f"staging_{model.__tablename__}")
+    for model in STAGED_MODELS
+}
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """WAL 模式: 读取不阻塞写入，写入也不阻塞读取"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
 
 class DatabaseManager:
     """数据库管理器，用于管理数据库连接和数据操作。"""
 
-    def __init__(self):
+    def __init__(self, db_path: str = None):
+        """
+        :param db_path: 数据库文件路径，默认读取环境变量 HZTIC_DB_PATH，未设置时使用 data/db/app.db
+        """
         self.logger = Logger(name=self.__class__.__name__).get_logger()
         self.BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.DATABASE_PATH = os.path.join(self.BASE_DIR, "data", "db", "app.db")
+        self.DATABASE_PATH = db_path or os.environ.get(DB_PATH_ENV) or os.path.join(self.BASE_DIR, "data", "db", "app.db")
         self.DATABASE_URL = f"sqlite:///{self.DATABASE_PATH}"
         self.engine = create_engine(self.DATABASE_URL)
+        event.listen(self.engine, "connect", _set_sqlite_pragma)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         self.logger.debug("DB connection init done. URL: %s", self.DATABASE_URL)
         self.sync_table_structure()
@@ -66,6 +98,150 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @contextmanager
+    def snapshot(self):
+        """
+        只读快照会话，会话内的所有查询读取同一时刻已提交的数据(期间其他连接的写入不可见)
+
+        用法: with db_manager.snapshot() as session: ...
+        """
+        session = self.SessionLocal()
+        try:
+            # pysqlite 只在写语句前自动开启事务，显式开启后首次查询即固定读取快照
+            session.connection().exec_driver_sql("BEGIN")
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
+    def get_table_columns(self, table_name, columns, session=None):
+        """
+        按列读取整表数据
+        :param table_name: 表名
+        :param columns: 字段名列表
+        :param session: 可选的数据库会话(如快照会话)，未提供时新建会话
+        :return: {字段名: 值元组}
+        """
+        own_session = session is None
+        session = session or self.SessionLocal()
+        try:
+            table = Base.metadata.tables[table_name]
+            rows = session.execute(select(*(table.c[name] for name in columns))).all()
+            values = list(zip(*rows)) if rows else [()] * len(columns)
+            return dict(zip(columns, values))
+        finally:
+            if own_session:
+                session.close()
+
+    def begin_staging(self):
+        """清空并重建同步暂存表(表结构与正式表保持一致)"""
+        _staging_metadata.drop_all(self.engine)
+        _staging_metadata.create_all(self.engine)
+
+    def stage_records(self, model, records, batch_size=5000):
+        """
+        批量写入暂存表，主键重复时保留最后一条
+        :param model: 正式表模型(Corporation、Organization、Employee)
+        :param records: 北森数据对象列表(base_models 中的记录类型，字段名与表字段一致)
+        :return: 写入的行数
+        """
+        table = STAGING_TABLES[model.__tablename__]
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return 0
+        # 按记录字段的声明顺序生成 INSERT 语句，参数直接使用 to_row() 元组，不逐行构造字典
+        quote = self.engine.dialect.identifier_preparer.quote
+        names = first.field_names()
+        sql = (
+            f"INSERT OR REPLACE INTO {quote(table.name)} ({', '.join(quote(name) for name in names)}) "
+            f"VALUES ({', '.join('?' * len(names))})"
+        )
+        session = self.SessionLocal()
+        try:
+            count = 0
+            records = chain((first,), records)
+            while batch := [record.to_row() for record in islice(records, batch_size)]:
+                session.connection().exec_driver_sql(sql, batch)
+                count += len(batch)
+            session.commit()
+            return count
+        except Exception as e:
+            session.rollback()
+            self.logger.error("写入暂存表 %s 失败: %s", table.name, e)
+            raise e
+        finally:
+            session.close()
+
+    def validate_staging(self):
+        """
+        校验暂存数据
+        :return: 错误信息列表，为空表示校验通过
+        """
+        errors = []
+        session = self.SessionLocal()
+        try:
+            for model in STAGED_MODELS:
+                table = STAGING_TABLES[model.__tablename__]
+                for key in table.primary_key.columns:
+                    missing = session.execute(
+                        select(func.count()).select_from(table).where((key.is_(None)) | (key == ""))
+                    ).scalar()
+                    if missing:
+                        errors.append(f"{table.name}: {missing} 条记录缺少 {key.name}")
+
+            # 员工所在部门应存在于正式表或本次暂存的组织中(只记录警告)
+            staging_orgs = STAGING_TABLES[Organization.__tablename__]
+            staging_employees = STAGING_TABLES[Employee.__tablename__]
+            known_orgs = select(Organization.org_id).union(select(staging_orgs.c.org_id))
+            orphans = session.execute(
+                select(func.count()).select_from(staging_employees).where(
+                    staging_employees.c.oId_department_id.isnot(None),
+                    staging_employees.c.oId_department_id.notin_(known_orgs)
+                )
+            ).scalar()
+            if orphans:
+                self.logger.warning("暂存员工中有 %d 人的部门不在组织表中", orphans)
+            return errors
+        finally:
+            session.close()
+
+    def swap_staging(self, org_path_nodes=()):
+        """
+        在同一事务内将暂存数据合并到正式表并清空暂存表，读取方只会看到合并前或合并后的完整数据
+        :param org_path_nodes: 需要同步更新路径的下级组织(OrgNode 列表，上级改名或调整导致)
+        :return: {表名: 合并行数}
+        """
+        counts = {}
+        session = self.SessionLocal()
+        try:
+            for model in STAGED_MODELS:
+                table = STAGING_TABLES[model.__tablename__]
+                columns = [column.name for column in table.columns]
+                counts[model.__tablename__] = session.execute(
+                    sqlite_insert(model.__table__).prefix_with("OR REPLACE").from_select(
+                        columns, select(*(table.c[name] for name in columns))
+                    )
+                ).rowcount
+            path_rows = self._org_path_rows(org_path_nodes)
+            if path_rows:
+                session.execute(update(Organization), path_rows)
+            # 与逐条保存员工时一致: 只保留试用、正式状态的员工
+            session.query(Employee).filter(
+                Employee.employee_status.notin_([2, 3])
+            ).delete(synchronize_session=False)
+            for table in STAGING_TABLES.values():
+                session.execute(table.delete())
+            session.commit()
+            self.logger.debug("Staging tables swapped in: %s", counts)
+            return counts
+        except Exception as e:
+            session.rollback()
+            self.logger.error("合并暂存数据失败: %s", e)
+            raise e
+        finally:
+            session.close()
+
     def save_organization(self, org):
         """保存组织数据到数据库（如果已存在则更新）"""
         session = self.SessionLocal()
@@ -87,7 +263,7 @@ class DatabaseManager:
             else:
                 # 插入新数据
                 self.logger.debug("组织 %s 不存在，正在插入新数据...", org.org_id)
-                db_org = Organization(**org.__dict__)
+                db_org = Organization(**org.to_dict())
                 session.add(db_org)
             session.commit()
             self.logger.debug("data %s save success。", org.org_id)
@@ -119,9 +295,12 @@ class DatabaseManager:
                 existing_emp.email = emp.email
                 existing_emp.service_type = emp.service_type
                 existing_emp.employment_form = emp.employment_form
+                existing_emp.bank_name = emp.bank_name
+                existing_emp.bank_branch = emp.bank_branch
+                existing_emp.bank_account = emp.bank_account
             else:
                 self.logger.debug("Field user_id: %s not found, inserting...", emp.user_id)
-                db_emp = Employee(**emp.__dict__)
+                db_emp = Employee(**emp.to_dict())
                 session.add(db_emp)
             session.commit()
             self.logger.debug("Save user_id: %s success.", emp.user_id)
@@ -148,7 +327,7 @@ class DatabaseManager:
             if existing_job_level:
                 existing_job_level.object_id = job_level.object_id
             else:
-                db_job_level = JobLevel(**job_level.__dict__)
+                db_job_level = JobLevel(**job_level.to_dict())
                 session.add(db_job_level)
             session.commit()
         except Exception as e:
@@ -169,7 +348,7 @@ class DatabaseManager:
             if existing_employment_form:
                 existing_employment_form.object_id = employment_form.object_id
             else:
-                db_employment_form = EmploymentForm(**employment_form.__dict__)
+                db_employment_form = EmploymentForm(**employment_form.to_dict())
                 session.add(db_employment_form)
             session.commit()
         except Exception as e:
@@ -194,7 +373,7 @@ class DatabaseManager:
                 existing_corp.extyinhangzhanghao = corp.extyinhangzhanghao
                 existing_corp.extzuzhidaima = corp.extzuzhidaima
             else:
-                db_corp = Corporation(**corp.__dict__)
+                db_corp = Corporation(**corp.to_dict())
                 session.add(db_corp)
             session.commit()
         except Exception as e:
@@ -203,72 +382,97 @@ class DatabaseManager:
         finally:
             session.close()
             
-    def get_organization_staff_mapping(self, path_type="name"):
+    def load_org_tree(self, session=None):
+        """
+        从 organizations 表构建组织架构树
+        :param session: 可选的数据库会话，未提供时新建会话
+        :return: OrgTree
+        """
+        if session is not None:
+            return OrgTree.from_session(session)
+        session = self.SessionLocal()
+        try:
+            return OrgTree.from_session(session)
+        finally:
+            session.close()
+
+    def update_org_paths(self, nodes):
+        """
+        批量更新组织的路径字段（上级改名或调整后，下级组织路径随之变化）
+        :param nodes: OrgNode 列表
+        """
+        rows = self._org_path_rows(nodes)
+        if not rows:
+            return
+        session = self.SessionLocal()
+        try:
+            session.execute(update(Organization), rows)
+            session.commit()
+            self.logger.debug("Updated tree paths of %d organizations.", len(rows))
+        except Exception as e:
+            session.rollback()
+            self.logger.error("更新组织路径失败: %s", e)
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def _org_path_rows(nodes):
+        """组织路径批量更新参数"""
+        return [
+            {"org_id": node.org_id, "tree_path": "/".join(node.id_path), "tree_path_text": "/".join(node.path)}
+            for node in nodes
+        ]
+
+    def get_organization_staff_mapping(self, path_type="name", session=None):
         """
         获取组织部门与员工的映射关系。
 
         :param path_type: 路径类型，可选值为 "name"（名称）、"code"（编码）、"id"(ID),默认为 "name"
+        :param session: 可选的数据库会话(如快照会话)，未提供时新建会话
         :return: 返回组织部门与员工的映射关系列表
         """
-        session = self.SessionLocal()
+        own_session = session is None
+        session = session or self.SessionLocal()
         try:
-            # 查询 organizations 表中的 person_in_charge 和 tree_path_text
+            tree = self.load_org_tree(session)
+
+            # 查询 organizations 表中的 org_id 和 person_in_charge
             org_data = session.query(
-                Organization.person_in_charge,
-                Organization.tree_path_text
+                Organization.org_id,
+                Organization.person_in_charge
+            ).filter(
+                Organization.person_in_charge.isnot(None)
             ).all()
 
-            result = []
-            for person_in_charge, tree_path_text in org_data:
-                if not person_in_charge or not tree_path_text:
-                    continue
-
-                # 根据 person_in_charge 匹配 employees 表中的 user_id，获取 job_number
-                employee = session.query(Employee.job_number).filter(
-                    Employee.user_id == person_in_charge
-                ).first()
+            # 根据 person_in_charge 匹配 employees 表中的 user_id，获取 job_number
+            job_numbers = dict(session.query(Employee.user_id, Employee.job_number).filter(
+                Employee.user_id.in_({person for _, person in org_data if person})
+            ).all())
 
-                if not employee:
+            # 按路径聚合，避免重复
+            grouped = {}
+            for org_id, person_in_charge in org_data:
+                job_number = job_numbers.get(person_in_charge)
+                path = tree.get_path(org_id)
+                if not job_number or not path:
                     continue
+                grouped.setdefault(path, []).append(job_number)
 
-                # 解析 tree_path_text 为路径列表
-                path_list = tree_path_text.split("/")
-
-                # 根据 path_type 确定路径类型
-                if path_type == "code":
-                    # 假设 tree_path_text 是编码路径，直接使用
-                    path_list = tree_path_text.split("/")
-                elif path_type == "id":
-                    # 假设 tree_path_text 是 ID 路径，直接使用
-                    path_list = tree_path_text.split("/")
-                else:
-                    # 默认使用名称路径
-                    path_list = tree_path_text.split("/")
-
-                # 构建返回数据结构
-                mapping = {
-                    "pathType": path_type,
-                    "path": path_list,
-                    "staffs": [employee.job_number]
-                }
-
-                # 检查是否已存在相同路径的映射，避免重复
-                existing_mapping = next((item for item in result if item["path"] == path_list), None)
-                if existing_mapping:
-                    existing_mapping["staffs"].append(employee.job_number)
-                else:
-                    result.append(mapping)
-
-            return result
+            return [
+                {"pathType": path_type, "path": list(path), "staffs": staffs}
+                for path, staffs in grouped.items()
+            ]
 
         except Exception as e:
             self.logger.error("获取组织部门与员工映射关系失败: %s", e)
             raise e
         finally:
-            session.close()
+            if own_session:
+                session.close()
         
         
-    def get_manager_org_path(self):
+    def get_manager_org_path(self, session=None):
         """
         获取经理级以上员工的工号及部门路径信息
         :return: 返回包含经理级以上员工的部门路径信息列表，格式为：
@@ -280,9 +484,13 @@ class DatabaseManager:
                 },
                 ...
             ]
+        :param session: 可选的数据库会话(如快照会话)，未提供时新建会话
         """
-        session = self.SessionLocal()
+        own_session = session is None
+        session = session or self.SessionLocal()
         try:
+            tree = self.load_org_tree(session)
+
             # 查询经理级以上员工
             managers = session.query(
                 Employee.job_number,
@@ -293,31 +501,414 @@ class DatabaseManager:
             ).filter(
                 Employee.oId_job_level_text.in_(["经理级", "总经理级"])
             ).all()
-            result = []
+
+            # 按部门路径聚合
+            grouped = {}
             for job_number, department_id in managers:
-                if not department_id:
+                path = tree.get_path(department_id) if department_id else None
+                if not path:
                     continue
-                # 查询对应的部门路径
-                org = session.query(Organization.tree_path_text).filter(
-                    Organization.org_id == department_id
-                ).first()
-                if not org or not org.tree_path_text:
-                    continue
-                # 解析路径
-                path_list = org.tree_path_text.split("/")
-                # 查找是否已有相同路径的记录
-                existing = next((item for item in result if item["path"] == path_list), None)
-                if existing:
-                    existing["staffs"].append(job_number)
-                else:
-                    result.append({
-                        "pathType": "name",
-                        "path": path_list,
-                        "staffs": [job_number]
-                    })
-            return result
+                grouped.setdefault(path, []).append(job_number)
+
+            return [
+                {"pathType": "name", "path": list(path), "staffs": staffs}
+                for path, staffs in grouped.items()
+            ]
         except Exception as e:
             self.logger.error("获取经理级员工部门路径失败: %s", e)
             raise e
         finally:
-            session.close()
\ No newline at end of file
+            if own_session:
+                session.close()
+
+    def get_hesi_staff_watermark(self):
+        """
+        获取合思员工镜像表的增量同步水位
+        :return: 本地已同步的最大更新时间（毫秒时间戳），无数据时返回 0
+        """
+        session = self.SessionLocal()
+        try:
+            watermark = session.query(func.max(HesiStaff.update_time)).scalar()
+            return watermark or 0
+        finally:
+            session.close()
+
+    def save_hesi_staffs(self, staffs):
+        """
+        批量保存合思员工到镜像表（如果已存在则更新）
+
+        员工列表接口不返回点位授权状态，auth_state 只由 mark_hesi_staffs_auth_state 在授权接口调用成功后设置：
+        新员工写入时为未授权，已有员工更新时保留原授权状态。
+
+        :param staffs: 合思员工列表接口返回的员工字典列表
+        :return: 写入的行数
+        """
+        rows = [
+            {
+                "staff_id": staff.get("id"),
+                "code": staff.get("code"),
+                "name": staff.get("name"),
+                "active": bool(staff.get("active")),
+                "update_time": staff.get("updateTime") or 0,
+            }
+            for staff in staffs
+            if staff.get("id")
+        ]
+        if not rows:
+            return 0
+
+        stmt = sqlite_insert(HesiStaff)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[HesiStaff.staff_id],
+            set_={
+                "code": stmt.excluded.code,
+                "name": stmt.excluded.name,
+                "active": stmt.excluded.active,
+                "update_time": stmt.excluded.update_time,
+            }
+        )
+        session = self.SessionLocal()
+        try:
+            session.execute(stmt, rows)
+            session.commit()
+            self.logger.debug("Saved %d hesi staffs.", len(rows))
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            self.logger.error("保存合思员工镜像失败: %s", e)
+            raise e
+        finally:
+            session.close()
+
+    def mark_hesi_staffs_auth_state(self, codes, auth_state=True):
+        """
+        更新镜像表中员工的点位授权状态（调用授权接口成功后同步本地状态）
+
+        :param codes: 员工工号列表
+        :param auth_state: 授权状态
+        """
+        if not codes:
+            return
+        session = self.SessionLocal()
+        try:
+            session.query(HesiStaff).filter(
+                HesiStaff.code.in_(list(codes))
+            ).update({HesiStaff.auth_state: auth_state}, synchronize_session=False)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.logger.error("更新合思员工授权状态失败: %s", e)
+            raise e
+        finally:
+            session.close()
+
+    def get_staff_activation_diff(self, desired_codes):
+        """
+        根据合思员工镜像计算需要激活与停用授权的员工
+
+        :param desired_codes: 期望处于激活状态的员工工号集合
+        :return: (to_activate, to_deactivate)
+            to_activate: 镜像中不存在或尚未授权的工号列表
+            to_deactivate: 镜像中已授权、但不在期望集合且不在白名单中的工号列表
+        """
+        desired = {code for code in desired_codes if code}
+        session = self.SessionLocal()
+        try:
+            authorized = {
+                code for (code,) in session.query(HesiStaff.code).filter(
+                    HesiStaff.auth_state.is_(True),
+                    HesiStaff.code.isnot(None)
+                )
+            }
+            whitelist = {
+                staff_id for (staff_id,) in session.query(Whitelist.staff_id).filter(
+                    Whitelist.is_deleted.is_(False)
+                )
+            }
+        finally:
+            session.close()
+
+        to_activate = sorted(desired - authorized)
+        to_deactivate = sorted(authorized - desired - whitelist)
+        return to_activate, to_deactivate
+
+    def count_authorized_hesi_staffs(self):
+        """统计镜像表中本地记录为已授权的员工数量"""
+        session = self.SessionLocal()
+        try:
+            return session.query(func.count(HesiStaff.staff_id)).filter(HesiStaff.auth_state.is_(True)).scalar()
+        finally:
+            session.close()
+
+    def replace_bank_branches(self, rows, batch_size=5000):
+        """
+        使用新的网点数据整体替换 bank_branches 表
+
+        数据先分批写入无索引的暂存表，再在同一事务内替换正式表，
+        读取方在替换完成前始终看到旧数据。
+
+        :param rows: 网点数据字典的可迭代对象(可为生成器)
+        :param batch_size: 每批写入的行数
+        :return: 写入的行数
+        """
+        table = BankBranch.__tablename__
+        staging = f"{table}_staging"
+        columns = [column.name for column in BankBranch.__table__.columns]
+        column_list = ", ".join(columns)
+        insert_sql = text(
+            f"INSERT INTO {staging} ({column_list}) VALUES ({', '.join(':' + c for c in columns)})"
+        )
+
+        total = 0
+        rows = iter(rows)
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            conn.execute(text(f"CREATE TABLE {staging} AS SELECT {column_list} FROM {table} WHERE 0"))
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                conn.execute(insert_sql, batch)
+                total += len(batch)
+        self.logger.debug("Staged %d bank branches.", total)
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {table}"))
+            conn.execute(text(f"INSERT OR REPLACE INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"))
+            conn.execute(text(f"DROP TABLE {staging}"))
+        self.logger.info("bank_branches 表已替换，共 %d 条网点数据。", total)
+        return total
+
+    def get_bank_branch(self, code):
+        """
+        根据网点编号查询网点
+        :param code: 网点编号
+        :return: 网点信息字典，不存在时返回 None
+        """
+        session = self.SessionLocal()
+        try:
+            branch = session.get(BankBranch, code)
+            return self._bank_branch_to_dict(branch) if branch else None
+        finally:
+            session.close()
+
+    def find_bank_branches(self, bank_name=None, province=None, city=None):
+        """
+        按银行名称及地区查询网点
+        :param bank_name: 所属银行
+        :param province: 省份
+        :param city: 城市
+        :return: 网点信息字典列表
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(BankBranch)
+            if bank_name:
+                query = query.filter(BankBranch.bank_name == bank_name)
+            if province:
+                query = query.filter(BankBranch.province == province)
+            if city:
+                query = query.filter(BankBranch.city == city)
+            return [self._bank_branch_to_dict(branch) for branch in query]
+        finally:
+            session.close()
+
+    @staticmethod
+    def _bank_branch_to_dict(branch):
+        return {column.name: getattr(branch, column.name) for column in BankBranch.__table__.columns}
+
+    def get_employee_bank_accounts(self):
+        """
+        获取在职员工的银行账户信息
+        :return: 员工银行账户字典列表
+        """
+        session = self.SessionLocal()
+        try:
+            rows = session.query(
+                Employee.user_id,
+                Employee.job_number,
+                Employee.employee_name,
+                Employee.bank_name,
+                Employee.bank_branch,
+                Employee.bank_account
+            ).filter(
+                Employee.employee_status.in_(["2", "3"])
+            ).all()
+            return [row._asdict() for row in rows]
+        finally:
+            session.close()
+
+    def get_employee_department_ids(self, user_ids):
+        """
+        获取员工当前所在部门
+        :param user_ids: 员工UserID列表
+        :return: {user_id: oId_department_id}
+        """
+        session = self.SessionLocal()
+        try:
+            return dict(session.query(Employee.user_id, Employee.oId_department_id).filter(
+                Employee.user_id.in_(list(user_ids))
+            ).all())
+        finally:
+            session.close()
+
+    def get_org_leaders(self, org_ids):
+        """
+        获取组织当前的负责人
+        :param org_ids: 组织ID列表
+        :return: {org_id: person_in_charge}
+        """
+        session = self.SessionLocal()
+        try:
+            return dict(session.query(Organization.org_id, Organization.person_in_charge).filter(
+                Organization.org_id.in_(list(org_ids))
+            ).all())
+        finally:
+            session.close()
+
+    def get_orgs_in_charge(self, user_ids):
+        """
+        获取员工担任负责人的组织
+        :param user_ids: 员工UserID列表
+        :return: 组织ID列表
+        """
+        session = self.SessionLocal()
+        try:
+            return [org_id for (org_id,) in session.query(Organization.org_id).filter(
+                Organization.person_in_charge.in_(list(user_ids))
+            )]
+        finally:
+            session.close()
+
+    def enqueue_hr_event(self, payload):
+        """
+        HR事件入队(持久化到 hr_events 表)
+        :param payload: 回调数据字典
+        :return: 事件ID
+        """
+        session = self.SessionLocal()
+        try:
+            event = HrEvent(payload=json.dumps(payload, ensure_ascii=False), status="pending", attempts=0)
+            session.add(event)
+            session.commit()
+            return event.id
+        except Exception as e:
+            session.rollback()
+            self.logger.error("HR事件入队失败: %s", e)
+            raise e
+        finally:
+            session.close()
+
+    def claim_hr_events(self, limit=20):
+        """
+        领取待处理的HR事件(按接收顺序)，领取后状态置为 processing
+        :param limit: 最多领取的事件数
+        :return: [(事件ID, 回调数据字典)]
+        """
+        session = self.SessionLocal()
+        try:
+            events = session.query(HrEvent).filter(
+                HrEvent.status == "pending"
+            ).order_by(HrEvent.id).limit(limit).all()
+            for event in events:
+                event.status = "processing"
+                event.attempts = (event.attempts or 0) + 1
+            session.commit()
+            return [(event.id, json.loads(event.payload)) for event in events]
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def finish_hr_event(self, event_id, error=None, max_attempts=5):
+        """
+        标记HR事件处理结果，失败且未超过最大次数时重新置为 pending
+        :param event_id: 事件ID
+        :param error: 失败原因，成功时为 None
+        :param max_attempts: 最大处理次数
+        """
+        session = self.SessionLocal()
+        try:
+            event = session.get(HrEvent, event_id)
+            if event is None:
+                return
+            if error is None:
+                event.status = "done"
+                event.error = None
+            else:
+                event.status = "pending" if event.attempts < max_attempts else "failed"
+                event.error = str(error)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def reset_processing_hr_events(self):
+        """将异常退出时遗留的 processing 事件恢复为 pending"""
+        session = self.SessionLocal()
+        try:
+            count = session.query(HrEvent).filter(
+                HrEvent.status == "processing"
+            ).update({HrEvent.status: "pending"}, synchronize_session=False)
+            session.commit()
+            return count
+        finally:
+            session.close()
+
+    def count_hr_events_by_status(self):
+        """
+        统计各状态的HR事件数量
+        :return: {status: count}
+        """
+        session = self.SessionLocal()
+        try:
+            return dict(session.query(HrEvent.status, func.count(HrEvent.id)).group_by(HrEvent.status).all())
+        finally:
+            session.close()
+
+
+    def get_role_snapshot(self, role_id):
+        """
+        获取角色最近一次推送的配置
+        :param role_id: 角色ID
+        :return: {路径元组: 工号列表}
+        """
+        session = self.SessionLocal()
+        try:
+            rows = session.query(RoleSnapshot.path, RoleSnapshot.staffs).filter(RoleSnapshot.role_id == role_id).all()
+            return {tuple(json.loads(path)): json.loads(staffs) for path, staffs in rows}
+        finally:
+            session.close()
+
+    def save_role_snapshot(self, role_id, contents, partial=False):
+        """
+        保存推送成功的角色配置
+        :param role_id: 角色ID
+        :param contents: 推送的角色配置内容
+        :param partial: 是否为定向更新；定向更新只替换推送的路径(员工为空的路径删除)，否则整体替换
+        """
+        session = self.SessionLocal()
+        try:
+            paths = [json.dumps(list(item["path"]), ensure_ascii=False) for item in contents]
+            query = session.query(RoleSnapshot).filter(RoleSnapshot.role_id == role_id)
+            if partial:
+                query.filter(RoleSnapshot.path.in_(paths)).delete(synchronize_session=False)
+            else:
+                query.delete(synchronize_session=False)
+            rows = [
+                {"role_id": role_id, "path": path, "staffs": json.dumps(item.get("staffs") or [], ensure_ascii=False)}
+                for path, item in zip(paths, contents)
+                if item.get("staffs")
+            ]
+            if rows:
+                session.execute(sqlite_insert(RoleSnapshot).prefix_with("OR REPLACE"), rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.logger.error("保存角色 %s 配置快照失败: %s", role_id, e)
+            raise e
+        finally:
+            session.close()
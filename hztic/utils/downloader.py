@@ -0,0 +1,160 @@
+import os, json, hashlib, requests
+from typing import Dict, Optional
+from hztic.config import download_chunk_size
+from hztic.utils.logger import Logger
+
+
+class DownloadError(Exception):
+    """文件下载或校验失败"""
+
+
+class FileDownloader:
+    """
+    文件下载器
+
+    - 分块流式写入临时文件(.part),完成校验后再替换目标文件
+    - 临时文件存在且记录了 ETag/Last-Modified 时通过 HTTP Range + If-Range 断点续传，
+      没有校验标识时无法确认服务端文件未变化，丢弃临时文件重新下载
+    - 校验 Content-Length 及可选的 SHA-256
+    - 记录 ETag/Last-Modified,文件未变化时跳过下载
+    """
+    def __init__(self, chunk_size: int = download_chunk_size, timeout: int = 60, max_retries: int = 3):
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be >= 1, got {max_retries}")
+        self.logger = Logger(name=self.__class__.__name__).get_logger()
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        self.skipped = False            # 最近一次下载是否因文件未变化而跳过
+
+    def download(self, url: str, file_path: str, expected_sha256: Optional[str] = None) -> str:
+        """
+        下载文件到本地。
+
+        :param url: 文件下载链接。
+        :param file_path: 本地保存路径。
+        :param expected_sha256: 期望的文件 SHA-256(可选)。
+        :return: 本地文件路径。
+        """
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self.skipped = False
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return self._download_once(url, file_path, expected_sha256)
+            except requests.exceptions.RequestException as e:
+                self.logger.warning("文件下载中断(第 %d 次): %s", attempt, e)
+                if attempt == self.max_retries:
+                    raise DownloadError(f"Failed to download file after {attempt} attempts: {e}")
+
+    def _download_once(self, url: str, file_path: str, expected_sha256: Optional[str]) -> str:
+        """执行一次下载请求(可能为续传或条件请求)"""
+        part_file = f"{file_path}.part"
+        meta = self._load_meta(f"{file_path}.meta.json")
+        part_meta = self._load_meta(f"{part_file}.json")
+        offset = os.path.getsize(part_file) if os.path.exists(part_file) else 0
+        validator = part_meta.get("etag") or part_meta.get("last_modified")
+        if offset and not validator:
+            self.logger.info("临时文件缺少 ETag/Last-Modified,无法续传,重新下载: %s", file_path)
+            self._remove(part_file, f"{part_file}.json")
+            offset = 0
+
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        elif os.path.exists(file_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304:
+                self.skipped = True
+                self.logger.info("文件未变化,跳过下载: %s", file_path)
+                return file_path
+            if response.status_code == 416:
+                # 续传起点超出文件长度,丢弃临时文件重新下载
+                self._remove(part_file, f"{part_file}.json")
+                raise requests.exceptions.RequestException("Range not satisfiable, restarting download")
+            if response.status_code not in (200, 206):
+                raise DownloadError(f"Failed to download file: {response.status_code}, {response.text}")
+
+            resumed = response.status_code == 206
+            if resumed and not response.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+                self._remove(part_file, f"{part_file}.json")
+                raise requests.exceptions.RequestException("Unexpected Content-Range, restarting download")
+            if not resumed:
+                offset = 0
+            expected_size = self._expected_size(response, offset)
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            if validators["etag"] and validators["etag"] == meta.get("etag") and os.path.exists(file_path) and not resumed:
+                # 服务端不支持条件请求但 ETag 未变化
+                self.skipped = True
+                self.logger.info("文件 ETag 未变化,跳过下载: %s", file_path)
+                return file_path
+            self._save_meta(f"{part_file}.json", validators)
+
+            self.logger.debug("开始下载 %s (offset=%d, size=%s)", file_path, offset, expected_size)
+            with open(part_file, "ab" if resumed else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+
+        size = os.path.getsize(part_file)
+        if expected_size is not None and size != expected_size:
+            raise requests.exceptions.RequestException(f"Incomplete download: {size}/{expected_size} bytes")
+
+        sha256 = self._sha256(part_file)
+        if expected_sha256 and sha256.lower() != expected_sha256.lower():
+            self._remove(part_file, f"{part_file}.json")
+            raise DownloadError(f"Checksum mismatch for {file_path}: {sha256} != {expected_sha256}")
+
+        os.replace(part_file, file_path)
+        self._remove(f"{part_file}.json")
+        self._save_meta(f"{file_path}.meta.json", dict(validators, size=size, sha256=sha256))
+        self.logger.info("文件下载成功: %s (%d bytes)", file_path, size)
+        return file_path
+
+    @staticmethod
+    def _expected_size(response, offset: int) -> Optional[int]:
+        """根据 Content-Range/Content-Length 计算文件完整大小"""
+        content_range = response.headers.get("Content-Range")
+        if content_range and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                return int(total)
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and not response.headers.get("Content-Encoding"):
+            return offset + int(content_length)
+        return None
+
+    def _sha256(self, file_path: str) -> str:
+        """计算文件 SHA-256"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _load_meta(meta_file: str) -> Dict:
+        if os.path.exists(meta_file):
+            with open(meta_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    @staticmethod
+    def _save_meta(meta_file: str, meta: Dict):
+        with open(meta_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _remove(*paths):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,78 @@
+import os
+import time
+from hztic.config import LOCK_DIR
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class LockBusy(Exception):
+    """锁已被其他进程或线程持有"""
+
+
+class FileLock:
+    """
+    跨进程文件锁(默认非阻塞，可指定等待时间)
+
+    同一任务在多个进程(定时调度、--run-now、回调服务)间互斥执行，
+    进程异常退出时由操作系统自动释放。
+    """
+    def __init__(self, name: str, lock_dir: str = LOCK_DIR):
+        self.lock_file = os.path.join(lock_dir, f"{name}.lock")
+        self.lock_dir = lock_dir
+        self._fd = None
+
+    def acquire(self, timeout: float = 0, poll_interval: float = 1.0) -> bool:
+        """
+        尝试获取锁
+        :param timeout: 锁被占用时的最长等待时间(秒)，默认不等待
+        :param poll_interval: 等待时重试的间隔(秒)
+        :return: 超时仍未获取到锁时返回 False
+        """
+        deadline = time.monotonic() + timeout
+        while not self._try_acquire():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+        return True
+
+    def _try_acquire(self) -> bool:
+        os.makedirs(self.lock_dir, exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT)
+        try:
+            if os.name == "nt":
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        """释放锁"""
+        if self._fd is None:
+            return
+        try:
+            if os.name == "nt":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise LockBusy(f"Lock {self.lock_file} is held by another process")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,31 @@
+"""
+包属性按需导入(PEP 562)
+
+用法(包的 __init__.py 中):
+    __getattr__, __dir__ = lazy_exports(__name__, {"DatabaseManager": ".database_manager"})
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, attrs: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    生成包的模块级 __getattr__ 及 __dir__，首次访问属性时才导入所在模块
+    :param package: 包名(__name__)
+    :param attrs: {属性名: 相对模块名}
+    :return: (__getattr__, __dir__)
+    """
+    def __getattr__(name):
+        module_name = attrs.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(attrs))
+
+    return __getattr__, __dir__
@@ -1,21 +1,112 @@
+import atexit
+import contextvars
+import json
 import logging
 import os
+import queue
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
 from logging.config import dictConfig
-from hztic.config import LOG_DIR
-import inspect
+from logging.handlers import QueueListener
+from hztic.config import LOG_DIR, LOG_FORMAT
+
+_loggers = {}
+
+# 日志上下文: 同步运行ID、阶段、实体类型(按线程/协程隔离)
+_run_id = contextvars.ContextVar("run_id", default=None)
+_phase = contextvars.ContextVar("phase", default=None)
+_entity = contextvars.ContextVar("entity", default=None)
+
+CONTEXT_FIELDS = ("run_id", "phase", "entity")
+
+
+def set_run_id(run_id=None):
+    """
+    设置当前上下文的运行ID
+    :param run_id: 运行ID（可选，默认生成新ID）
+    :return: 运行ID
+    """
+    run_id = run_id or uuid.uuid4().hex[:12]
+    _run_id.set(run_id)
+    return run_id
+
+
+def get_run_id():
+    """当前上下文的运行ID"""
+    return _run_id.get()
+
+
+@contextmanager
+def log_context(phase=None, entity=None):
+    """在上下文内为日志记录附加阶段及实体类型"""
+    tokens = []
+    if phase is not None:
+        tokens.append((_phase, _phase.set(phase)))
+    if entity is not None:
+        tokens.append((_entity, _entity.set(entity)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """在调用线程中为日志记录附加上下文字段(记录随后进入队列，由监听线程输出)"""
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        record.phase = _phase.get()
+        record.entity = _entity.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """结构化 JSON 日志，每条记录一行"""
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        duration = getattr(record, "duration", None)
+        if duration is not None:
+            data["duration"] = round(duration, 6)
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def get_logger(name=None):
+    """
+    获取日志对象(按名称缓存)，首次调用时完成日志配置
+    :param name: 日志名称（可选，默认使用调用者的模块名）
+    """
+    if name is None:
+        name = sys._getframe(1).f_globals.get("__name__", "unknown")
+    logger = _loggers.get(name)
+    if logger is None:
+        Logger.configure()
+        logger = _loggers.setdefault(name, logging.getLogger(name))
+    return logger
+
 
 class Logger:
     _configured = False
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(Logger, cls).__new__(cls)
-        return cls._instance
+    _configure_lock = threading.Lock()
 
     def __init__(self, name=None, log_dir=LOG_DIR, log_file="app.log", level=logging.INFO, max_bytes=10 * 1024 * 1024, backup_count=3):
         """
-        初始化日志配置
+        初始化日志配置(目录与处理器只在首次构造时创建，之后构造只记录名称)
         :param name: 日志名称（可选，默认使用调用者的模块名）
         :param log_dir: 日志目录
         :param log_file: 日志文件名
@@ -23,30 +114,28 @@ class Logger:
         :param max_bytes: 日志文件最大大小（字节）
         :param backup_count: 备份文件数量
         """
-        
         # 如果没有指定 name，则使用调用者的模块名
-        if name is None:
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            self.name = module.__name__ if module else "unknown"
-        else:
-            self.name = name
-
-        self.log_dir = log_dir
-        self.log_file = log_file
-        self.level = level
-        self.max_bytes = max_bytes
-        self.backup_count = backup_count
-
-        # 创建日志目录
-        os.makedirs(self.log_dir, exist_ok=True)
-
-        # 配置日志
+        self.name = name if name is not None else sys._getframe(1).f_globals.get("__name__", "unknown")
         if not Logger._configured:
-            self._configure_logger()
-            Logger._configured = True
+            Logger.configure(log_dir, log_file, level, max_bytes, backup_count)
+
+    @classmethod
+    def configure(cls, log_dir=LOG_DIR, log_file="app.log", level=logging.INFO, max_bytes=10 * 1024 * 1024, backup_count=3, log_format=LOG_FORMAT):
+        """
+        配置日志(进程内只执行一次)
+        :param log_format: 日志文件格式，text 或 json(控制台始终为文本格式)
+        """
+        if cls._configured:
+            return
+        with cls._configure_lock:
+            if cls._configured:
+                return
+            os.makedirs(log_dir, exist_ok=True)
+            cls._configure_logger(log_dir, log_file, level, max_bytes, backup_count, log_format)
+            cls._configured = True
 
-    def _configure_logger(self):
+    @staticmethod
+    def _configure_logger(log_dir, log_file, level, max_bytes, backup_count, log_format="text"):
         """配置日志"""
         # 日志配置字典
         logging_config = {
@@ -57,37 +146,73 @@ class Logger:
                     # 修改日志格式
                     "format": "[%(asctime)s] [%(levelname)s] [%(name)s] [%(filename)s:%(lineno)d] - %(message)s",
                 },
+                "json": {
+                    "()": JsonFormatter,
+                },
+            },
+            "filters": {
+                "context": {
+                    "()": ContextFilter,
+                },
             },
             "handlers": {
+                # 调用线程只把日志记录放入队列，文件与控制台输出由后台监听线程完成
+                "queue": {
+                    "class": "logging.handlers.QueueHandler",
+                    "handlers": ["file", "console"],
+                    "filters": ["context"],
+                    "respect_handler_level": True,
+                },
                 "file": {
                     "class": "logging.handlers.RotatingFileHandler",
-                    "filename": os.path.join(self.log_dir, self.log_file),
-                    "maxBytes": self.max_bytes,
-                    "backupCount": self.backup_count,
+                    "filename": os.path.join(log_dir, log_file),
+                    "maxBytes": max_bytes,
+                    "backupCount": backup_count,
                     "encoding": "utf-8",
-                    "formatter": "default",
+                    "formatter": "json" if log_format == "json" else "default",
                 },
                 "console": {
                     "class": "logging.StreamHandler",
                     "formatter": "default",
                 },
             },
-            "loggers": {
-                self.name: {
-                    "level": self.level,
-                    "handlers": ["file", "console"],
-                    "propagate": False,  # 禁止向上传播
-                },
-            },
-            "root": {  # 配置根日志记录器
-                "level": self.level,
-                "handlers": ["file", "console"],
+            "root": {  # 配置根日志记录器，各模块日志向上传播到根日志
+                "level": level,
+                "handlers": ["queue"],
             },
         }
 
         # 应用日志配置
         dictConfig(logging_config)
+        Logger._start_listener()
+        atexit.register(Logger._stop_listener)
+        # fork 出的子进程(如调度器进程池)中没有监听线程，需换用新队列重新启动
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=lambda: Logger._start_listener(new_queue=True))
+
+    @staticmethod
+    def _start_listener(new_queue: bool = False):
+        """启动日志队列监听线程"""
+        queue_handler = logging.getHandlerByName("queue")
+        if queue_handler is None:
+            return
+        if new_queue:
+            # 父进程队列中尚未输出的记录由父进程负责，子进程不重复输出
+            queue_handler.queue = queue.Queue()
+        listener = queue_handler.listener
+        queue_handler.listener = QueueListener(queue_handler.queue, *listener.handlers, respect_handler_level=True)
+        queue_handler.listener.start()
+
+    @staticmethod
+    def _stop_listener():
+        """停止监听线程，输出队列中剩余的日志"""
+        queue_handler = logging.getHandlerByName("queue")
+        if queue_handler is not None and queue_handler.listener is not None:
+            try:
+                queue_handler.listener.stop()
+            except AttributeError:
+                pass
 
     def get_logger(self):
         """获取日志对象"""
-        return logging.getLogger(self.name)
\ No newline at end of file
+        return get_logger(self.name)
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+运行指标模块
+
+进程内的计数器、计时器和仪表盘，输出为 Prometheus 文本格式：
+- write_textfile: 写入文本文件(供 node_exporter textfile collector 采集)
+- serve_http: 启动本地 HTTP 端点 /metrics
+
+用法:
+    from hztic.utils.metrics import metrics
+
+    metrics.inc("beisen_fetch_records", 100, endpoint="...")
+    with metrics.timer("hesi_request", endpoint="authStaff"):
+        ...
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from hztic.config import METRICS_FILE
+
+METRIC_PREFIX = "hztic_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in key
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """线程安全的指标注册表"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        # 计时器: name -> labels -> [次数, 总耗时, 最大耗时]
+        self._timers: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        """设置指标说明(输出为 # HELP)"""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """计数器累加"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """设置仪表盘的值"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """记录一次耗时(秒)"""
+        key = _label_key(labels)
+        with self._lock:
+            stat = self._timers.setdefault(name, {}).setdefault(key, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """计时上下文，退出时记录耗时(异常时同样记录)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """计时装饰器"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get(self, name: str, **labels) -> float:
+        """读取计数器或仪表盘的当前值，不存在时返回 0"""
+        key = _label_key(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key, 0)
+            return self._gauges.get(name, {}).get(key, 0)
+
+    def reset(self):
+        """清空全部指标"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+
+    def render(self) -> str:
+        """输出 Prometheus 文本格式"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{METRIC_PREFIX}{name}_total"
+                self._header(lines, metric, name, "counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._gauges.items()):
+                metric = f"{METRIC_PREFIX}{name}"
+                self._header(lines, metric, name, "gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._timers.items()):
+                metric = f"{METRIC_PREFIX}{name}_seconds"
+                self._header(lines, metric, name, "summary")
+                for key, (count, total, _) in sorted(series.items()):
+                    labels = _format_labels(key)
+                    lines.append(f"{metric}_count{labels} {count:g}")
+                    lines.append(f"{metric}_sum{labels} {total:.6f}")
+                self._header(lines, f"{metric}_max", name, "gauge")
+                for key, (_, _, maximum) in sorted(series.items()):
+                    lines.append(f"{metric}_max{_format_labels(key)} {maximum:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], metric: str, name: str, metric_type: str):
+        if name in self._help:
+            lines.append(f"# HELP {metric} {self._help[name]}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+
+    def write_textfile(self, file_path: str = METRICS_FILE):
+        """原子写入 Prometheus 文本文件"""
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, file_path)
+
+    def serve_http(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """在后台线程启动 /metrics HTTP 端点"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+metrics = MetricsRegistry()
+
+metrics.describe("beisen_fetch", "北森分页查询耗时(按接口)")
+metrics.describe("beisen_fetch_pages", "北森分页查询页数(按接口)")
+metrics.describe("beisen_fetch_records", "北森分页查询记录数(按接口)")
+metrics.describe("hesi_request", "合思接口调用耗时(按接口)")
+metrics.describe("rate_limiter_wait", "限流等待耗时(每次请求记录一次，未等待时为0)")
+metrics.describe("db_write_rows", "数据库写入行数(按表)")
+metrics.describe("db_write", "数据库写入耗时(按表)")
+metrics.describe("db_swap", "暂存数据合并到正式表的耗时")
+metrics.describe("snapshot_export", "同步数据快照导出耗时")
+metrics.describe("job_phase", "任务各阶段耗时")
+metrics.describe("job_runs", "任务执行次数(按结果)")
+metrics.describe("job_last_success_timestamp", "任务最近一次成功完成的时间戳")
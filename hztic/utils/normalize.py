@@ -0,0 +1,48 @@
+"""
+组织/网点名称归一化
+
+所有函数均带缓存，同一名称重复处理时只需一次字典查找:
+- 全角/半角转换、去除空白及末尾的“股份有限公司”等后缀
+- 组织路径拆分
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+COMPANY_SUFFIXES = ("股份有限公司", "有限责任公司", "有限公司")
+PATH_SEPARATOR = "/"
+NAME_CACHE_SIZE = 65536
+
+# 全角字符(！到～)与全角空格到半角的映射
+_FULL_TO_HALF = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULL_TO_HALF[0x3000] = 0x20
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def fold_width(text: str) -> str:
+    """全角字符转半角"""
+    return text.translate(_FULL_TO_HALF)
+
+
+def strip_company_suffix(name: str) -> str:
+    """去除末尾的公司类后缀(名称中间出现的不处理，如分支机构名称中的总公司全称)"""
+    for suffix in COMPANY_SUFFIXES:
+        if name.endswith(suffix):
+            return name.removesuffix(suffix)
+    return name
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(name: Optional[str]) -> str:
+    """名称归一化: 全角转半角、去除空白及公司后缀"""
+    if not name:
+        return ""
+    return strip_company_suffix("".join(fold_width(name).split()))
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def split_path(path_text: Optional[str], separator: str = PATH_SEPARATOR) -> Tuple[str, ...]:
+    """拆分组织路径文本，如 "总公司/部门A" -> ("总公司", "部门A")"""
+    if not path_text:
+        return ()
+    return tuple(path_text.split(separator))
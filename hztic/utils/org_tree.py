@@ -0,0 +1,225 @@
+"""
+组织架构树
+
+由 organizations 表一次性构建，维护父子邻接关系及 ID↔路径 映射，
+路径、祖先查询的复杂度为 O(深度)，子树查询为 O(子树大小)。
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from hztic.utils.normalize import split_path
+
+
+@dataclass(slots=True)
+class OrgNode:
+    org_id: str                                         # 组织ID
+    name: str                                           # 组织名称
+    parent_id: Optional[str] = None                     # 上级组织ID
+    children: List[str] = field(default_factory=list)   # 下级组织ID
+    id_path: Tuple[str, ...] = ()                       # 组织ID路径(含自身)
+    path: Tuple[str, ...] = ()                          # 组织名称路径(含自身)
+
+
+@dataclass
+class OrgTreeChanges:
+    """组织树增量变更结果"""
+    added: Set[str] = field(default_factory=set)                    # 新增的组织ID
+    renamed: Set[str] = field(default_factory=set)                  # 改名的组织ID
+    moved: Set[str] = field(default_factory=set)                    # 调整上级的组织ID
+    affected: Set[str] = field(default_factory=set)                 # 路径发生变化的组织ID(含下级)
+    old_paths: Set[Tuple[str, ...]] = field(default_factory=set)    # 变化前的名称路径
+    affected_paths: Set[Tuple[str, ...]] = field(default_factory=set)   # 变化后的名称路径
+
+    def __bool__(self) -> bool:
+        return bool(self.affected)
+
+    @property
+    def role_paths(self) -> Set[Tuple[str, ...]]:
+        """需要定向更新角色的路径：变化后的路径及已不存在的旧路径(旧路径推送空员工列表，清除合思中的过期配置)"""
+        return self.affected_paths | self.old_paths
+
+
+class OrgTree:
+    """组织架构树"""
+    def __init__(self, rows: Iterable[Tuple[str, str, Optional[str], Optional[str]]]):
+        """
+        :param rows: (org_id, org_name, tree_path, tree_path_text) 的可迭代对象
+        """
+        self.nodes: Dict[str, OrgNode] = {}
+        self.path_index: Dict[Tuple[str, ...], str] = {}
+        # 上级不在组织表中的节点(如公司根节点)的名称路径前缀
+        self._root_prefix: Dict[str, Tuple[str, ...]] = {}
+
+        for org_id, org_name, tree_path, tree_path_text in rows:
+            id_path = split_path(tree_path) or (org_id,)
+            name_path = split_path(tree_path_text) or (org_name,)
+            self.nodes[org_id] = OrgNode(
+                org_id=org_id,
+                name=org_name or name_path[-1],
+                parent_id=id_path[-2] if len(id_path) > 1 else None,
+                id_path=id_path,
+                path=name_path,
+            )
+            self._root_prefix[org_id] = name_path[:-1]
+            self.path_index[name_path] = org_id
+
+        for node in self.nodes.values():
+            if node.parent_id in self.nodes:
+                self.nodes[node.parent_id].children.append(node.org_id)
+
+        for node in self.nodes.values():
+            if node.parent_id not in self.nodes:
+                self._materialize(node.org_id)
+
+    @classmethod
+    def from_session(cls, session) -> "OrgTree":
+        """从数据库会话加载组织表构建组织树"""
+        from hztic.models.db_models import Organization
+        return cls(session.query(
+            Organization.org_id,
+            Organization.org_name,
+            Organization.tree_path,
+            Organization.tree_path_text
+        ))
+
+    def _materialize(self, root_id: str):
+        """自上而下重新计算子树内各节点的 ID 路径与名称路径"""
+        root = self.nodes[root_id]
+        if root.parent_id in self.nodes:
+            parent = self.nodes[root.parent_id]
+            base_ids, base_path = parent.id_path, parent.path
+        else:
+            base_ids = root.id_path[:-1]
+            base_path = self._root_prefix.get(root_id, ())
+
+        stack = [(root_id, base_ids, base_path)]
+        while stack:
+            org_id, parent_ids, parent_path = stack.pop()
+            node = self.nodes[org_id]
+            old_path = node.path
+            if self.path_index.get(old_path) == org_id:
+                del self.path_index[old_path]
+            node.id_path = parent_ids + (org_id,)
+            node.path = parent_path + (node.name,)
+            self.path_index[node.path] = org_id
+            stack.extend((child_id, node.id_path, node.path) for child_id in node.children)
+
+    def __contains__(self, org_id) -> bool:
+        return org_id in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get_path(self, org_id: str) -> Optional[Tuple[str, ...]]:
+        """组织名称路径"""
+        node = self.nodes.get(org_id)
+        return node.path if node else None
+
+    def get_id(self, path: Iterable[str]) -> Optional[str]:
+        """根据名称路径查找组织ID"""
+        return self.path_index.get(tuple(path))
+
+    def parent(self, org_id: str) -> Optional[str]:
+        """上级组织ID"""
+        node = self.nodes.get(org_id)
+        return node.parent_id if node else None
+
+    def children(self, org_id: str) -> List[str]:
+        """直接下级组织ID"""
+        node = self.nodes.get(org_id)
+        return list(node.children) if node else []
+
+    def ancestors(self, org_id: str) -> List[str]:
+        """全部上级组织ID(由近及远，仅包含组织表中存在的组织)"""
+        node = self.nodes.get(org_id)
+        if not node:
+            return []
+        return [ancestor for ancestor in reversed(node.id_path[:-1]) if ancestor in self.nodes]
+
+    def is_ancestor(self, ancestor_id: str, org_id: str) -> bool:
+        """ancestor_id 是否为 org_id 的上级组织"""
+        node = self.nodes.get(org_id)
+        return bool(node) and ancestor_id != org_id and ancestor_id in node.id_path
+
+    def subtree(self, org_id: str) -> Iterator[str]:
+        """子树内全部组织ID(含自身，先序遍历)"""
+        if org_id not in self.nodes:
+            return
+        stack = [org_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(self.nodes[current].children))
+
+    def apply_changes(self, orgs: Iterable) -> OrgTreeChanges:
+        """
+        根据增量组织数据更新组织树，只重新计算发生变化的子树路径
+
+        :param orgs: 组织数据(需包含 org_id、org_name、tree_path、tree_path_text 属性)
+        :return: OrgTreeChanges，包含新增/改名/移动的组织及受影响的路径
+        """
+        changes = OrgTreeChanges()
+        old_paths: Dict[str, Tuple[str, ...]] = {}
+        changed_roots: List[str] = []
+
+        for org in orgs:
+            id_path = split_path(org.tree_path) or (org.org_id,)
+            name_path = split_path(org.tree_path_text) or (org.org_name,)
+            parent_id = id_path[-2] if len(id_path) > 1 else None
+            name = org.org_name or name_path[-1]
+
+            node = self.nodes.get(org.org_id)
+            if node is None:
+                self.nodes[org.org_id] = OrgNode(org_id=org.org_id, name=name, parent_id=parent_id, id_path=id_path)
+                self._root_prefix[org.org_id] = name_path[:-1]
+                changes.added.add(org.org_id)
+                changed_roots.append(org.org_id)
+                continue
+
+            renamed = node.name != name
+            moved = node.parent_id != parent_id
+            if not (renamed or moved):
+                continue
+
+            for org_id in self.subtree(org.org_id):
+                old_paths.setdefault(org_id, self.nodes[org_id].path)
+            if renamed:
+                node.name = name
+                changes.renamed.add(org.org_id)
+            if moved:
+                old_parent = self.nodes.get(node.parent_id)
+                if old_parent and org.org_id in old_parent.children:
+                    old_parent.children.remove(org.org_id)
+                node.parent_id = parent_id
+                node.id_path = id_path
+                self._root_prefix[org.org_id] = name_path[:-1]
+                changes.moved.add(org.org_id)
+            changed_roots.append(org.org_id)
+
+        # 挂接新增或移动的组织，以及上级刚刚新增的已有组织
+        for org_id in changed_roots:
+            self._attach(org_id)
+        if changes.added:
+            for node in self.nodes.values():
+                if node.parent_id in changes.added:
+                    self._attach(node.org_id)
+
+        for org_id in changed_roots:
+            self._materialize(org_id)
+        for org_id in changed_roots:
+            changes.affected.update(self.subtree(org_id))
+
+        for org_id in changes.affected:
+            new_path = self.nodes[org_id].path
+            changes.affected_paths.add(new_path)
+            old_path = old_paths.get(org_id)
+            if old_path and old_path != new_path:
+                changes.old_paths.add(old_path)
+        return changes
+
+    def _attach(self, org_id: str):
+        """将组织挂到上级组织的下级列表中"""
+        node = self.nodes[org_id]
+        parent = self.nodes.get(node.parent_id)
+        if parent and org_id not in parent.children:
+            parent.children.append(org_id)
@@ -0,0 +1,36 @@
+import time
+from typing import Any, Callable, Tuple
+
+
+class PollTimeout(Exception):
+    """轮询超过总截止时间"""
+
+
+def poll_with_backoff(
+    check: Callable[[], Tuple[bool, Any]],
+    initial_delay: float = 5,
+    max_delay: float = 60,
+    factor: float = 2.0,
+    deadline: float = 600,
+) -> Any:
+    """
+    按指数退避轮询异步任务，直到完成或超过截止时间。
+
+    :param check: 检查函数，返回 (是否完成, 结果)。
+    :param initial_delay: 首次重试间隔(秒)。
+    :param max_delay: 最大重试间隔(秒)。
+    :param factor: 间隔增长倍数。
+    :param deadline: 总截止时间(秒)。
+    :return: 任务完成时 check 返回的结果。
+    """
+    start = time.monotonic()
+    delay = initial_delay
+    while True:
+        done, result = check()
+        if done:
+            return result
+        remaining = deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            raise PollTimeout(f"Polling did not finish within {deadline} seconds")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, max_delay)
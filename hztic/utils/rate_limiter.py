@@ -1,4 +1,5 @@
 import time
+from hztic.utils.metrics import metrics
 
 class BeisenRateLimiter:
     def __init__(self, requests_per_second=100, requests_per_minute=3000):
@@ -19,6 +20,7 @@ class BeisenRateLimiter:
         """根据速率限制等待适当的时间"""
         self._reset_rate_limit()
         self.request_counter += 1
+        wait_start = time.perf_counter()
 
         if self.request_counter > self.requests_per_second:
             sleep_time = max(0, 1 - (time.time() - self.start_time))
@@ -30,4 +32,7 @@ class BeisenRateLimiter:
             # 如果接近requests_per_minute次/分钟，则强制等待直到下一分钟开始
             time_until_next_minute = 60 - (time.time() - self.start_time) % 60 + 1
             time.sleep(time_until_next_minute)
-            self._reset_rate_limit()
\ No newline at end of file
+            self._reset_rate_limit()
+
+        # 每次调用都记录(含未等待的)，便于按次数计算被限流的比例
+        metrics.observe("rate_limiter_wait", time.perf_counter() - wait_start, limiter="beisen")
\ No newline at end of file
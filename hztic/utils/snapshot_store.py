@@ -0,0 +1,214 @@
+"""
+同步数据快照
+
+每次同步成功后将 employees、organizations、corporations 导出为列式快照，
+变动报表及临时分析直接读取快照，不访问正式数据库，也不重新查询北森。
+
+存储格式(基于 numpy，无额外依赖):
+    <SNAPSHOT_DIR>/<快照名>/manifest.json           快照信息(创建时间、运行ID、各表行数及字段)
+    <SNAPSHOT_DIR>/<快照名>/<表名>/<字段名>.npy      每个字段一个定长 UTF-8 字节数组(空值为空字节串)
+
+读取时通过 np.load(mmap_mode="r") 内存映射，只加载用到的字段。
+
+用法:
+    from hztic.utils.snapshot_store import SnapshotStore
+
+    snapshot = SnapshotStore().latest()
+    user_ids = snapshot.column("employees", "user_id")
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from hztic.config import SNAPSHOT_DIR, SNAPSHOT_KEEP_DAYS
+from hztic.utils.logger import Logger, get_run_id
+from hztic.utils.metrics import metrics
+
+logger = Logger().get_logger()
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+NAME_FORMAT = "%Y%m%dT%H%M%S"
+
+# 导出的表及字段(不导出身份证号、手机号、邮箱及银行账号等敏感字段)
+SNAPSHOT_COLUMNS = {
+    "employees": (
+        "user_id", "job_number", "employee_name", "oId_job_level_id", "oId_job_level_text",
+        "oId_department_id", "oId_department_text", "employee_status", "service_type", "employment_form",
+    ),
+    "organizations": (
+        "org_id", "org_name", "person_in_charge", "person_in_charge_text",
+        "extsuoshugongsizhuti", "extsuoshugongsizhuti_text", "tree_path", "tree_path_text",
+    ),
+    "corporations": (
+        "corp_id", "corp_name", "extzuzhidaima", "extdengjidizhi",
+    ),
+}
+
+
+def to_column(values: Sequence) -> np.ndarray:
+    """值序列转为定长 UTF-8 字节数组(空值为空字节串)"""
+    return np.array([b"" if value is None else str(value).encode("utf-8") for value in values], dtype=np.bytes_)
+
+
+def decode(column: np.ndarray) -> np.ndarray:
+    """字节数组解码为字符串数组"""
+    return np.char.decode(column, "utf-8")
+
+
+class Snapshot:
+    """已导出的快照，字段在首次访问时内存映射加载"""
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._columns: Dict[tuple, np.ndarray] = {}
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromisoformat(self.manifest["created_at"])
+
+    def rows(self, table: str) -> int:
+        return self.manifest["tables"][table]["rows"]
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        """读取字段(只读数组)"""
+        key = (table, name)
+        if key not in self._columns:
+            if name not in self.manifest["tables"][table]["columns"]:
+                raise KeyError(f"快照 {self.name} 的表 {table} 中没有字段 {name}")
+            file_path = os.path.join(self.path, table, f"{name}.npy")
+            # 空数组无法内存映射
+            self._columns[key] = np.load(file_path, mmap_mode="r" if self.rows(table) else None)
+        return self._columns[key]
+
+    def table(self, table: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """读取表的多个字段，默认全部字段"""
+        return {name: self.column(table, name) for name in columns or self.manifest["tables"][table]["columns"]}
+
+    def __repr__(self):
+        return f"Snapshot({self.name!r})"
+
+
+class SnapshotStore:
+    """快照目录"""
+    def __init__(self, base_dir: str = SNAPSHOT_DIR):
+        self.base_dir = base_dir
+
+    def write(self, tables: Dict[str, Dict[str, Sequence]], run_id: Optional[str] = None) -> Snapshot:
+        """
+        写入快照(先写入临时目录，完成后整体重命名，读取方不会看到写了一半的快照)
+        :param tables: {表名: {字段名: 值序列}}
+        :param run_id: 同步运行ID
+        """
+        created_at = datetime.now()
+        name = created_at.strftime(NAME_FORMAT)
+        suffix = 1
+        while os.path.exists(os.path.join(self.base_dir, name)):
+            name = f"{created_at.strftime(NAME_FORMAT)}-{suffix}"
+            suffix += 1
+        final_path = os.path.join(self.base_dir, name)
+        temp_path = final_path + ".tmp"
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "created_at": created_at.isoformat(timespec="seconds"),
+            "run_id": run_id,
+            "tables": {},
+        }
+        try:
+            for table, columns in tables.items():
+                os.makedirs(os.path.join(temp_path, table))
+                rows = 0
+                for column_name, values in columns.items():
+                    array = to_column(values)
+                    np.save(os.path.join(temp_path, table, f"{column_name}.npy"), array)
+                    rows = len(array)
+                manifest["tables"][table] = {"rows": rows, "columns": list(columns)}
+            with open(os.path.join(temp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, final_path)
+        except Exception:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+        return Snapshot(final_path)
+
+    def list(self) -> List[str]:
+        """全部快照名称(按时间升序)"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if not name.endswith(".tmp") and os.path.isfile(os.path.join(self.base_dir, name, MANIFEST_FILE))
+        )
+
+    def load(self, name: str) -> Snapshot:
+        path = os.path.join(self.base_dir, name)
+        if not os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+            raise FileNotFoundError(f"快照 {name} 不存在")
+        return Snapshot(path)
+
+    def latest(self, before: Optional[datetime] = None) -> Optional[Snapshot]:
+        """
+        最近的快照
+        :param before: 只查找不晚于该时间创建的快照
+        """
+        for name in reversed(self.list()):
+            snapshot = self.load(name)
+            if before is None or snapshot.created_at <= before:
+                return snapshot
+        return None
+
+    def prune(self, keep_days: int = SNAPSHOT_KEEP_DAYS) -> List[str]:
+        """
+        清理旧快照：最近一天内的全部保留，更早的每天只保留最后一份，超过保留天数的删除
+        :return: 删除的快照名称
+        """
+        now = datetime.now()
+        removed = []
+        kept_dates = set()
+        for name in reversed(self.list()):
+            created_at = self.load(name).created_at
+            if now - created_at <= timedelta(days=1):
+                continue
+            if now - created_at <= timedelta(days=keep_days) and created_at.date() not in kept_dates:
+                kept_dates.add(created_at.date())
+                continue
+            shutil.rmtree(os.path.join(self.base_dir, name), ignore_errors=True)
+            removed.append(name)
+        return removed
+
+
+def export_snapshot(db_manager=None, store: Optional[SnapshotStore] = None) -> Snapshot:
+    """
+    从数据库导出快照(各表在同一只读快照中读取)，并清理旧快照
+    :param db_manager: 可选的 DatabaseManager，默认新建
+    :param store: 可选的快照目录，默认 SNAPSHOT_DIR
+    """
+    from hztic.utils.database_manager import DatabaseManager
+
+    db_manager = db_manager or DatabaseManager()
+    store = store or SnapshotStore()
+    start = time.perf_counter()
+    with metrics.timer("snapshot_export"):
+        with db_manager.snapshot() as session:
+            tables = {
+                table: db_manager.get_table_columns(table, columns, session)
+                for table, columns in SNAPSHOT_COLUMNS.items()
+            }
+        snapshot = store.write(tables, run_id=get_run_id())
+    removed = store.prune()
+    logger.info(
+        "数据快照 %s 导出完成(%s), 清理旧快照 %d 份",
+        snapshot.name,
+        ", ".join(f"{table} {info['rows']} 行" for table, info in snapshot.manifest["tables"].items()),
+        len(removed),
+        extra={"duration": time.perf_counter() - start}
+    )
+    return snapshot
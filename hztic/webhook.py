@@ -0,0 +1,127 @@
+"""
+HR事件回调服务模块
+
+接收北森审批流程(入职、调岗、任命部门负责人等)的回调，事件先持久化到本地队列(hr_events 表)，
+再由后台线程逐条处理：拉取相关员工、写入数据库，受影响的角色路径进入防抖合并队列，
+同一角色在防抖窗口内的多次变动只推送一次合思。
+
+事件在角色推送完成后才标记为 done；推送失败时事件重新置为 pending 重试。
+进程退出时队列中未推送的事件仍为 processing，下次启动时恢复为 pending 重新处理。
+
+启动方式:
+    poetry run python -m hztic.main --webhook
+"""
+
+import threading
+from typing import Optional
+from flask import Flask, Response, jsonify, request
+from hztic.config import BeisenAPIConfig, HesiAPIConfig, WEBHOOK_HOST, WEBHOOK_PORT
+from hztic.handler.event_service import get_role_update_queue, process_hr_event
+from hztic.utils.database_manager import DatabaseManager
+from hztic.utils.logger import Logger, set_run_id
+from hztic.utils.metrics import metrics as registry
+
+logger = Logger().get_logger()
+
+
+class HrEventWorker(threading.Thread):
+    """HR事件后台处理线程"""
+    def __init__(self, poll_interval: float = 5, batch_size: int = 20, max_attempts: int = 5):
+        super().__init__(name="hr-event-worker", daemon=True)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.db_manager = DatabaseManager()
+        self.queue = get_role_update_queue(HesiAPIConfig, on_done=self._role_update_done)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def notify(self):
+        """有新事件入队时唤醒处理线程"""
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _role_update_done(self, event_id: int, error: Optional[Exception]):
+        """事件关联的角色更新推送完成(在队列线程中调用)"""
+        if error is None:
+            self.db_manager.finish_hr_event(event_id)
+        else:
+            logger.error("HR事件 %s 角色更新失败: %s", event_id, error)
+            self.db_manager.finish_hr_event(event_id, error=error, max_attempts=self.max_attempts)
+        self.notify()
+
+    def run(self):
+        recovered = self.db_manager.reset_processing_hr_events()
+        if recovered:
+            logger.info("恢复 %d 条未处理完成的HR事件", recovered)
+
+        while not self._stopped.is_set():
+            events = self.db_manager.claim_hr_events(self.batch_size)
+            if not events:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            for event_id, payload in events:
+                set_run_id(f"hr-event-{event_id}")
+                try:
+                    # 有角色更新加入队列时，事件由推送完成回调结束
+                    if not process_hr_event(BeisenAPIConfig, HesiAPIConfig, payload, event_id=event_id):
+                        self.db_manager.finish_hr_event(event_id)
+                except Exception as e:
+                    logger.error("HR事件 %s 处理出错: %s", event_id, e)
+                    self.db_manager.finish_hr_event(event_id, error=e, max_attempts=self.max_attempts)
+
+
+def create_app(worker: HrEventWorker) -> Flask:
+    """创建回调服务应用"""
+    app = Flask(__name__)
+    db_manager = DatabaseManager()
+
+    @app.route("/api/hr/emp/notify", methods=["POST"])
+    def notify():
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"error": "Invalid input. JSON data required."}), 400
+
+        process_variable_dic = data.get("processVariableDic", {})
+        if not isinstance(process_variable_dic, dict):
+            return jsonify({"error": "processVariableDic must be a dictionary."}), 400
+
+        event_id = db_manager.enqueue_hr_event(data)
+        worker.notify()
+        logger.info("HR事件 %s 已入队", event_id)
+        return jsonify({"status": "queued", "eventId": event_id}), 202
+
+    @app.route("/api/hr/metrics", methods=["GET"])
+    def metrics():
+        return jsonify({
+            "events": db_manager.count_hr_events_by_status(),
+            "roleUpdateQueue": get_role_update_queue(HesiAPIConfig).metrics(),
+        })
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        for status, count in db_manager.count_hr_events_by_status().items():
+            registry.set("hr_events", count, status=status)
+        for name, value in get_role_update_queue(HesiAPIConfig).metrics().items():
+            registry.set(f"role_update_queue_{name}", value)
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    return app
+
+
+def serve(host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT):
+    """启动回调服务及后台处理线程"""
+    worker = HrEventWorker()
+    worker.start()
+    app = create_app(worker)
+    logger.info("HR事件回调服务启动: %s:%s", host, port)
+    try:
+        app.run(host=host, port=port, threaded=True)
+    finally:
+        worker.stop()
+        get_role_update_queue(HesiAPIConfig).stop(flush=True)
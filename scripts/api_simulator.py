@@ -0,0 +1,418 @@
+"""
+北森/合思开放平台本地模拟服务
+
+按序号确定性生成组织、员工等数据，模拟以下接口，供基准测试和离线调试使用：
+- 北森: /token、各实体的 GetByTimeWindow 滚动分页查询
+- 合思: 员工列表(staffs)、点位授权(authStaff)、角色配置更新/删除(roledefs)、业务对象实例列表/详情(datalink)、鉴权
+
+可配置响应延迟、分页大小、限流(超过每秒请求数时排队等待)及随机失败率。
+
+单独启动:
+    poetry run python scripts/api_simulator.py --employees 10000 --port 8900 --latency 0.02
+北森 base_url 为 http://127.0.0.1:8900/beisen，合思 base_url 为 http://127.0.0.1:8900/hesi
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FAR_FUTURE_MS = 4102444800000   # 2100-01-01，模拟 token 永不过期
+
+JOB_LEVELS = [("jl-1", "专员级"), ("jl-2", "主管级"), ("jl-3", "经理级"), ("jl-4", "总经理级")]
+EMPLOYMENT_FORMS = [("ef-1", "劳动合同"), ("ef-2", "劳务合同"), ("ef-3", "实习协议")]
+BANKS = ["招商银行", "中国工商银行", "中国建设银行", "中国农业银行", "中国银行"]
+SURNAMES = "赵钱孙李周吴郑王冯陈褚卫蒋沈韩杨朱秦尤许何吕施张"
+
+
+@dataclass
+class SimulatorConfig:
+    employees: int = 1000           # 员工数量
+    organizations: int = 0          # 组织数量，0 表示按员工数/20 计算
+    corporations: int = 5           # 公司主体数量
+    datalink_instances: int = 0     # 业务对象实例数量
+    fanout: int = 8                 # 组织树每个节点的下级数量
+    latency: float = 0.0            # 每次请求的固定延迟(秒)
+    page_size: int = 300            # 分页大小上限(与请求的 capacity 取较小值)
+    throttle_rps: float = 0.0       # 每秒最多处理的请求数，0 表示不限流
+    failure_rate: float = 0.0       # 随机返回 500 的比例
+    seed: int = 0
+
+
+class SimulatedData:
+    """按序号确定性生成的模拟数据，员工数据按需生成，不在内存中整体保存"""
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.employee_count = config.employees
+        self.org_count = config.organizations or max(10, config.employees // 20)
+        self.org_id_paths: List[Tuple[str, ...]] = []
+        self.org_name_paths: List[Tuple[str, ...]] = []
+        for index in range(self.org_count):
+            parent = (index - 1) // config.fanout if index else None
+            org_id, name = f"org-{index}", f"部门{index}" if index else "模拟集团"
+            if parent is None:
+                self.org_id_paths.append((org_id,))
+                self.org_name_paths.append((name,))
+            else:
+                self.org_id_paths.append(self.org_id_paths[parent] + (org_id,))
+                self.org_name_paths.append(self.org_name_paths[parent] + (name,))
+
+    def user_id(self, index: int) -> int:
+        return 100000 + index
+
+    def job_number(self, index: int) -> str:
+        return f"E{index:06d}"
+
+    def organization(self, index: int) -> Dict:
+        leader = (index * 7) % self.employee_count if self.employee_count else None
+        corporation = f"corp-{index % self.config.corporations}"
+        return {
+            "oId": f"org-{index}",
+            "name": self.org_name_paths[index][-1],
+            "personInCharge": self.user_id(leader) if leader is not None else None,
+            "pOIdOrgAdminNameTreePath": "/".join(self.org_id_paths[index]),
+            "customProperties": {"extsuoshugongsizhuti_609792_1697874494": corporation},
+            "translateProperties": {
+                "PersonInChargeText": self.name(leader) if leader is not None else None,
+                "POIdOrgAdminNameTreePathText": "/".join(self.org_name_paths[index]),
+                "extsuoshugongsizhuti_609792_1697874494Text": f"模拟公司{corporation}",
+            },
+        }
+
+    def name(self, index: int) -> str:
+        return SURNAMES[index % len(SURNAMES)] + f"员工{index}"
+
+    def job_level(self, index: int) -> Tuple[str, str]:
+        bucket = index % 50
+        if bucket == 0:
+            return JOB_LEVELS[3]
+        if bucket < 5:
+            return JOB_LEVELS[2]
+        if bucket < 15:
+            return JOB_LEVELS[1]
+        return JOB_LEVELS[0]
+
+    def employee(self, index: int) -> Dict:
+        rng = random.Random(self.config.seed * 1000003 + index)
+        department = rng.randrange(self.org_count)
+        level_id, level_name = self.job_level(index)
+        account = "".join(str(rng.randrange(10)) for _ in range(16))
+        return {
+            "employeeInfo": {
+                "userID": self.user_id(index),
+                "name": self.name(index),
+                "email": f"e{index}@example.com",
+                "iDNumber": f"32010119900101{index % 10000:04d}",
+                "mobilePhone": f"138{index:08d}",
+                "customProperties": {
+                    "extyinhangg_609792_2118474221": f"bank-{index % len(BANKS)}",
+                    "extkaihuhangzhihang_609792_463003869": f"branch-{index % 97}",
+                    "extyinhangzhanghao_609792_395264758": account,
+                },
+                "translateProperties": {
+                    "extyinhangg_609792_2118474221Text": BANKS[index % len(BANKS)],
+                    "extkaihuhangzhihang_609792_463003869Text": f"{BANKS[index % len(BANKS)]}南京第{index % 97}支行",
+                },
+            },
+            "recordInfo": {
+                "jobNumber": self.job_number(index),
+                "oIdDepartment": f"org-{department}",
+                "oIdJobLevel": level_id,
+                "employeeStatus": "3" if index % 10 else "2",
+                "employmentForm": EMPLOYMENT_FORMS[index % len(EMPLOYMENT_FORMS)][0],
+                "serviceType": 0,
+                "translateProperties": {
+                    "OIdJobLevelText": level_name,
+                    "OIdDepartmentText": self.org_name_paths[department][-1],
+                },
+            },
+        }
+
+    def corporation(self, index: int) -> Dict:
+        return {"fields": {
+            "OId": f"corp-{index}",
+            "Name": f"模拟公司corp-{index}",
+            "extzuzhidaima_609792_945002890": f"91320100MA{index:08d}",
+            "extkaihuyinhang_609792_103657435": BANKS[index % len(BANKS)],
+            "extyinhangzhanghao_609792_990841835": f"6225{index:012d}",
+            "extdianhua_609792_1936418435": f"025-{index:08d}",
+            "extdengjidizhi_609792_1284935992": f"南京市模拟路{index}号",
+        }}
+
+    def hesi_staff(self, index: int) -> Dict:
+        return {
+            "id": f"sim:{self.job_number(index)}",
+            "code": self.job_number(index),
+            "name": self.name(index),
+            "active": True,
+            "updateTime": 1700000000000 + index,
+        }
+
+    def datalink_instance(self, entity_id: str, index: int) -> Dict:
+        return {
+            "id": f"{entity_id}:{index}",
+            "code": f"DL{index:06d}",
+            "name": f"模拟实例{index}",
+            "active": True,
+        }
+
+    def datalink_index(self, entity_id: str, key: str, value: str) -> Optional[int]:
+        """按实例ID或编码解析实例序号，不存在时返回 None"""
+        if key == "ids" and value.startswith(f"{entity_id}:"):
+            value = value[len(entity_id) + 1:]
+        elif key == "codes" and value.startswith("DL"):
+            value = value[2:]
+        else:
+            return None
+        if value.isdigit() and int(value) < self.config.datalink_instances:
+            return int(value)
+        return None
+
+    def employee_indexes(self, field_name: str, values: List) -> Optional[List[int]]:
+        """按 UserID、JobNumber 过滤员工序号，不支持的字段返回 None(不过滤)"""
+        if field_name == "UserID":
+            indexes = {int(value) - self.user_id(0) for value in values if str(value).isdigit()}
+        elif field_name == "JobNumber":
+            indexes = {int(value[1:]) for value in map(str, values) if value[:1] == "E" and value[1:].isdigit()}
+        else:
+            return None
+        return sorted(index for index in indexes if 0 <= index < self.employee_count)
+
+    def beisen_page(self, entity: str, offset: int, limit: int) -> List[Dict]:
+        """北森实体的一页数据"""
+        if entity == "Employee":
+            total, build = self.employee_count, self.employee
+        elif entity == "Organization":
+            total, build = self.org_count, self.organization
+        elif entity == "CommonMetaObject":
+            total, build = self.config.corporations, self.corporation
+        elif entity == "JobLevel":
+            return [{"objectId": oid, "name": name} for oid, name in JOB_LEVELS][offset:offset + limit]
+        elif entity == "EmploymentForm":
+            return [{"objectId": oid, "name": name} for oid, name in EMPLOYMENT_FORMS][offset:offset + limit]
+        else:
+            return []
+        return [build(index) for index in range(offset, min(offset + limit, total))]
+
+
+class ApiSimulator:
+    """模拟服务，在后台线程中运行"""
+    BEISEN_SCROLL = re.compile(r"^/beisen/TenantBaseExternal/api/v5/(\w+)/GetByTimeWindow$")
+    HESI_ROLE_STAFFS = re.compile(r"^/hesi/api/openapi/v1\.1/roledefs/(.+)/staffs$")
+    HESI_DATALINK_SEARCH = re.compile(r"^/hesi/api/openapi/v2/extension/DATA_LINK/object/([^/]+)/search$")
+
+    def __init__(self, config: Optional[SimulatorConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or SimulatorConfig()
+        self.data = SimulatedData(self.config)
+        self.requests = Counter()                   # 各接口请求次数
+        self.role_contents: Dict[str, List] = {}    # 各角色最近一次推送的配置
+        self.authorized: set = set()                # 已激活授权的工号
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def beisen_base_url(self) -> str:
+        return f"{self.url}/beisen"
+
+    @property
+    def hesi_base_url(self) -> str:
+        return f"{self.url}/hesi"
+
+    def start(self) -> "ApiSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="api-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _throttle(self):
+        """限流: 按 throttle_rps 为请求分配处理时间片，超出时排队等待"""
+        if self.config.throttle_rps <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.config.throttle_rps
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _should_fail(self) -> bool:
+        if self.config.failure_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.config.failure_rate
+
+    def dispatch(self, method: str, path: str, query: Dict, body: Optional[Dict]) -> Tuple[int, Optional[Dict]]:
+        """根据请求方法和路径返回 (状态码, 响应数据)"""
+        match = self.BEISEN_SCROLL.match(path)
+        if method == "POST" and match:
+            return 200, self._beisen_scroll(match.group(1), body or {})
+        if method == "POST" and path == "/beisen/token":
+            return 200, {"access_token": "simulated-beisen-token", "expireTime": FAR_FUTURE_MS}
+        if method == "POST" and path in ("/hesi/api/openapi/v1/auth/getAccessToken", "/hesi/api/openapi/v2/auth/refreshToken"):
+            return 200, {"value": {"accessToken": "simulated-hesi-token", "refreshToken": "simulated", "expireTime": FAR_FUTURE_MS}}
+        if method == "GET" and path == "/hesi/api/openapi/v1.1/staffs":
+            start = int(query.get("start", 0))
+            count = min(int(query.get("count", 10)), self.config.page_size)
+            if query.get("active", "true") != "true":
+                return 200, {"count": 0, "items": []}
+            items = [self.data.hesi_staff(index) for index in range(start, min(start + count, self.data.employee_count))]
+            return 200, {"count": self.data.employee_count, "items": items}
+        if method == "POST" and path == "/hesi/api/openapi/v1/charge/powers/authStaff":
+            with self._lock:
+                self.authorized.update((body or {}).get("addStaff") or [])
+                self.authorized.difference_update((body or {}).get("delStaff") or [])
+            return 200, {"value": True}
+        if method == "GET" and path == "/hesi/api/openapi/v2.1/datalink":
+            entity_id = query.get("entityId", "")
+            start = int(query.get("start", 0))
+            end = min(start + int(query.get("count", 100)), self.config.datalink_instances)
+            return 200, {"items": [self.data.datalink_instance(entity_id, index) for index in range(start, end)]}
+        match = self.HESI_DATALINK_SEARCH.match(path)
+        if method == "POST" and match:
+            entity_id = match.group(1)
+            items = []
+            for key in ("ids", "codes"):
+                for value in (body or {}).get(key) or []:
+                    index = self.data.datalink_index(entity_id, key, str(value))
+                    if index is not None:
+                        items.append(self.data.datalink_instance(entity_id, index))
+            return 200, {"items": items}
+        match = self.HESI_ROLE_STAFFS.match(path)
+        if match and method == "PUT":
+            contents = (body or {}).get("contents")
+            if not contents:
+                return 400, {"message": "contents参数不能为空"}
+            with self._lock:
+                self.role_contents[match.group(1).lstrip("$")] = contents
+            return 204, None
+        if match and method == "DELETE":
+            with self._lock:
+                self.role_contents.pop(match.group(1).lstrip("$"), None)
+            return 204, None
+        return 404, {"message": f"unknown endpoint {method} {path}"}
+
+    def _beisen_scroll(self, entity: str, payload: Dict) -> Dict:
+        offset = int(payload.get("scrollId") or 0)
+        limit = min(int(payload.get("capacity") or self.config.page_size), self.config.page_size)
+        indexes = None
+        if entity == "Employee":
+            for query in payload.get("extQueries") or []:
+                matched = self.data.employee_indexes(query.get("fieldName"), query.get("values") or [])
+                if matched is not None:
+                    indexes = matched if indexes is None else sorted(set(indexes) & set(matched))
+        if indexes is None:
+            data = self.data.beisen_page(entity, offset, limit)
+        else:
+            data = [self.data.employee(index) for index in indexes[offset:offset + limit]]
+        return {"code": "200", "message": "", "scrollId": str(offset + len(data)), "isLastData": not data, "data": data}
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method: str):
+                parsed = urlparse(self.path)
+                path = re.sub(r"%24", "$", parsed.path)
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null") if length else None
+
+                endpoint = re.sub(r"/roledefs/[^/]+/", "/roledefs/{id}/", path)
+                with simulator._lock:
+                    simulator.requests[f"{method} {endpoint}"] += 1
+
+                simulator._throttle()
+                if simulator.config.latency:
+                    time.sleep(simulator.config.latency)
+                if simulator._should_fail():
+                    status, response = 500, {"message": "simulated failure"}
+                else:
+                    status, response = simulator.dispatch(method, path, query, body)
+
+                payload = json.dumps(response, ensure_ascii=False).encode("utf-8") if response is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PUT(self):
+                self._handle("PUT")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="北森/合思开放平台本地模拟服务")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--organizations", type=int, default=0)
+    parser.add_argument("--datalink-instances", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="每次请求的延迟(秒)")
+    parser.add_argument("--page-size", type=int, default=300)
+    parser.add_argument("--throttle-rps", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        employees=args.employees,
+        organizations=args.organizations,
+        datalink_instances=args.datalink_instances,
+        latency=args.latency,
+        page_size=args.page_size,
+        throttle_rps=args.throttle_rps,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    simulator = ApiSimulator(config, port=args.port).start()
+    print(f"北森 base_url: {simulator.beisen_base_url}")
+    print(f"合思 base_url: {simulator.hesi_base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
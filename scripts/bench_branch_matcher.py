@@ -0,0 +1,87 @@
+"""
+银行网点名称匹配基准测试
+
+对比 BranchMatcher(分块 + n-gram 倒排索引) 与原型的全量两两比对方式
+(scripts/test1.py 中 PolyFuzz EditDistance 的思路，此处用 difflib 代替)。
+
+poetry run python scripts/bench_branch_matcher.py --branches 50000 --queries 2000
+"""
+
+import argparse
+import difflib
+import random
+import time
+
+from hztic.utils.branch_matcher import BranchMatcher
+from hztic.utils.normalize import normalize_name
+
+BANKS = ["招商银行", "中国工商银行", "中国建设银行", "中国农业银行", "中国银行", "交通银行",
+         "中国邮政储蓄银行", "广发银行", "浙商银行", "杭州银行", "南京银行", "江苏银行"]
+CITIES = ["南京", "苏州", "无锡", "杭州", "宁波", "上海", "北京", "广州", "深圳", "成都"]
+DISTRICTS = ["江宁", "鼓楼", "玄武", "秦淮", "建邺", "栖霞", "浦口", "六合", "溧水", "高淳",
+             "科学园", "万达", "开发区", "高新区", "新街口", "河西", "城南", "城北", "东山", "仙林"]
+
+
+def build_branches(count, seed=0):
+    rng = random.Random(seed)
+    branches = []
+    for i in range(count):
+        bank = rng.choice(BANKS)
+        city = rng.choice(CITIES)
+        district = rng.choice(DISTRICTS) + rng.choice(["", "第一", "第二", "中心", "南", "北"])
+        name = f"{bank}股份有限公司{city}{district}支行"
+        branches.append({"code": f"{i:012d}", "name": name, "bank_name": f"{bank}股份有限公司"})
+    return branches
+
+
+def build_queries(branches, count, seed=1):
+    rng = random.Random(seed)
+    queries = []
+    for branch in rng.sample(branches, count):
+        name = branch["name"].replace("股份有限公司", "")
+        # 模拟员工手工填写: 增加“市”字
+        for city in CITIES:
+            if rng.random() < 0.5:
+                name = name.replace(city, city + "市", 1)
+        queries.append((name, branch["name"]))
+    return queries
+
+
+def all_pairs_match(query, names):
+    normalized = normalize_name(query)
+    best = max(names, key=lambda name: difflib.SequenceMatcher(None, normalized, normalize_name(name)).ratio())
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="银行网点名称匹配基准测试")
+    parser.add_argument("--branches", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--baseline-queries", type=int, default=20, help="全量比对方式的查询数量(很慢)")
+    args = parser.parse_args()
+
+    branches = build_branches(args.branches)
+    queries = build_queries(branches, args.queries)
+
+    start = time.perf_counter()
+    matcher = BranchMatcher(branches)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = matcher.match_batch([query for query, _ in queries], top_k=5)
+    match_time = time.perf_counter() - start
+    hits = sum(1 for (_, expected), result in zip(queries, results) if result and result[0][1] == expected)
+
+    names = [branch["name"] for branch in branches]
+    baseline = queries[:args.baseline_queries]
+    start = time.perf_counter()
+    baseline_hits = sum(1 for query, expected in baseline if all_pairs_match(query, names) == expected)
+    baseline_time = time.perf_counter() - start
+
+    print(f"branches: {len(branches)}, index build: {build_time:.2f}s")
+    print(f"BranchMatcher: {len(queries) / match_time:,.0f} names/s, top-1 accuracy {hits / len(queries):.1%}")
+    print(f"all-pairs:     {len(baseline) / baseline_time:,.1f} names/s, top-1 accuracy {baseline_hits / len(baseline):.1%}")
+
+
+if __name__ == "__main__":
+    main()
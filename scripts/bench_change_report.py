@@ -0,0 +1,135 @@
+"""
+变动报表基准测试
+
+在临时目录中生成两份模拟快照(较新快照按比例加入入职、离职、调岗、职级及负责人变动)，
+统计 compare_snapshots 的耗时(多次取中位数)，并校验各类变动数量与生成的一致。
+
+poetry run python scripts/bench_change_report.py --sizes 100000 300000 --change-rate 0.01
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hztic.handler.report_service import compare_snapshots
+from hztic.utils.snapshot_store import SNAPSHOT_COLUMNS, SnapshotStore
+
+
+def build_tables(employees, rng):
+    """生成一份快照数据(每 20 名员工一个部门)"""
+    org_count = max(1, employees // 20)
+    org_ids = np.array([f"O{i:07d}" for i in range(org_count)])
+    user_ids = np.array([f"U{i:08d}" for i in range(employees)])
+    departments = rng.integers(0, org_count, employees)
+    levels = rng.integers(0, 10, employees)
+    leaders = rng.integers(0, employees, org_count)
+    employee_columns = {
+        "user_id": user_ids,
+        "job_number": np.char.add("E", np.char.zfill(np.arange(employees).astype(str), 7)),
+        "employee_name": np.char.add("员工", np.arange(employees).astype(str)),
+        "oId_job_level_id": np.char.add("L", levels.astype(str)),
+        "oId_job_level_text": np.char.add("职级", levels.astype(str)),
+        "oId_department_id": org_ids[departments],
+        "oId_department_text": np.char.add("部门", departments.astype(str)),
+    }
+    organization_columns = {
+        "org_id": org_ids,
+        "org_name": np.char.add("部门", np.arange(org_count).astype(str)),
+        "person_in_charge": user_ids[leaders],
+        "person_in_charge_text": np.char.add("员工", leaders.astype(str)),
+        "tree_path_text": np.char.add("模拟集团/部门", np.arange(org_count).astype(str)),
+    }
+    return employee_columns, organization_columns
+
+
+def apply_changes(employee_columns, organization_columns, rate, rng):
+    """按比例生成变动，返回 (新快照数据, 预期变动数量)"""
+    employees = len(employee_columns["user_id"])
+    changes = max(1, int(employees * rate))
+    # 转为 object 数组，避免定长字符串数组截断修改后的值
+    new_employees = {name: values.astype(object) for name, values in employee_columns.items()}
+    new_organizations = {name: values.astype(object) for name, values in organization_columns.items()}
+
+    picked = rng.choice(employees, changes * 3, replace=False)
+    transfers, level_changes, exits = picked[:changes], picked[changes:changes * 2], picked[changes * 2:]
+    new_employees["oId_department_id"][transfers] = new_employees["oId_department_id"][transfers] + "X"
+    new_employees["oId_job_level_id"][level_changes] = new_employees["oId_job_level_id"][level_changes] + "+"
+
+    keep = np.ones(employees, dtype=bool)
+    keep[exits] = False
+    new_employees = {name: values[keep] for name, values in new_employees.items()}
+    hires = {name: values[:changes] for name, values in new_employees.items()}
+    hires["user_id"] = np.array([f"N{i:08d}" for i in range(changes)])
+    new_employees = {name: np.concatenate([values, hires[name]]) for name, values in new_employees.items()}
+
+    org_count = len(organization_columns["org_id"])
+    leader_changes = rng.choice(org_count, max(1, int(org_count * rate)), replace=False)
+    new_organizations["person_in_charge"][leader_changes] = "NEWLEADER"
+
+    expected = {
+        "hires": changes, "exits": changes, "transfers": changes,
+        "level_changes": changes, "leader_changes": len(leader_changes),
+    }
+    return (new_employees, new_organizations), expected
+
+
+def write_snapshot(store, employee_columns, organization_columns):
+    employees = len(employee_columns["user_id"])
+    tables = {
+        "employees": {
+            name: employee_columns.get(name, [None] * employees) for name in SNAPSHOT_COLUMNS["employees"]
+        },
+        "organizations": {
+            name: organization_columns.get(name, [None] * len(organization_columns["org_id"]))
+            for name in SNAPSHOT_COLUMNS["organizations"]
+        },
+        "corporations": {name: [] for name in SNAPSHOT_COLUMNS["corporations"]},
+    }
+    return store.write(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="变动报表基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 300000], help="员工数量")
+    parser.add_argument("--change-rate", type=float, default=0.01, help="各类变动占员工数的比例")
+    parser.add_argument("--repeat", type=int, default=5, help="对比次数(取中位数)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'员工数':>10}{'快照MB':>10}{'对比耗时(s)':>14}  变动数量")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="hztic-report-bench-") as workdir:
+            store = SnapshotStore(workdir)
+            employee_columns, organization_columns = build_tables(size, rng)
+            old = write_snapshot(store, employee_columns, organization_columns)
+            (new_employees, new_organizations), expected = apply_changes(
+                employee_columns, organization_columns, args.change_rate, rng
+            )
+            new = write_snapshot(store, new_employees, new_organizations)
+            snapshot_mb = sum(
+                os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(new.path) for name in names
+            ) / 1024 / 1024
+
+            timings = []
+            for _ in range(args.repeat):
+                # 每次重新打开快照，包含内存映射加载字段的开销
+                old_snapshot, new_snapshot = store.load(old.name), store.load(new.name)
+                start = time.perf_counter()
+                report = compare_snapshots(old_snapshot, new_snapshot)
+                timings.append(time.perf_counter() - start)
+
+            counts = {key: len(getattr(report, key)) for key in expected}
+            if counts != expected:
+                raise AssertionError(f"变动数量不一致: {counts} != {expected}")
+            print(f"{size:>10}{snapshot_mb:>10.1f}{statistics.median(timings):>14.3f}  {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+导入耗时基准测试
+
+在独立的子进程中以 python -X importtime 导入各入口模块，统计累计导入耗时(多次取中位数)，
+并列出耗时最多的依赖模块。指定 --max-ms 时超出阈值返回非零退出码，可在 CI 中跟踪启动时间。
+
+poetry run python scripts/bench_import_time.py --repeat 5
+poetry run python scripts/bench_import_time.py hztic.main hztic.utils.logger --max-ms 150
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ENTRY_MODULES = ["hztic.main", "hztic.utils.logger", "hztic.utils", "hztic.services", "hztic.scheduler"]
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module):
+    """
+    导入一次模块，返回 (累计耗时us, 一级依赖列表[(累计耗时us, 模块名)])
+
+    -X importtime 按后序输出(依赖先于模块本身)，入口模块之前、上一个顶层模块之后的一级条目即其直接依赖。
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=PROJECT_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+    direct = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        level = len(indent) // 2
+        if level == 0:
+            if name == module:
+                return int(cumulative_us), direct
+            direct = []
+        elif level == 1:
+            direct.append((int(cumulative_us), name))
+    raise RuntimeError(f"未找到 {module} 的导入耗时")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导入耗时基准测试")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES, help="入口模块")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模块的导入次数(取中位数)")
+    parser.add_argument("--top", type=int, default=5, help="列出耗时最多的依赖模块数量")
+    parser.add_argument("--max-ms", type=float, help="累计导入耗时阈值(毫秒)，超出时返回非零退出码")
+    args = parser.parse_args()
+
+    exceeded = []
+    for module in args.modules:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        total_ms = statistics.median(total for total, _ in profiles) / 1000
+        print(f"{module:<28}{total_ms:>10.1f} ms")
+
+        # 直接依赖按累计耗时排序(取最后一次)
+        for cumulative, name in sorted(profiles[-1][1], reverse=True)[:args.top]:
+            print(f"    {name:<40}{cumulative / 1000:>10.1f} ms")
+
+        if args.max_ms is not None and total_ms > args.max_ms:
+            exceeded.append(module)
+
+    if exceeded:
+        print(f"\n超出阈值 {args.max_ms} ms: {', '.join(exceeded)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
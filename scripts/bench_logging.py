@@ -0,0 +1,161 @@
+"""
+日志开销基准测试
+
+模拟北森分页拉取时每页的日志调用(请求状态 DEBUG、分页进度 DEBUG、页面汇总 INFO)，
+在 INFO 级别下对比：
+- sync + f-string: 同步 RotatingFileHandler/StreamHandler，参数立即格式化(原实现)
+- sync + lazy:     同步输出，%-style 延迟格式化
+- queue + lazy:    QueueHandler/QueueListener，文件与控制台输出在后台线程完成(现实现)
+
+另外对比角色推送时 print(contents) 与按级别判断后输出的开销，
+以及 Logger 构造开销(原实现每次通过 inspect.stack() 解析调用者模块名)。
+
+poetry run python scripts/bench_logging.py --pages 20000 --staffs 10000
+"""
+
+import argparse
+import inspect
+import io
+import json
+import logging
+import os
+import queue
+import tempfile
+import time
+from contextlib import redirect_stdout
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] [%(filename)s:%(lineno)d] - %(message)s"
+
+
+def build_logger(name, log_file, use_queue):
+    """按指定方式配置日志对象，返回 (logger, 清理函数)"""
+    formatter = logging.Formatter(FORMAT)
+    file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    console_handler = logging.StreamHandler(io.StringIO())
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = None
+    if use_queue:
+        log_queue = queue.Queue()
+        logger.addHandler(QueueHandler(log_queue))
+        listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+
+    def close():
+        if listener:
+            listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        file_handler.close()
+
+    return logger, close
+
+
+def page_eager(logger, page, records):
+    response = {"code": "200", "scrollId": f"scroll-{page}", "data": records}
+    logger.debug(f"Response status code: {200}")
+    logger.debug(f"Fetched page {page} with {len(response['data'])} records, scrollId={response['scrollId']}")
+    logger.info(f"page {page} fetched, {len(records)} records")
+
+
+def page_lazy(logger, page, records):
+    response = {"code": "200", "scrollId": f"scroll-{page}", "data": records}
+    logger.debug("Response status code: %s", 200)
+    logger.debug("Fetched page %s with %d records, scrollId=%s", page, len(response["data"]), response["scrollId"])
+    logger.info("page %s fetched, %d records", page, len(records))
+
+
+def bench_pages(pages, workdir):
+    records = list(range(300))
+    results = []
+    for label, use_queue, page_func in (
+        ("sync + f-string", False, page_eager),
+        ("sync + lazy", False, page_lazy),
+        ("queue + lazy", True, page_lazy),
+    ):
+        logger, close = build_logger(f"bench.{label}", os.path.join(workdir, f"{label}.log"), use_queue)
+        start = time.perf_counter()
+        for page in range(pages):
+            page_func(logger, page, records)
+        caller_seconds = time.perf_counter() - start
+        close()
+        total_seconds = time.perf_counter() - start
+        results.append((label, caller_seconds / pages * 1e6, total_seconds / pages * 1e6))
+    return results
+
+
+def bench_payload(staffs, workdir, repeat=5):
+    contents = [
+        {"pathType": "name", "path": ["模拟集团", f"部门{i // 20}", f"小组{i}"], "staffs": [f"E{i:06d}"]}
+        for i in range(staffs)
+    ]
+    logger, close = build_logger("bench.payload", os.path.join(workdir, "payload.log"), True)
+    results = []
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            print(contents)
+    results.append(("print(contents)", (time.perf_counter() - start) / repeat * 1000))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("配置内容: %s", json.dumps(contents, ensure_ascii=False))
+    results.append(("isEnabledFor(DEBUG) gate", (time.perf_counter() - start) / repeat * 1000))
+    close()
+    return results
+
+
+def bench_construction(count):
+    from hztic.utils.logger import Logger
+
+    def inspect_stack_name():
+        frame = inspect.stack()[1]
+        module = inspect.getmodule(frame[0])
+        return logging.getLogger(module.__name__ if module else "unknown")
+
+    results = []
+    for label, factory in (
+        ("inspect.stack()", inspect_stack_name),
+        ("Logger().get_logger()", lambda: Logger().get_logger()),
+    ):
+        start = time.perf_counter()
+        for _ in range(count):
+            factory()
+        results.append((label, (time.perf_counter() - start) / count * 1e6))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志开销基准测试")
+    parser.add_argument("--pages", type=int, default=20000, help="模拟的分页数量")
+    parser.add_argument("--staffs", type=int, default=10000, help="角色配置内容中的员工数量")
+    parser.add_argument("--constructions", type=int, default=2000, help="Logger 构造次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="hztic-log-bench-") as workdir:
+        print(f"每页日志开销 ({args.pages} 页, INFO 级别)")
+        print(f"{'方式':<20}{'调用线程 us/页':>16}{'含输出完成 us/页':>18}")
+        for label, caller_us, total_us in bench_pages(args.pages, workdir):
+            print(f"{label:<20}{caller_us:>16.2f}{total_us:>18.2f}")
+
+        print(f"\n角色配置内容输出 ({args.staffs} 名员工, INFO 级别)")
+        for label, ms in bench_payload(args.staffs, workdir):
+            print(f"{label:<28}{ms:>10.3f} ms")
+
+        print(f"\nLogger 构造开销 ({args.constructions} 次)")
+        for label, us in bench_construction(args.constructions):
+            print(f"{label:<28}{us:>10.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
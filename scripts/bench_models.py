@@ -0,0 +1,75 @@
+"""
+北森记录类型内存及转换开销基准测试
+
+对比普通 @dataclass(原实现，实例带 __dict__)与 @dataclass(slots=True) 的员工记录：
+- 内存: tracemalloc 统计创建 N 条记录(不含字段值字符串本身)占用的内存
+- 转换: 原实现按 __dict__ 构造参数字典，现实现 to_row() 按字段顺序生成元组
+
+poetry run python scripts/bench_models.py --records 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hztic.models.base_models import Employee
+
+# 字段相同、不使用 slots 的员工记录(原实现)
+PlainEmployee = dataclasses.make_dataclass(
+    "PlainEmployee",
+    [(item.name, item.type, dataclasses.field(default=item.default)) for item in dataclasses.fields(Employee)],
+)
+
+
+def build_values(count):
+    """预先生成字段值，内存统计只包含记录对象本身"""
+    names = Employee.field_names()
+    return [tuple(f"{name}-{i}" for name in names) for i in range(count)]
+
+
+def measure(cls, values):
+    """返回 (记录列表, 内存MB, 创建耗时s)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [cls(*row) for row in values]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="北森记录类型内存基准测试")
+    parser.add_argument("--records", type=int, default=100000, help="记录数量")
+    args = parser.parse_args()
+
+    values = build_values(args.records)
+    print(f"员工记录 {args.records} 条")
+    print(f"{'类型':<28}{'内存MB':>10}{'创建s':>10}{'转换s':>10}")
+
+    plain, plain_mb, plain_build = measure(PlainEmployee, values)
+    start = time.perf_counter()
+    params = [dict(record.__dict__) for record in plain]
+    plain_convert = time.perf_counter() - start
+    print(f"{'dataclass + __dict__':<28}{plain_mb:>10.1f}{plain_build:>10.3f}{plain_convert:>10.3f}")
+    del plain, params
+
+    slotted, slotted_mb, slotted_build = measure(Employee, values)
+    start = time.perf_counter()
+    rows = [record.to_row() for record in slotted]
+    slotted_convert = time.perf_counter() - start
+    print(f"{'dataclass(slots) + to_row':<28}{slotted_mb:>10.1f}{slotted_build:>10.3f}{slotted_convert:>10.3f}")
+    assert rows[0] == values[0]
+
+    print(f"\n内存占用为原实现的 {slotted_mb / plain_mb:.0%}")
+
+
+if __name__ == "__main__":
+    main()
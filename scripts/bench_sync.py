@@ -0,0 +1,165 @@
+"""
+数据同步基准测试
+
+基于本地模拟服务(scripts/api_simulator.py)离线运行完整同步流程，
+按不同员工规模记录各阶段耗时、吞吐量及内存峰值：
+- fetch_and_store: fetch_and_store_data 拉取北森数据并写入数据库
+- sync_hesi_staffs: 增量同步合思员工镜像
+- leader_role / manager_role: 构建角色配置并调用 update_role_staffs_with_clean 全量推送
+
+每个规模在独立子进程中运行，使用临时数据库和临时 token 缓存，不影响本地 data 目录。
+北森客户端的限流等待(rate_limiter_wait)单独统计。
+
+poetry run python scripts/bench_sync.py --sizes 1000 10000 100000 --latency 0.005
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_simulator import ApiSimulator, SimulatorConfig, FAR_FUTURE_MS
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    """进程内存峰值(MB)，不支持的平台返回 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def _prepare_environment(workdir, beisen_base_url, hesi_base_url):
+    """临时数据库及指向模拟服务的 token 缓存"""
+    beisen_cache = os.path.join(workdir, "beisen_token_cache.json")
+    hesi_cache = os.path.join(workdir, "hesi_token_cache.json")
+    with open(beisen_cache, "w") as f:
+        json.dump({"token_data": {"access_token": "simulated", "expireTime": FAR_FUTURE_MS}, "base_url": beisen_base_url}, f)
+    with open(hesi_cache, "w") as f:
+        json.dump({"token_data": {"accessToken": "simulated", "expireTime": FAR_FUTURE_MS}, "base_url": hesi_base_url}, f)
+
+    os.environ["HZTIC_DB_PATH"] = os.path.join(workdir, "bench.db")
+    from hztic.utils import token_manager
+    token_manager.beisen_token_cache_file = beisen_cache
+    token_manager.hesi_token_cache_file = hesi_cache
+
+
+def run_benchmark(size, beisen_base_url, hesi_base_url, trace_memory=False, verbose=False):
+    """子进程入口: 运行一次完整同步并返回各阶段结果"""
+    with tempfile.TemporaryDirectory(prefix="hztic-bench-") as workdir:
+        _prepare_environment(workdir, beisen_base_url, hesi_base_url)
+        if not verbose:
+            logging.disable(logging.WARNING)
+
+        from hztic.config import BeisenAPIConfig, HesiAPIConfig, LEADER_ROLE_ID, MANAGER_ROLE_ID
+        from hztic.handler.data_service import fetch_and_store_data, sync_hesi_staffs, update_role_staffs_with_clean
+        from hztic.utils.database_manager import DatabaseManager
+        from hztic.utils.metrics import metrics
+
+        phases = []
+
+        @contextmanager
+        def phase(name, records):
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+            traced_peak = None
+            if trace_memory:
+                traced_peak = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+                tracemalloc.stop()
+            phases.append({
+                "phase": name,
+                "records": records,
+                "seconds": round(elapsed, 3),
+                "records_per_second": round(records / elapsed, 1) if elapsed else None,
+                "traced_peak_mb": traced_peak,
+                "peak_rss_mb": _peak_rss_mb(),
+            })
+
+        db_manager = DatabaseManager()
+        db_manager.initialize_employee_status()
+        end_time = datetime.now()
+        start_time = end_time - timedelta(days=7)
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            with phase("fetch_and_store", size):
+                fetch_and_store_data(BeisenAPIConfig, start_time, end_time)
+
+            with phase("sync_hesi_staffs", size):
+                sync_hesi_staffs(HesiAPIConfig)
+
+            for role_id, name, build in (
+                (LEADER_ROLE_ID, "leader_role", lambda: db_manager.get_organization_staff_mapping(path_type="name")),
+                (MANAGER_ROLE_ID, "manager_role", db_manager.get_manager_org_path),
+            ):
+                contents = build()
+                with phase(name, sum(len(item["staffs"]) for item in contents)):
+                    if not update_role_staffs_with_clean(HesiAPIConfig, role_id, contents, staff_by="code"):
+                        raise RuntimeError(f"{name} 推送失败")
+
+        rate_limiter_wait = 0.0
+        for line in metrics.render().splitlines():
+            if line.startswith("hztic_rate_limiter_wait_seconds_sum"):
+                rate_limiter_wait += float(line.rsplit(" ", 1)[1])
+        return {"employees": size, "phases": phases, "rate_limiter_wait_seconds": round(rate_limiter_wait, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据同步基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="员工数量")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟接口延迟(秒)")
+    parser.add_argument("--page-size", type=int, default=300, help="模拟接口分页大小上限")
+    parser.add_argument("--throttle-rps", type=float, default=0.0, help="模拟接口每秒最多处理的请求数")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="模拟接口随机失败比例")
+    parser.add_argument("--trace-memory", action="store_true", help="使用 tracemalloc 统计各阶段内存峰值(会降低吞吐量)")
+    parser.add_argument("--verbose", action="store_true", help="输出程序日志")
+    parser.add_argument("--output", help="结果保存为 JSON 文件")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for size in args.sizes:
+        config = SimulatorConfig(
+            employees=size,
+            latency=args.latency,
+            page_size=args.page_size,
+            throttle_rps=args.throttle_rps,
+            failure_rate=args.failure_rate,
+        )
+        with ApiSimulator(config) as simulator, context.Pool(1) as pool:
+            result = pool.apply(run_benchmark, (size, simulator.beisen_base_url, simulator.hesi_base_url, args.trace_memory, args.verbose))
+            result["requests"] = dict(simulator.requests)
+        results.append(result)
+
+        print(f"\n员工数 {size}  (限流等待 {result['rate_limiter_wait_seconds']}s, 请求 {sum(result['requests'].values())} 次)")
+        print(f"{'阶段':<18}{'记录数':>10}{'耗时(s)':>10}{'记录/s':>12}{'RSS峰值MB':>12}{'traced MB':>12}")
+        for item in result["phases"]:
+            print(
+                f"{item['phase']:<18}{item['records']:>10}{item['seconds']:>10}"
+                f"{item['records_per_second'] or '-':>12}{item['peak_rss_mb'] or '-':>12}{item['traced_peak_mb'] or '-':>12}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+测试公共夹具
+
+- db_manager: 临时 SQLite 数据库(通过 HZTIC_DB_PATH 指定，不影响本地 data 目录)
+- simulator: 本地模拟的北森、合思接口(scripts/api_simulator.py)，token 缓存指向模拟服务
+
+日志在导入任何业务模块前配置到临时目录，测试不会写入 hztic/data/logs/app.log。
+"""
+
+import json
+import tempfile
+import pytest
+from hztic.utils.logger import Logger
+
+Logger.configure(log_dir=tempfile.mkdtemp(prefix="hztic-test-logs-"))
+
+from api_simulator import ApiSimulator, SimulatorConfig, FAR_FUTURE_MS
+from hztic.utils import token_manager
+from hztic.utils.database_manager import DB_PATH_ENV, DatabaseManager
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "test.db"))
+    manager = DatabaseManager()
+    manager.initialize_employee_status()
+    yield manager
+    manager.engine.dispose()
+
+
+@pytest.fixture
+def simulator(tmp_path, monkeypatch, db_manager):
+    with ApiSimulator(SimulatorConfig(employees=300)) as sim:
+        beisen_cache = tmp_path / "beisen_token_cache.json"
+        hesi_cache = tmp_path / "hesi_token_cache.json"
+        beisen_cache.write_text(json.dumps({
+            "token_data": {"access_token": "simulated", "expireTime": FAR_FUTURE_MS},
+            "base_url": sim.beisen_base_url,
+        }))
+        hesi_cache.write_text(json.dumps({
+            "token_data": {"accessToken": "simulated", "expireTime": FAR_FUTURE_MS},
+            "base_url": sim.hesi_base_url,
+        }))
+        monkeypatch.setattr(token_manager, "beisen_token_cache_file", str(beisen_cache))
+        monkeypatch.setattr(token_manager, "hesi_token_cache_file", str(hesi_cache))
+        yield sim
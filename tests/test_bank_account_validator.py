@@ -0,0 +1,28 @@
+import numpy as np
+from hztic.handler.bank_account_validator import luhn_valid, validate_bank_accounts
+
+
+def test_luhn_valid_mixed_lengths():
+    accounts = np.array(["4111111111111111", "4111111111111112", "79927398713", "6222020200112233445"], dtype=object)
+    assert luhn_valid(accounts).tolist() == [True, False, True, False]
+
+
+def test_luhn_valid_empty():
+    assert luhn_valid(np.array([], dtype=object)).shape == (0,)
+
+
+def test_validate_bank_accounts_issues():
+    employees = [
+        {"user_id": "1", "bank_account": "4111 1111 1111 1111"},
+        {"user_id": "2", "bank_account": ""},
+        {"user_id": "3", "bank_account": "41111111A1111111"},
+        {"user_id": "4", "bank_account": "12345"},
+        {"user_id": "5", "bank_account": "4111111111111112"},
+    ]
+    issues = {result["user_id"]: result["issues"] for result in validate_bank_accounts(employees)}
+    assert issues == {
+        "2": ["银行账号为空"],
+        "3": ["银行账号包含非数字字符"],
+        "4": ["银行账号长度异常"],
+        "5": ["银行卡号校验位错误"],
+    }
@@ -0,0 +1,36 @@
+import pytest
+from hztic.utils.branch_matcher import BranchMatcher
+
+BRANCHES = [
+    {"code": "308331000011", "name": "招商银行杭州分行营业部", "bank_name": "招商银行"},
+    {"code": "308331000022", "name": "招商银行杭州西湖支行", "bank_name": "招商银行"},
+    {"code": "308331000033", "name": "招商银行宁波江北支行", "bank_name": "招商银行"},
+    {"code": "102331000044", "name": "中国工商银行杭州西湖支行", "bank_name": "中国工商银行"},
+    {"code": "105331000055", "name": "中国建设银行杭州城西支行", "bank_name": "中国建设银行"},
+]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return BranchMatcher(BRANCHES)
+
+
+def test_match_within_bank_block(matcher):
+    # 查询以招商银行开头时只在招商银行的网点中检索
+    code, name, score = matcher.match("招商银行西湖支行", top_k=1)[0]
+    assert code == "308331000022"
+    assert all(result[0].startswith("308") for result in matcher.match("招商银行西湖支行"))
+
+
+def test_match_normalizes_width_and_company_suffix(matcher):
+    assert matcher.match("中国工商银行股份有限公司杭州西湖支行", top_k=1)[0][0] == "102331000044"
+    assert matcher.match("招商银行　杭州 西湖支行", top_k=1)[0][0] == "308331000022"
+
+
+def test_match_unknown_name(matcher):
+    assert matcher.match("xyz") == []
+
+
+def test_match_batch_same_as_match(matcher):
+    queries = ["招商银行西湖支行", "中国建设银行城西支行", "招商银行西湖支行"]
+    assert matcher.match_batch(queries, top_k=2) == [matcher.match(query, top_k=2) for query in queries]
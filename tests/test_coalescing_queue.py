@@ -0,0 +1,66 @@
+import time
+import pytest
+from hztic.utils.coalescing_queue import CoalescingQueue
+
+
+class Recorder:
+    def __init__(self, fail_keys=()):
+        self.calls = []
+        self.done = []
+        self.fail_keys = set(fail_keys)
+
+    def handle(self, key, items):
+        self.calls.append((key, set(items)))
+        if key in self.fail_keys:
+            raise RuntimeError(f"{key} failed")
+
+    def on_done(self, token, error):
+        self.done.append((token, error))
+
+
+@pytest.fixture
+def recorder():
+    return Recorder(fail_keys={"bad"})
+
+
+def test_submits_within_debounce_are_merged(recorder):
+    queue = CoalescingQueue(recorder.handle, debounce=60, max_delay=60)
+    queue.submit("role-a", [("集团", "财务部")])
+    queue.submit("role-a", [("集团", "人力部"), ("集团", "财务部")])
+    queue.submit("role-b", [("集团",)])
+    assert queue.metrics()["queue_depth"] == 2
+    queue.stop(flush=True)
+
+    assert sorted(recorder.calls) == [
+        ("role-a", {("集团", "财务部"), ("集团", "人力部")}),
+        ("role-b", {("集团",)}),
+    ]
+    metrics = queue.metrics()
+    assert (metrics["submitted"], metrics["executed"], metrics["coalescing_ratio"]) == (3, 2, 1.5)
+
+
+def test_due_keys_execute_after_debounce(recorder):
+    queue = CoalescingQueue(recorder.handle, debounce=0.05, max_delay=1)
+    queue.submit("role-a", [1])
+    for _ in range(100):
+        if recorder.calls:
+            break
+        time.sleep(0.02)
+    queue.stop(flush=False)
+    assert recorder.calls == [("role-a", {1})]
+
+
+def test_token_done_after_all_keys(recorder):
+    queue = CoalescingQueue(recorder.handle, debounce=60, max_delay=60, on_done=recorder.on_done)
+    queue.submit_many({"role-a": [1], "role-b": [2]}, token=1)
+    queue.submit("role-a", [3], token=2)
+    queue.submit_many({"role-a": [4], "bad": [5]}, token=3)
+    assert queue.metrics()["pending_tokens"] == 3
+    queue.stop(flush=True)
+
+    done = dict(recorder.done)
+    assert set(done) == {1, 2, 3}
+    assert done[1] is None and done[2] is None
+    assert isinstance(done[3], RuntimeError)
+    assert queue.metrics()["failed"] == 1
+    assert queue.metrics()["pending_tokens"] == 0
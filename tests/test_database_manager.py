@@ -0,0 +1,80 @@
+from hztic.models import db_models
+from hztic.models.base_models import Corporation, Employee, Organization
+
+
+def stage(db_manager, organizations, employees):
+    db_manager.begin_staging()
+    db_manager.stage_records(db_models.Corporation, [Corporation(corp_id="C1", corp_name="模拟公司")])
+    db_manager.stage_records(db_models.Organization, organizations)
+    db_manager.stage_records(db_models.Employee, employees)
+
+
+def test_staging_validate_and_swap(db_manager):
+    organizations = [
+        Organization(org_id="A", org_name="集团", tree_path="A", tree_path_text="集团"),
+        Organization(org_id="B", org_name="财务部", tree_path="A/B", tree_path_text="集团/财务部"),
+    ]
+    employees = [
+        Employee(user_id="1", job_number="E1", oId_department_id="B", employee_status="3"),
+        Employee(user_id="2", job_number="E2", oId_department_id="B", employee_status="2"),
+        Employee(user_id="3", job_number="E3", oId_department_id="B", employee_status="8"),
+        Employee(user_id="1", job_number="E1", oId_department_id="A", employee_status="3"),
+    ]
+    stage(db_manager, organizations, employees)
+    assert db_manager.validate_staging() == []
+
+    # 合并前正式表不可见
+    with db_manager.snapshot() as session:
+        assert session.query(db_models.Employee).count() == 0
+
+    counts = db_manager.swap_staging()
+    assert counts == {"corporations": 1, "organizations": 2, "employees": 3}
+    with db_manager.snapshot() as session:
+        # 主键重复时保留最后一条，非试用、正式状态的员工被删除
+        rows = dict(session.query(db_models.Employee.user_id, db_models.Employee.oId_department_id))
+        assert rows == {"1": "A", "2": "B"}
+        assert session.query(db_models.Organization).count() == 2
+    assert db_manager.load_org_tree().get_path("B") == ("集团", "财务部")
+
+
+def test_staging_validation_failure_keeps_tables(db_manager):
+    stage(db_manager, [Organization(org_id="", org_name="缺少ID")], [Employee(user_id="1", employee_status="3")])
+    errors = db_manager.validate_staging()
+    assert errors == ["staging_organizations: 1 条记录缺少 org_id"]
+    with db_manager.snapshot() as session:
+        assert session.query(db_models.Organization).count() == 0
+
+
+def test_hr_event_retry_and_failure(db_manager):
+    event_id = db_manager.enqueue_hr_event({"processVariableDic": {"userId": "1"}})
+    assert db_manager.claim_hr_events() == [(event_id, {"processVariableDic": {"userId": "1"}})]
+    assert db_manager.claim_hr_events() == []
+
+    db_manager.finish_hr_event(event_id, error="推送失败", max_attempts=2)
+    assert db_manager.count_hr_events_by_status() == {"pending": 1}
+    db_manager.claim_hr_events()
+    db_manager.finish_hr_event(event_id, error="推送失败", max_attempts=2)
+    assert db_manager.count_hr_events_by_status() == {"failed": 1}
+
+
+def test_reset_processing_hr_events(db_manager):
+    db_manager.enqueue_hr_event({"processVariableDic": {"jobNumber": "E1"}})
+    db_manager.claim_hr_events()
+    assert db_manager.reset_processing_hr_events() == 1
+    assert db_manager.count_hr_events_by_status() == {"pending": 1}
+
+
+def test_staff_activation_diff(db_manager):
+    db_manager.save_hesi_staffs([
+        {"id": "s1", "code": "E1", "active": True},
+        {"id": "s2", "code": "E2", "active": True},
+        {"id": "s3", "code": "E3", "active": True},
+    ])
+    db_manager.mark_hesi_staffs_auth_state(["E1", "E2"], True)
+    to_activate, to_deactivate = db_manager.get_staff_activation_diff({"E1", "E3", "E4"})
+    assert sorted(to_activate) == ["E3", "E4"]
+    assert sorted(to_deactivate) == ["E2"]
+
+    # 员工镜像更新不改变本地记录的授权状态
+    db_manager.save_hesi_staffs([{"id": "s2", "code": "E2", "name": "改名", "active": True}])
+    assert db_manager.get_staff_activation_diff({"E1", "E2", "E3"})[0] == ["E3"]
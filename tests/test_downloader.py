@@ -0,0 +1,159 @@
+"""文件下载器测试(本地 HTTP 服务)"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from hztic.utils.downloader import DownloadError, FileDownloader
+
+CONTENT = bytes(range(256)) * 40
+ETAG = '"v1"'
+
+
+class FileServer:
+    """可配置的文件服务: 支持 Range/If-Range、If-None-Match，可省略校验标识或截断响应"""
+    def __init__(self):
+        self.content = CONTENT
+        self.etag = ETAG
+        self.truncate = False
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/file.xlsx"
+
+    def handle(self, handler):
+        headers = handler.headers
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            handler.send_response(304)
+            handler.end_headers()
+            return
+        start = 0
+        range_header = headers.get("Range")
+        if range_header and (self.etag is None or headers.get("If-Range") == self.etag):
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(self.content):
+                handler.send_response(416)
+                handler.send_header("Content-Range", f"bytes */{len(self.content)}")
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+        body = self.content[start:]
+        handler.send_response(206 if start else 200)
+        if start:
+            handler.send_header("Content-Range", f"bytes {start}-{len(self.content) - 1}/{len(self.content)}")
+        if self.etag:
+            handler.send_header("ETag", self.etag)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.wfile.write(body[:len(body) // 2] if self.truncate else body)
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    server = FileServer()
+    yield server
+    server.stop()
+
+
+def write_part(file_path, data, etag):
+    with open(f"{file_path}.part", "wb") as f:
+        f.write(data)
+    with open(f"{file_path}.part.json", "w", encoding="utf-8") as f:
+        json.dump({"etag": etag, "last_modified": None}, f)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download_then_not_modified(server, tmp_path):
+    file_path = str(tmp_path / "file.xlsx")
+    downloader = FileDownloader(chunk_size=1024)
+    assert downloader.download(server.url, file_path) == file_path
+    assert read(file_path) == CONTENT and not downloader.skipped
+
+    downloader.download(server.url, file_path)
+    assert downloader.skipped
+    assert server.requests[-1]["If-None-Match"] == ETAG
+    assert read(file_path) == CONTENT
+
+
+def test_resume_with_validator(server, tmp_path):
+    file_path = str(tmp_path / "file.xlsx")
+    write_part(file_path, CONTENT[:1000], ETAG)
+    FileDownloader().download(server.url, file_path)
+    assert server.requests[-1]["Range"] == "bytes=1000-"
+    assert server.requests[-1]["If-Range"] == ETAG
+    assert read(file_path) == CONTENT
+    assert not os.path.exists(f"{file_path}.part")
+
+
+def test_resume_after_file_changed(server, tmp_path):
+    # If-Range 不匹配时服务端返回完整文件，不拼接旧的临时文件
+    file_path = str(tmp_path / "file.xlsx")
+    write_part(file_path, b"x" * 1000, '"v0"')
+    FileDownloader().download(server.url, file_path)
+    assert read(file_path) == CONTENT
+
+
+def test_part_without_validator_is_not_resumed(server, tmp_path):
+    server.etag = None
+    file_path = str(tmp_path / "file.xlsx")
+    write_part(file_path, b"x" * 1000, None)
+    FileDownloader().download(server.url, file_path)
+    assert "Range" not in server.requests[-1]
+    assert read(file_path) == CONTENT
+
+
+def test_range_not_satisfiable_restarts(server, tmp_path):
+    file_path = str(tmp_path / "file.xlsx")
+    write_part(file_path, b"x" * (len(CONTENT) + 10), ETAG)
+    FileDownloader().download(server.url, file_path)
+    assert [request.get("Range") for request in server.requests] == [f"bytes={len(CONTENT) + 10}-", None]
+    assert read(file_path) == CONTENT
+
+
+def test_incomplete_download_fails_then_resumes(server, tmp_path):
+    file_path = str(tmp_path / "file.xlsx")
+    server.truncate = True
+    with pytest.raises(DownloadError):
+        FileDownloader(chunk_size=1024, max_retries=2).download(server.url, file_path)
+    assert not os.path.exists(file_path)
+    partial_size = os.path.getsize(f"{file_path}.part")
+    assert 0 < partial_size < len(CONTENT)
+
+    server.truncate = False
+    FileDownloader().download(server.url, file_path)
+    assert server.requests[-1]["Range"] == f"bytes={partial_size}-"
+    assert read(file_path) == CONTENT
+
+
+def test_checksum_mismatch(server, tmp_path):
+    file_path = str(tmp_path / "file.xlsx")
+    with pytest.raises(DownloadError):
+        FileDownloader().download(server.url, file_path, expected_sha256="0" * 64)
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(f"{file_path}.part")
+
+
+def test_max_retries_must_be_positive():
+    with pytest.raises(ValueError):
+        FileDownloader(max_retries=0)
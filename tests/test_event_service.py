@@ -0,0 +1,80 @@
+"""HR事件处理测试(基于本地模拟服务)"""
+
+from datetime import datetime, timedelta
+from functools import partial
+import pytest
+from hztic.config import BeisenAPIConfig, HesiAPIConfig, LEADER_ROLE_ID, MANAGER_ROLE_ID
+from hztic.handler import event_service
+from hztic.handler.data_service import fetch_and_store_data
+from hztic.models.db_models import Organization
+from hztic.scheduler import SYNC_LOCK
+from hztic.utils.file_lock import FileLock, LockBusy
+
+ORG_FETCH = "POST /beisen/TenantBaseExternal/api/v5/Organization/GetByTimeWindow"
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit_many(self, entries, token=None):
+        self.submitted.append(({key: set(paths) for key, paths in entries.items()}, token))
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path, simulator, db_manager):
+    queue = RecordingQueue()
+    monkeypatch.setattr(event_service, "get_role_update_queue", lambda hesi_config: queue)
+    monkeypatch.setattr(event_service, "FileLock", partial(FileLock, lock_dir=str(tmp_path / "locks")))
+    monkeypatch.setattr(event_service, "_last_org_refresh", None)
+    end_time = datetime.now()
+    fetch_and_store_data(BeisenAPIConfig, end_time - timedelta(days=7), end_time)
+    return queue
+
+
+def process(event_id, **identifiers):
+    return event_service.process_hr_event(BeisenAPIConfig, HesiAPIConfig, {"processVariableDic": identifiers}, event_id)
+
+
+def test_event_queues_only_related_paths(simulator, db_manager, queue):
+    user_id = str(simulator.data.user_id(7))
+    assert process(1, userId=user_id)
+    entries, token = queue.submitted[0]
+    assert token == 1
+
+    department = db_manager.get_employee_department_ids([user_id])[user_id]
+    tree = db_manager.load_org_tree()
+    assert entries[MANAGER_ROLE_ID] == {tree.get_path(department)}
+    # 组织数据未变化时，只推送员工负责的部门
+    expected_leaders = {tree.get_path(org_id) for org_id in db_manager.get_orgs_in_charge([user_id])}
+    assert entries.get(LEADER_ROLE_ID, set()) == expected_leaders
+
+
+def test_org_refresh_is_throttled(simulator, queue):
+    process(1, userId=str(simulator.data.user_id(1)))
+    fetched = simulator.requests[ORG_FETCH]
+    process(2, jobNumber=simulator.data.job_number(2))
+    assert simulator.requests[ORG_FETCH] == fetched
+
+
+def test_leader_change_queues_org_path(simulator, db_manager, queue):
+    session = db_manager.SessionLocal()
+    session.query(Organization).filter(Organization.org_id == "org-3").update({Organization.person_in_charge: "nobody"})
+    session.commit()
+    session.close()
+
+    process(1, userId=str(simulator.data.user_id(1)))
+    entries, _ = queue.submitted[0]
+    assert simulator.data.org_name_paths[3] in entries[LEADER_ROLE_ID]
+
+
+def test_event_waits_for_sync_lock(monkeypatch, tmp_path, simulator, queue):
+    monkeypatch.setattr(event_service, "SYNC_LOCK_TIMEOUT", 0)
+    lock = event_service.FileLock(SYNC_LOCK)
+    assert lock.acquire()
+    try:
+        with pytest.raises(LockBusy):
+            process(1, userId=str(simulator.data.user_id(1)))
+    finally:
+        lock.release()
+    assert queue.submitted == []
@@ -0,0 +1,38 @@
+"""
+入口模块按需导入回归检查(按需导入失效时，轻量入口会连带加载 SQLAlchemy、requests 等依赖)
+
+只检查导入了哪些模块，不检查耗时；导入耗时用 scripts/bench_import_time.py 测量。
+"""
+
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 轻量入口模块及导入后不应加载的第三方依赖
+LIGHT_MODULES = ["hztic.main", "hztic.utils.logger", "hztic.utils", "hztic.services"]
+HEAVY_DEPENDENCIES = ["sqlalchemy", "numpy", "flask", "apscheduler", "requests", "openpyxl"]
+
+
+def test_light_entry_modules_do_not_import_heavy_dependencies():
+    for module in LIGHT_MODULES:
+        code = (
+            f"import sys, {module}; "
+            f"loaded = [name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules]; "
+            "assert not loaded, loaded"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=PROJECT_ROOT)
+        assert result.returncode == 0, f"{module}: {result.stderr}"
+
+
+def test_lazy_exports_do_not_import_submodules():
+    code = (
+        "import sys, hztic.services, hztic.utils; "
+        "loaded = [name for name in ('hztic.services.hesi', 'hztic.services.beisen', 'hztic.utils.database_manager') "
+        "if name in sys.modules]; "
+        "assert not loaded, loaded; "
+        "assert hztic.services.HesiOpenApi.__module__ == 'hztic.services.hesi'"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=PROJECT_ROOT)
+    assert result.returncode == 0, result.stderr
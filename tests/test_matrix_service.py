@@ -0,0 +1,88 @@
+"""审批矩阵分页遍历测试(模拟 HTTP 请求)"""
+
+import pytest
+from hztic.services.ekuaibao import matrix_service
+from hztic.services.ekuaibao.matrix_service import MatrixService
+from hztic.utils import token_manager
+
+
+class StubTokenManager:
+    def get_access_token(self):
+        return "token"
+
+    def get_base_url(self):
+        return "https://hesi.example"
+
+
+class FakeResponse:
+    def __init__(self, status_code, items=None, text=""):
+        self.status_code = status_code
+        self._items = items
+        self.text = text
+
+    def json(self):
+        return {"items": self._items}
+
+
+class FakeMatrixApi:
+    """按 limit.start/count 切片返回审批矩阵，记录每次请求的分页参数"""
+    def __init__(self, total, fail_at=None):
+        self.items = [{"id": f"M{i:03d}", "name": f"矩阵{i}"} for i in range(total)]
+        self.fail_at = fail_at
+        self.pages = []
+
+    def post(self, url, headers=None, params=None, json=None):
+        assert url == "https://hesi.example/api/openapi/v2/matrix/search"
+        assert params == {"accessToken": "token"}
+        start, count = json["limit"]["start"], json["limit"]["count"]
+        self.pages.append((start, count))
+        if start == self.fail_at:
+            return FakeResponse(500, text="internal error")
+        return FakeResponse(200, self.items[start:start + count])
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(token_manager, "hesi_token_cache_file", str(tmp_path / "hesi_token_cache.json"))
+    svc = MatrixService(config=None)
+    svc.token_manager = StubTokenManager()
+    return svc
+
+
+def use_api(monkeypatch, api):
+    monkeypatch.setattr(matrix_service.requests, "post", api.post)
+    return api
+
+
+def test_iterates_all_pages_in_order(service, monkeypatch):
+    api = use_api(monkeypatch, FakeMatrixApi(total=25))
+    items = list(service.iter_approval_matrices(page_size=10))
+    assert [item["id"] for item in items] == [f"M{i:03d}" for i in range(25)]
+    assert api.pages == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_full_last_page_requests_one_more_page(service, monkeypatch):
+    api = use_api(monkeypatch, FakeMatrixApi(total=20))
+    assert len(list(service.iter_approval_matrices(page_size=10))) == 20
+    assert api.pages == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_empty_result_stops_after_first_page(service, monkeypatch):
+    api = use_api(monkeypatch, FakeMatrixApi(total=0))
+    assert list(service.iter_approval_matrices()) == []
+    assert api.pages == [(0, matrix_service.DEFAULT_PAGE_SIZE)]
+
+
+def test_is_lazy(service, monkeypatch):
+    api = use_api(monkeypatch, FakeMatrixApi(total=25))
+    it = service.iter_approval_matrices(page_size=10)
+    assert next(it)["id"] == "M000"
+    assert api.pages == [(0, 10)]
+
+
+def test_failed_page_raises(service, monkeypatch):
+    use_api(monkeypatch, FakeMatrixApi(total=25, fail_at=10))
+    it = service.iter_approval_matrices(page_size=10)
+    assert len([next(it) for _ in range(10)]) == 10
+    with pytest.raises(Exception, match="Failed to fetch approval matrix: internal error"):
+        next(it)
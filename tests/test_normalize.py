@@ -0,0 +1,25 @@
+from hztic.utils.normalize import normalize_name, split_path, strip_company_suffix
+
+
+def test_strip_trailing_company_suffix():
+    assert strip_company_suffix("杭州模拟科技有限公司") == "杭州模拟科技"
+    assert strip_company_suffix("杭州模拟科技股份有限公司") == "杭州模拟科技"
+    assert strip_company_suffix("杭州模拟科技有限责任公司") == "杭州模拟科技"
+
+
+def test_keep_company_suffix_in_middle():
+    assert strip_company_suffix("中国工商银行股份有限公司杭州西湖支行") == "中国工商银行股份有限公司杭州西湖支行"
+    assert strip_company_suffix("模拟有限公司杭州分公司") == "模拟有限公司杭州分公司"
+    # 只去除末尾的一个后缀
+    assert strip_company_suffix("模拟有限公司杭州有限公司") == "模拟有限公司杭州"
+
+
+def test_normalize_name():
+    assert normalize_name("杭州 模拟科技（集团）股份有限公司") == "杭州模拟科技(集团)"
+    assert normalize_name("Ａ　Ｂ有限公司") == "AB"
+    assert normalize_name(None) == ""
+
+
+def test_split_path():
+    assert split_path("总公司/部门A") == ("总公司", "部门A")
+    assert split_path("") == ()
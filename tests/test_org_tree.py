@@ -0,0 +1,55 @@
+from hztic.models.base_models import Organization
+from hztic.utils.org_tree import OrgTree
+
+ROWS = [
+    ("A", "集团", "A", "集团"),
+    ("B", "财务部", "A/B", "集团/财务部"),
+    ("C", "核算组", "A/B/C", "集团/财务部/核算组"),
+    ("D", "人力部", "A/D", "集团/人力部"),
+]
+
+
+def org(org_id, name, tree_path, tree_path_text):
+    return Organization(org_id=org_id, org_name=name, tree_path=tree_path, tree_path_text=tree_path_text)
+
+
+def test_build_paths():
+    tree = OrgTree(ROWS)
+    assert tree.get_path("C") == ("集团", "财务部", "核算组")
+    assert tree.get_id(["集团", "人力部"]) == "D"
+    assert tree.ancestors("C") == ["B", "A"]
+    assert sorted(tree.subtree("B")) == ["B", "C"]
+
+
+def test_apply_changes_rename_updates_subtree():
+    tree = OrgTree(ROWS)
+    changes = tree.apply_changes([org("B", "财务中心", "A/B", "集团/财务中心")])
+    assert changes.renamed == {"B"}
+    assert changes.affected == {"B", "C"}
+    assert tree.get_path("C") == ("集团", "财务中心", "核算组")
+    assert tree.get_id(["集团", "财务部"]) is None
+    assert changes.old_paths == {("集团", "财务部"), ("集团", "财务部", "核算组")}
+    assert changes.role_paths == changes.old_paths | {("集团", "财务中心"), ("集团", "财务中心", "核算组")}
+
+
+def test_apply_changes_move():
+    tree = OrgTree(ROWS)
+    changes = tree.apply_changes([org("C", "核算组", "A/D/C", "集团/人力部/核算组")])
+    assert changes.moved == {"C"}
+    assert tree.children("B") == []
+    assert tree.children("D") == ["C"]
+    assert tree.get_path("C") == ("集团", "人力部", "核算组")
+
+
+def test_apply_changes_add_and_unchanged():
+    tree = OrgTree(ROWS)
+    changes = tree.apply_changes([
+        org("E", "薪酬组", "A/D/E", "集团/人力部/薪酬组"),
+        org("B", "财务部", "A/B", "集团/财务部"),
+    ])
+    assert changes.added == {"E"}
+    assert changes.affected == {"E"}
+    assert not changes.old_paths
+    assert tree.get_path("E") == ("集团", "人力部", "薪酬组")
+
+    assert not tree.apply_changes([org("D", "人力部", "A/D", "集团/人力部")])
@@ -0,0 +1,31 @@
+from hztic.handler.plan_service import diff_role_contents
+
+
+def test_diff_role_contents():
+    snapshot = {
+        ("集团", "财务部"): ["E1", "E2"],
+        ("集团", "人力部"): ["E3"],
+        ("集团", "行政部"): ["E4"],
+    }
+    contents = [
+        {"pathType": "name", "path": ["集团", "财务部"], "staffs": ["E2", "E5"]},
+        {"pathType": "name", "path": ["集团", "人力部"], "staffs": ["E3"]},
+        {"pathType": "name", "path": ["集团", "法务部"], "staffs": ["E6"]},
+        {"pathType": "name", "path": ["集团", "审计部"], "staffs": []},
+    ]
+    diff = diff_role_contents("role", snapshot, contents)
+
+    assert diff.has_snapshot
+    assert [(change.path, change.added) for change in diff.added] == [(("集团", "法务部"), ["E6"])]
+    assert [(change.path, change.removed) for change in diff.removed] == [(("集团", "行政部"), ["E4"])]
+    assert [(change.path, change.added, change.removed) for change in diff.changed] == [
+        (("集团", "财务部"), ["E5"], ["E1"])
+    ]
+    assert diff.unchanged == 1
+    assert (diff.staff_added, diff.staff_removed) == (2, 2)
+
+
+def test_diff_role_contents_without_snapshot():
+    diff = diff_role_contents("role", {}, [{"pathType": "name", "path": ["集团"], "staffs": ["E1"]}])
+    assert not diff.has_snapshot
+    assert len(diff.added) == 1 and not diff.is_empty
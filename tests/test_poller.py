@@ -0,0 +1,73 @@
+"""指数退避轮询测试(虚拟时钟)"""
+
+import pytest
+from hztic.utils import poller
+from hztic.utils.poller import PollTimeout, poll_with_backoff
+
+
+class FakeClock:
+    """替换 poller.time，sleep 只推进虚拟时间并记录间隔"""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(poller, "time", fake)
+    return fake
+
+
+def checks(results):
+    """按顺序返回预设结果的检查函数，并记录调用次数"""
+    it = iter(results)
+
+    def check():
+        check.calls += 1
+        return next(it)
+    check.calls = 0
+    return check
+
+
+def test_returns_result_when_done(clock):
+    check = checks([(False, None), (False, None), (True, "url")])
+    assert poll_with_backoff(check, initial_delay=1, max_delay=60, deadline=600) == "url"
+    assert check.calls == 3
+    assert clock.sleeps == [1, 2]
+
+
+def test_delay_is_capped_by_max_delay(clock):
+    check = checks([(False, None)] * 6 + [(True, 42)])
+    assert poll_with_backoff(check, initial_delay=5, max_delay=30, factor=2.0, deadline=600) == 42
+    assert clock.sleeps == [5, 10, 20, 30, 30, 30]
+
+
+def test_done_on_first_check_does_not_sleep(clock):
+    assert poll_with_backoff(checks([(True, "ok")])) == "ok"
+    assert clock.sleeps == []
+
+
+def test_raises_poll_timeout_after_deadline(clock):
+    check = checks([(False, None)] * 100)
+    with pytest.raises(PollTimeout):
+        poll_with_backoff(check, initial_delay=5, max_delay=60, deadline=100)
+    # 最后一次等待被截断到剩余时间，不会越过截止时间
+    assert clock.sleeps == [5, 10, 20, 40, 25]
+    assert sum(clock.sleeps) == 100
+    assert check.calls == 6
+
+
+def test_check_exception_propagates(clock):
+    def check():
+        raise ValueError("boom")
+    with pytest.raises(ValueError, match="boom"):
+        poll_with_backoff(check)
+    assert clock.sleeps == []
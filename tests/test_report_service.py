@@ -0,0 +1,53 @@
+from hztic.handler.report_service import compare_snapshots, format_change_report
+from hztic.utils.snapshot_store import SNAPSHOT_COLUMNS, SnapshotStore
+
+
+def employee(user_id, department="O1", level="L1"):
+    return {
+        "user_id": user_id, "job_number": f"E{user_id}", "employee_name": f"员工{user_id}",
+        "oId_job_level_id": level, "oId_job_level_text": f"职级{level}",
+        "oId_department_id": department, "oId_department_text": f"部门{department}",
+    }
+
+
+def write(store, employees, organizations):
+    def columns(table, rows):
+        return {name: [row.get(name) for row in rows] for name in SNAPSHOT_COLUMNS[table]}
+    return store.write({
+        "employees": columns("employees", employees),
+        "organizations": columns("organizations", organizations),
+        "corporations": columns("corporations", []),
+    })
+
+
+def test_compare_snapshots(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    organizations = [
+        {"org_id": "O1", "org_name": "财务部", "person_in_charge": "1", "person_in_charge_text": "员工1"},
+        {"org_id": "O2", "org_name": "人力部", "person_in_charge": "2", "person_in_charge_text": "员工2"},
+    ]
+    old = write(store, [employee("1"), employee("2"), employee("3"), employee("4")], organizations)
+
+    organizations[1] = dict(organizations[1], person_in_charge="5", person_in_charge_text="员工5")
+    new = write(
+        store,
+        [employee("1"), employee("2", department="O2"), employee("3", level="L2"), employee("5")],
+        organizations + [{"org_id": "O3", "org_name": "法务部", "person_in_charge": "1"}],
+    )
+    assert store.list() == [old.name, new.name]
+
+    report = compare_snapshots(store.load(old.name), store.load(new.name))
+    assert [record["user_id"] for record in report.hires] == ["5"]
+    assert [record["user_id"] for record in report.exits] == ["4"]
+    assert [(record["user_id"], record["from"], record["to"]) for record in report.transfers] == [("2", "部门O1", "部门O2")]
+    assert [(record["user_id"], record["to"]) for record in report.level_changes] == [("3", "职级L2")]
+    assert [(record["org_id"], record["from"], record["to"]) for record in report.leader_changes] == [("O2", "员工2", "员工5")]
+    assert "入职 1  离职 1  调岗 1  职级变动 1  负责人变动 1" in format_change_report(report)
+
+
+def test_compare_identical_snapshots(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    old = write(store, [employee("1")], [{"org_id": "O1", "org_name": "财务部"}])
+    new = write(store, [employee("1")], [{"org_id": "O1", "org_name": "财务部"}])
+    report = compare_snapshots(old, new)
+    assert not any((report.hires, report.exits, report.transfers, report.level_changes, report.leader_changes))
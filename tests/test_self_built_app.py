@@ -0,0 +1,101 @@
+"""基于本地模拟服务的业务对象实例分页/批量查询测试"""
+
+import time
+import pytest
+from hztic.config import HesiAPIConfig
+from hztic.services.ekuaibao.self_built_app import SelfBuiltApp
+
+ENTITY_ID = "entity-1"
+INSTANCE_LIST = "GET /hesi/api/openapi/v2.1/datalink"
+INSTANCE_SEARCH = f"POST /hesi/api/openapi/v2/extension/DATA_LINK/object/{ENTITY_ID}/search"
+
+
+@pytest.fixture
+def app(simulator):
+    simulator.config.datalink_instances = 250
+    return SelfBuiltApp(HesiAPIConfig)
+
+
+def codes(items):
+    return [item["code"] for item in items]
+
+
+def expected_codes(indexes):
+    return [f"DL{index:06d}" for index in indexes]
+
+
+def patch_dispatch(simulator, monkeypatch, hook):
+    """在模拟服务处理请求前调用 hook(method, path, query, body)，hook 返回非 None 时作为响应"""
+    dispatch = simulator.dispatch
+
+    def patched(method, path, query, body):
+        response = hook(method, path, query, body)
+        return response if response is not None else dispatch(method, path, query, body)
+    monkeypatch.setattr(simulator, "dispatch", patched)
+
+
+def test_iter_instances_stops_at_short_page(app, simulator):
+    items = list(app.iter_instances(ENTITY_ID, page_size=100))
+    assert codes(items) == expected_codes(range(250))
+    assert simulator.requests[INSTANCE_LIST] == 3
+
+
+def test_iter_instances_full_last_page_requests_one_more(app, simulator):
+    simulator.config.datalink_instances = 200
+    assert len(list(app.iter_instances(ENTITY_ID, page_size=100))) == 200
+    assert simulator.requests[INSTANCE_LIST] == 3
+
+
+def test_iter_instances_concurrent_keeps_page_order(app, simulator, monkeypatch):
+    # 前面的页响应更慢，并发拉取时后面的页先返回
+    def slow_early_pages(method, path, query, body):
+        if path.endswith("/v2.1/datalink"):
+            time.sleep(max(0, 120 - int(query["start"])) / 1000)
+    patch_dispatch(simulator, monkeypatch, slow_early_pages)
+
+    items = list(app.iter_instances(ENTITY_ID, page_size=30, max_workers=4))
+    assert codes(items) == expected_codes(range(250))
+    # 9 页有数据(最后一页不满)，按每批 4 页并发共请求 3 批
+    assert simulator.requests[INSTANCE_LIST] == 12
+
+
+def test_iter_instances_propagates_worker_error(app, simulator, monkeypatch):
+    def fail_third_page(method, path, query, body):
+        if path.endswith("/v2.1/datalink") and query["start"] == "60":
+            return 500, {"message": "simulated failure"}
+    patch_dispatch(simulator, monkeypatch, fail_third_page)
+
+    items = []
+    with pytest.raises(Exception, match="simulated failure"):
+        for item in app.iter_instances(ENTITY_ID, page_size=30, max_workers=4):
+            items.append(item)
+    # 出错页之前的数据按顺序返回，之后的页不再返回
+    assert codes(items) == expected_codes(range(60))
+
+
+def test_iter_instance_describe_batches_in_order(app, simulator):
+    ids = [f"{ENTITY_ID}:{index}" for index in range(25)]
+    instance_codes = expected_codes(range(200, 212))
+    items = list(app.iter_instance_describe(ENTITY_ID, ids=ids, codes=instance_codes, batch_size=10, max_workers=3))
+    assert codes(items) == expected_codes(range(25)) + instance_codes
+    # ID 按 10 条拆为 3 批，编码拆为 2 批
+    assert simulator.requests[INSTANCE_SEARCH] == 5
+
+
+def test_iter_instance_describe_without_keys_makes_no_request(app, simulator):
+    assert list(app.iter_instance_describe(ENTITY_ID, max_workers=3)) == []
+    assert simulator.requests[INSTANCE_SEARCH] == 0
+
+
+def test_iter_instance_describe_propagates_worker_error(app, simulator, monkeypatch):
+    def fail_codes(method, path, query, body):
+        if path.endswith("/search") and (body or {}).get("codes"):
+            return 500, {"message": "simulated failure"}
+    patch_dispatch(simulator, monkeypatch, fail_codes)
+
+    ids = [f"{ENTITY_ID}:{index}" for index in range(20)]
+    items = []
+    with pytest.raises(Exception, match="simulated failure"):
+        for item in app.iter_instance_describe(ENTITY_ID, ids=ids, codes=["DL000001"], batch_size=10, max_workers=3):
+            items.append(item)
+    assert codes(items) == expected_codes(range(20))
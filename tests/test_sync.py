@@ -0,0 +1,91 @@
+"""基于本地模拟服务的同步流程测试"""
+
+from datetime import datetime, timedelta
+from hztic.config import BeisenAPIConfig, HesiAPIConfig, LEADER_ROLE_ID, MANAGER_ROLE_ID
+from hztic.handler.data_service import (
+    ROLE_CONTENT_BUILDERS, fetch_and_store_data, sync_hesi_staffs, sync_staff_authorization, update_role_staffs_with_clean
+)
+
+AUTH_STAFF = "POST /hesi/api/openapi/v1/charge/powers/authStaff"
+
+
+def fetch(db_manager):
+    end_time = datetime.now()
+    return fetch_and_store_data(BeisenAPIConfig, end_time - timedelta(days=7), end_time)
+
+
+def test_fetch_and_store(simulator, db_manager):
+    result = fetch(db_manager)
+    tree = db_manager.load_org_tree()
+    assert len(tree) == simulator.data.org_count
+    assert result.org_changes.added == set(tree.nodes)
+    assert tree.get_path("org-9") == simulator.data.org_name_paths[9]
+
+    # 再次同步相同数据时组织树不变
+    assert not fetch(db_manager).org_changes
+
+
+def test_full_role_update_and_authorization(simulator, db_manager):
+    fetch(db_manager)
+    sync_hesi_staffs(HesiAPIConfig)
+    role_contents = {role_id: build(db_manager) for role_id, build in ROLE_CONTENT_BUILDERS.items()}
+    desired = {code for contents in role_contents.values() for item in contents for code in item.get("staffs") or []}
+
+    activated, deactivated = sync_staff_authorization(HesiAPIConfig, desired)
+    assert (activated, deactivated) == (len(desired), 0)
+    assert simulator.authorized == desired
+
+    for role_id, contents in role_contents.items():
+        assert update_role_staffs_with_clean(HesiAPIConfig, role_id, contents)
+        assert simulator.role_contents[role_id] == contents
+        assert len(db_manager.get_role_snapshot(role_id)) == sum(1 for item in contents if item.get("staffs"))
+    # 员工均已激活，推送角色时不再调用授权接口
+    assert simulator.requests[AUTH_STAFF] == 1
+
+    # 不再属于任何角色的员工被停用
+    leaders = {code for item in role_contents[LEADER_ROLE_ID] for code in item.get("staffs") or []}
+    assert sync_staff_authorization(HesiAPIConfig, leaders, max_deactivate=len(desired), max_deactivate_ratio=1) == (
+        0, len(desired - leaders)
+    )
+    assert simulator.authorized == leaders
+
+
+def authorize_all_role_staffs(db_manager):
+    sync_hesi_staffs(HesiAPIConfig)
+    desired = {
+        code for build in ROLE_CONTENT_BUILDERS.values() for item in build(db_manager) for code in item.get("staffs") or []
+    }
+    sync_staff_authorization(HesiAPIConfig, desired)
+    return desired
+
+
+def test_empty_role_build_skips_deactivation(simulator, db_manager):
+    fetch(db_manager)
+    desired = authorize_all_role_staffs(db_manager)
+
+    assert sync_staff_authorization(HesiAPIConfig, set(), max_deactivate=len(desired), max_deactivate_ratio=1) == (0, 0)
+    assert simulator.authorized == desired
+    assert simulator.requests[AUTH_STAFF] == 1
+
+
+def test_deactivation_over_limit_is_skipped(simulator, db_manager):
+    fetch(db_manager)
+    desired = authorize_all_role_staffs(db_manager)
+    kept = set(sorted(desired)[:len(desired) // 2])
+
+    assert sync_staff_authorization(HesiAPIConfig, kept, max_deactivate_ratio=0.1) == (0, 0)
+    assert sync_staff_authorization(HesiAPIConfig, kept, max_deactivate=1) == (0, 0)
+    assert simulator.authorized == desired
+
+
+def test_targeted_role_update(simulator, db_manager):
+    fetch(db_manager)
+    sync_hesi_staffs(HesiAPIConfig)
+    contents = ROLE_CONTENT_BUILDERS[MANAGER_ROLE_ID](db_manager)
+    target = tuple(contents[0]["path"])
+    stale = ("模拟集团", "已撤销部门")
+
+    assert update_role_staffs_with_clean(HesiAPIConfig, MANAGER_ROLE_ID, contents, only_paths=[target, stale])
+    pushed = {tuple(item["path"]): item["staffs"] for item in simulator.role_contents[MANAGER_ROLE_ID]}
+    assert pushed == {target: contents[0]["staffs"], stale: []}
+    assert "DELETE /hesi/api/openapi/v1.1/roledefs/$" + MANAGER_ROLE_ID + "/staffs" not in simulator.requests